@@ -0,0 +1,14 @@
+import pytest
+from core.testing import budget_errors, measure_view
+
+
+@pytest.fixture
+def query_budget(client):
+    """Проверка SQL-запросов и времени ответа страницы по бюджету, см. core.testing."""
+    def check(key, url, client=client):
+        response, sql, ms = measure_view(client, url)
+        assert response.status_code == 200, f'{url} вернул {response.status_code}'
+        errors = budget_errors(key, sql, ms)
+        assert not errors, '\n\n'.join(errors)
+        return response
+    return check
@@ -0,0 +1,12 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+class TestQueryBudget:
+
+    def test_group_page(self, query_budget, few_posts_with_group):
+        query_budget('pytest posts:group_list', f'/group/{few_posts_with_group.group.slug}/')
+
+    def test_follow_page(self, query_budget, user_client, another_few_posts_with_group_with_follower):
+        query_budget('pytest posts:follow_index', '/follow/', client=user_client)
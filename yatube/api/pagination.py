@@ -0,0 +1,63 @@
+"""
+Постраничная выдача по ключу (keyset) вместо OFFSET: курсор хранит
+дату и id последней отданной записи, следующая страница — это записи
+строго «раньше» неё. Стоимость запроса не зависит от глубины листания.
+"""
+import base64
+import binascii
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(date, pk):
+    raw = f'{date.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        date, pk = base64.urlsafe_b64decode(padded).decode().split('|')
+        date = parse_datetime(date)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor(cursor)
+    if date is None:
+        raise InvalidCursor(cursor)
+    return date, pk
+
+
+def get_limit(request):
+    try:
+        limit = int(request.GET.get('limit', settings.RECORDS_PER_PAGE))
+    except ValueError:
+        limit = settings.RECORDS_PER_PAGE
+    return min(max(limit, 1), settings.API_MAX_LIMIT)
+
+
+def paginate(request, queryset, date_field):
+    """
+    Страница записей queryset (словарей из .values()) в порядке убывания
+    date_field и id. Возвращает (записи, курсор следующей страницы или None).
+    """
+    limit = get_limit(request)
+    cursor = request.GET.get('cursor')
+    if cursor:
+        date, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(**{f'{date_field}__lt': date})
+            | Q(**{date_field: date, 'pk__lt': pk})
+        )
+    rows = list(queryset.order_by(f'-{date_field}', '-pk')[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last[date_field], last['id'])
+    return rows, next_cursor
@@ -0,0 +1,58 @@
+"""
+Сериализация без форм, моделей и шаблонов: запросы выбирают только
+нужные поля через .values(), а функции ниже превращают словари строк
+в компактные словари для JSON.
+"""
+from posts.models import Post
+
+POST_FIELDS = (
+    'id',
+    'text',
+    'pub_date',
+    'image',
+    'author__username',
+    'author__first_name',
+    'author__last_name',
+    'group__slug',
+    'group__title',
+)
+
+COMMENT_FIELDS = (
+    'id',
+    'text',
+    'created',
+    'author__username',
+)
+
+image_storage = Post._meta.get_field('image').storage
+
+
+def serialize_author(row):
+    full_name = f"{row['author__first_name']} {row['author__last_name']}"
+    return {
+        'username': row['author__username'],
+        'full_name': full_name.strip(),
+    }
+
+
+def serialize_post(row):
+    group = None
+    if row['group__slug']:
+        group = {'slug': row['group__slug'], 'title': row['group__title']}
+    return {
+        'id': row['id'],
+        'text': row['text'],
+        'pub_date': row['pub_date'].isoformat(),
+        'image': image_storage.url(row['image']) if row['image'] else None,
+        'author': serialize_author(row),
+        'group': group,
+    }
+
+
+def serialize_comment(row):
+    return {
+        'id': row['id'],
+        'text': row['text'],
+        'created': row['created'].isoformat(),
+        'author': row['author__username'],
+    }
@@ -0,0 +1,171 @@
+import json
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from posts import hot
+from posts.models import Comment, Group, Post
+
+User = get_user_model()
+
+
+class BatchApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='integration')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.post = Post.objects.create(text='Пост', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        self.url = reverse('api:batch')
+
+    def send(self, payload, client=None):
+        return (client or self.client).post(
+            self.url, json.dumps(payload), content_type='application/json'
+        )
+
+    def test_batch_creates_valid_items_and_reports_invalid(self):
+        """Корректные элементы создаются, по ошибочным — список ошибок."""
+        response = self.send(
+            {
+                'posts': [
+                    {'text': 'Новый пост', 'group': self.group.pk},
+                    {'text': ''},
+                ],
+                'comments': [
+                    {'post': self.post.pk, 'text': 'Первый'},
+                    {'post': self.post.pk, 'text': 'Второй'},
+                    {'post': 0, 'text': 'К несуществующему посту'},
+                ],
+            }
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        data = response.json()
+        self.assertEqual(
+            [item['status'] for item in data['posts']], ['created', 'invalid']
+        )
+        self.assertIn('text', data['posts'][1]['errors'])
+        self.assertEqual(
+            [item['status'] for item in data['comments']],
+            ['created', 'created', 'invalid'],
+        )
+        post = Post.objects.get(text='Новый пост')
+        self.assertEqual((post.author, post.group), (self.user, self.group))
+        self.assertEqual(
+            set(
+                Comment.objects.filter(author=self.user).values_list(
+                    'text', flat=True
+                )
+            ),
+            {'Первый', 'Второй'},
+        )
+
+    def test_batch_inserts_in_constant_queries(self):
+        """Число запросов не растёт с размером пакета."""
+        for payload in (
+            {'comments': [{'post': self.post.pk, 'text': 'Текст'}]},
+            {'posts': [{'text': 'Текст', 'group': self.group.pk}]},
+        ):
+            with self.subTest(kind=next(iter(payload))):
+                kind, items = next(iter(payload.items()))
+                # Первый запрос кладёт пользователя в кеш
+                self.send(payload)
+                with CaptureQueriesContext(connection) as few:
+                    self.send({kind: items * 2})
+                with CaptureQueriesContext(connection) as many:
+                    self.send({kind: items * 50})
+                self.assertEqual(len(few), len(many))
+
+    def test_unknown_group_is_invalid(self):
+        response = self.send({'posts': [{'text': 'Пост', 'group': 0}]})
+
+        self.assertIn('group', response.json()['posts'][0]['errors'])
+
+    def test_full_batch_within_shipped_limits(self):
+        """Пакет больше лимита формы сайта проходит, у постов есть id."""
+        response = self.send(
+            {'posts': [{'text': 'Пост', 'group': self.group.pk}] * 50}
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        ids = [item['id'] for item in response.json()['posts']]
+        self.assertEqual(
+            ids,
+            list(
+                Post.objects.filter(author=self.user, group=self.group)
+                .order_by('pk')
+                .values_list('pk', flat=True)
+            ),
+        )
+        self.assertTrue(set(ids) & set(hot.top(hot.POSTS)))
+
+    def test_comment_ids_returned(self):
+        response = self.send(
+            {'comments': [{'post': str(self.post.pk), 'text': 'Текст'}] * 2}
+        )
+
+        self.assertEqual(
+            [item['id'] for item in response.json()['comments']],
+            list(
+                Comment.objects.order_by('pk').values_list('pk', flat=True)
+            ),
+        )
+
+    def test_non_scalar_ids_are_invalid(self):
+        """Список или объект вместо id — ошибка элемента, а не 500."""
+        response = self.send(
+            {
+                'posts': [
+                    {'text': 'Пост', 'group': [self.group.pk]},
+                    {'text': 'Пост', 'group': {'id': self.group.pk}},
+                ],
+                'comments': [{'post': [self.post.pk], 'text': 'Текст'}],
+            }
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        data = response.json()
+        for item in data['posts']:
+            self.assertIn('group', item['errors'])
+        self.assertEqual(data['comments'][0]['status'], 'invalid')
+        self.assertFalse(Comment.objects.exists())
+
+    @override_settings(RATELIMITS={'api_batch': {'user': '3/m'}})
+    def test_each_item_uses_rate_limit(self):
+        """Каждый элемент пакета расходует лимит, как отдельный запрос."""
+        self.send({'posts': [{'text': 'Пост'}] * 2})
+
+        response = self.send({'posts': [{'text': 'Пост'}] * 2})
+
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertTrue(response.has_header('Retry-After'))
+        self.assertEqual(Post.objects.filter(author=self.user).count(), 3)
+
+    @override_settings(API_BATCH_MAX_ITEMS=2)
+    def test_batch_size_limit(self):
+        response = self.send({'posts': [{'text': 'Пост'}] * 3})
+
+        self.assertEqual(
+            response.status_code, HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+        )
+
+    def test_bad_requests(self):
+        """Анониму — 401, неверному телу запроса — 400."""
+        anonymous = self.send({'posts': []}, client=Client())
+        not_json = self.client.post(
+            self.url, 'posts', content_type='application/json'
+        )
+        not_list = self.send({'posts': {'text': 'Пост'}})
+
+        self.assertEqual(anonymous.status_code, HTTPStatus.UNAUTHORIZED)
+        self.assertEqual(not_json.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(not_list.status_code, HTTPStatus.BAD_REQUEST)
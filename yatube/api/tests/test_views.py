@@ -0,0 +1,143 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(
+            username='author', first_name='Лев', last_name='Толстой'
+        )
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        now = timezone.now()
+        cls.posts = []
+        for number in range(5):
+            post = Post.objects.create(
+                text=f'Пост {number}',
+                author=cls.author,
+                group=cls.group if number % 2 else None,
+            )
+            # Две пары постов с одинаковой датой проверяют курсор по id
+            Post.objects.filter(pk=post.pk).update(
+                pub_date=now - timedelta(minutes=number // 2)
+            )
+            cls.posts.append(post)
+        Post.objects.create(text='Чужой пост', author=cls.reader)
+        for number in range(3):
+            Comment.objects.create(
+                post=cls.posts[0], author=cls.reader, text=f'Коммент {number}'
+            )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def walk(self, url, limit):
+        """Проходит все страницы ленты, возвращает id постов."""
+        ids, cursor = [], None
+        while True:
+            params = {'limit': limit}
+            if cursor:
+                params['cursor'] = cursor
+            data = self.client.get(url, params).json()
+            ids.extend(post['id'] for post in data['results'])
+            cursor = data['next']
+            if not cursor:
+                return ids
+
+    def test_cursor_pagination_walks_whole_feed(self):
+        """Курсор проходит ленту без пропусков и повторов."""
+        expected = list(
+            Post.objects.order_by('-pub_date', '-pk').values_list(
+                'pk', flat=True
+            )
+        )
+        for limit in (1, 2, 4, 100):
+            with self.subTest(limit=limit):
+                self.assertEqual(
+                    self.walk(reverse('api:feed'), limit), expected
+                )
+
+    def test_group_and_profile_feeds(self):
+        """Ленты группы и автора содержат только их посты."""
+        group_ids = self.walk(reverse('api:group_feed', args=['group']), 2)
+        profile_ids = self.walk(
+            reverse('api:profile_feed', args=['author']), 2
+        )
+
+        self.assertEqual(
+            set(group_ids),
+            {post.pk for post in self.posts if post.group_id},
+        )
+        self.assertEqual(set(profile_ids), {post.pk for post in self.posts})
+
+    def test_post_serialization(self):
+        """Пост сериализуется со всеми полями."""
+        post = self.posts[1]
+
+        data = self.client.get(
+            reverse('api:post_detail', args=[post.pk])
+        ).json()
+
+        self.assertEqual(data['text'], post.text)
+        self.assertEqual(
+            data['author'], {'username': 'author', 'full_name': 'Лев Толстой'}
+        )
+        self.assertEqual(data['group'], {'slug': 'group', 'title': 'Группа'})
+        self.assertIsNone(data['image'])
+
+    def test_post_detail_comments(self):
+        """Комментарии к посту отдаются страницами."""
+        url = reverse('api:post_detail', args=[self.posts[0].pk])
+
+        data = self.client.get(url, {'limit': 2}).json()
+
+        self.assertEqual(len(data['comments']['results']), 2)
+        self.assertIsNotNone(data['comments']['next'])
+
+    def test_follow_feed_requires_login(self):
+        """Лента подписок доступна только авторизованным."""
+        url = reverse('api:follow_feed')
+        self.assertEqual(
+            self.client.get(url).status_code, HTTPStatus.UNAUTHORIZED
+        )
+
+        self.client.force_login(self.reader)
+        ids = self.walk(url, 10)
+
+        self.assertEqual(set(ids), {post.pk for post in self.posts})
+
+    def test_etag_and_not_modified(self):
+        """Повторный запрос с If-None-Match получает 304."""
+        url = reverse('api:feed')
+        response = self.client.get(url)
+
+        repeated = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(repeated.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_errors(self):
+        """Ошибки отдаются в JSON с подходящим статусом."""
+        cases = (
+            (reverse('api:feed') + '?cursor=broken', HTTPStatus.BAD_REQUEST),
+            (reverse('api:post_detail', args=[0]), HTTPStatus.NOT_FOUND),
+            (reverse('api:group_feed', args=['nope']), HTTPStatus.NOT_FOUND),
+        )
+        for url, status in cases:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status)
+                self.assertIn('detail', response.json())
+
+    def test_feed_query_count(self):
+        """Страница ленты — один запрос, без N+1."""
+        with self.assertNumQueries(1):
+            self.client.get(reverse('api:feed'), {'limit': 100})
@@ -0,0 +1,297 @@
+import hashlib
+import json
+import math
+from functools import wraps
+from http import HTTPStatus
+
+from core.ratelimit import limit_wait, write_gate
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import require_GET, require_POST
+from posts import hot
+from posts.cache import posts_changed
+from posts.forms import CommentForm, PostForm
+from posts.models import Comment, Group, Post, User
+
+from .pagination import InvalidCursor, paginate
+from .serializers import (
+    COMMENT_FIELDS,
+    POST_FIELDS,
+    serialize_comment,
+    serialize_post,
+)
+
+
+# Значение id неподходящего типа: такого объекта точно нет
+INVALID_PK = object()
+
+
+def json_response(data, status=HTTPStatus.OK):
+    body = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return HttpResponse(
+        body, status=status, content_type='application/json; charset=utf-8'
+    )
+
+
+def json_error(message, status):
+    return json_response({'detail': message}, status=status)
+
+
+def api_view(view):
+    """
+    Обёртка JSON-эндпоинтов: только GET, ошибки в JSON, ETag по телу
+    ответа и 304 на совпадающий If-None-Match.
+    """
+
+    @require_GET
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            response = view(request, *args, **kwargs)
+        except InvalidCursor:
+            return json_error('Неверный курсор.', HTTPStatus.BAD_REQUEST)
+        except Http404:
+            return json_error('Не найдено.', HTTPStatus.NOT_FOUND)
+        if response.status_code != HTTPStatus.OK:
+            return response
+        etag = '"%s"' % hashlib.md5(response.content).hexdigest()
+        patch_vary_headers(response, ('Cookie',))
+        if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+            not_modified = HttpResponseNotModified()
+            not_modified['ETag'] = etag
+            return not_modified
+        response['ETag'] = etag
+        return response
+
+    return wrapper
+
+
+def feed_response(request, queryset):
+    rows, next_cursor = paginate(
+        request, queryset.values(*POST_FIELDS), 'pub_date'
+    )
+    return json_response(
+        {
+            'results': [serialize_post(row) for row in rows],
+            'next': next_cursor,
+        }
+    )
+
+
+@api_view
+def feed(request):
+    """Все посты, от новых к старым."""
+    return feed_response(request, Post.objects.all())
+
+
+@api_view
+def group_feed(request, slug):
+    """Посты сообщества."""
+    group = get_object_or_404(Group.objects.only('pk'), slug=slug)
+    return feed_response(request, Post.objects.filter(group=group))
+
+
+@api_view
+def profile_feed(request, username):
+    """Посты автора."""
+    author = get_object_or_404(User.objects.only('pk'), username=username)
+    return feed_response(request, Post.objects.filter(author=author))
+
+
+@api_view
+def follow_feed(request):
+    """Посты авторов, на которых подписан текущий пользователь."""
+    if not request.user.is_authenticated:
+        return json_error('Требуется авторизация.', HTTPStatus.UNAUTHORIZED)
+    return feed_response(
+        request, Post.objects.filter(author__following__user=request.user)
+    )
+
+
+@api_view
+def post_detail(request, post_id):
+    """Пост и страница его комментариев (курсор по комментариям)."""
+    row = get_object_or_404(Post.objects.values(*POST_FIELDS), pk=post_id)
+    comments, next_cursor = paginate(
+        request,
+        Comment.objects.filter(post_id=post_id).values(*COMMENT_FIELDS),
+        'created',
+    )
+    data = serialize_post(row)
+    data['comments'] = {
+        'results': [serialize_comment(comment) for comment in comments],
+        'next': next_cursor,
+    }
+    return json_response(data)
+
+
+def item_pk(value):
+    """
+    Id из JSON: число или строка из цифр. None — поле не задано,
+    INVALID_PK — значение другого типа (список, объект, дробь, bool).
+    """
+    if value in (None, ''):
+        return None
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return INVALID_PK
+
+
+def validate_posts(items, user):
+    """
+    Проверяет посты логикой PostForm; возвращает (посты, ошибки).
+    Группы загружаются одним запросом на пакет: поле формы искало бы
+    каждую отдельно.
+    """
+    items = [dict(item) if isinstance(item, dict) else {} for item in items]
+    group_ids = [item_pk(item.pop('group', None)) for item in items]
+    groups = Group.objects.in_bulk(
+        {pk for pk in group_ids if isinstance(pk, int)}
+    )
+    posts, errors = [], []
+    for item, group_id in zip(items, group_ids):
+        form = PostForm(data=item)
+        if group_id is not None and group_id not in groups:
+            form.add_error(
+                'group',
+                form.fields['group'].error_messages['invalid_choice'],
+            )
+        if form.is_valid():
+            post = form.save(commit=False)
+            post.author = user
+            post.group = groups.get(group_id)
+            posts.append(post)
+            errors.append(None)
+        else:
+            posts.append(None)
+            errors.append(form.errors.get_json_data())
+    return posts, errors
+
+
+def validate_comments(items, user):
+    """Проверяет комментарии логикой CommentForm и наличие постов."""
+    items = [item if isinstance(item, dict) else {} for item in items]
+    post_ids = [item_pk(item.get('post')) for item in items]
+    existing = dict(
+        Post.objects.filter(
+            pk__in={pk for pk in post_ids if isinstance(pk, int)}
+        )
+        .order_by()
+        .values_list('pk', 'group_id')
+    )
+    comments, errors = [], []
+    for item, post_id in zip(items, post_ids):
+        form = CommentForm(data=item)
+        if post_id not in existing:
+            form.add_error(None, 'Пост не найден.')
+        if form.is_valid():
+            comment = form.save(commit=False)
+            comment.author = user
+            # Группа поста нужна рейтингу, отдельный запрос не делаем
+            comment.post = Post(pk=post_id, group_id=existing[post_id])
+            comments.append(comment)
+            errors.append(None)
+        else:
+            comments.append(None)
+            errors.append(form.errors.get_json_data())
+    return comments, errors
+
+
+def create_all(model, objects, author):
+    """
+    bulk_create, после которого у объектов есть pk. SQLite ключей из
+    bulk_create не возвращает: берём последние строки автора, пока
+    транзакция держит блокировку записи и чужих вставок между ними нет.
+    """
+    created = model.objects.bulk_create(objects)
+    if created and created[0].pk is None:
+        pks = (
+            model.objects.filter(author=author)
+            .order_by('-pk')
+            .values_list('pk', flat=True)[:len(created)]
+        )
+        for obj, pk in zip(created, reversed(pks)):
+            obj.pk = pk
+    return created
+
+
+def batch_results(objects, errors):
+    return [
+        {'status': 'created', 'id': obj.pk}
+        if error is None
+        else {'status': 'invalid', 'errors': error}
+        for obj, error in zip(objects, errors)
+    ]
+
+
+@require_POST
+@write_gate
+def batch(request):
+    """
+    Пакетное создание постов и комментариев:
+    {"posts": [{"text": ..., "group": id}], "comments": [{"post": id,
+    "text": ...}]}. Каждый элемент проверяется формой сайта, все корректные
+    вставляются bulk_create в одной транзакции. В ответе результат и id по
+    каждому элементу. Каждый элемент расходует единицу лимита api_batch:
+    лимиты форм сайта меньше одного полного пакета.
+    """
+    if not request.user.is_authenticated:
+        return json_error('Требуется авторизация.', HTTPStatus.UNAUTHORIZED)
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return json_error('Тело запроса — не JSON.', HTTPStatus.BAD_REQUEST)
+    if not isinstance(payload, dict):
+        return json_error('Ожидается JSON-объект.', HTTPStatus.BAD_REQUEST)
+    post_items = payload.get('posts') or []
+    comment_items = payload.get('comments') or []
+    if not isinstance(post_items, list) or not isinstance(
+        comment_items, list
+    ):
+        return json_error(
+            'posts и comments должны быть списками.', HTTPStatus.BAD_REQUEST
+        )
+    if len(post_items) + len(comment_items) > settings.API_BATCH_MAX_ITEMS:
+        return json_error(
+            f'Не больше {settings.API_BATCH_MAX_ITEMS} элементов за запрос.',
+            HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+        )
+    wait = limit_wait(
+        request, {'api_batch': len(post_items) + len(comment_items)}
+    )
+    if wait:
+        response = json_error(
+            'Слишком много запросов.', HTTPStatus.TOO_MANY_REQUESTS
+        )
+        response['Retry-After'] = str(max(1, math.ceil(wait)))
+        return response
+
+    posts, post_errors = validate_posts(post_items, request.user)
+    comments, comment_errors = validate_comments(comment_items, request.user)
+    with transaction.atomic():
+        created = create_all(
+            Post, [post for post in posts if post], request.user
+        )
+        create_all(
+            Comment, [item for item in comments if item], request.user
+        )
+    # bulk_create не отправляет сигналы: ленты и рейтинг обновляем явно
+    posts_changed(created)
+    hot.posts_added(created)
+    hot.comments_added(
+        (comment.post_id, comment.post.group_id)
+        for comment in comments
+        if comment
+    )
+
+    return json_response(
+        {
+            'posts': batch_results(posts, post_errors),
+            'comments': batch_results(comments, comment_errors),
+        }
+    )
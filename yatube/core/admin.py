@@ -0,0 +1,98 @@
+from django.contrib import admin
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+
+from .models import OutboxMessage, RequestProfile, Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'name',
+        'status',
+        'attempts',
+        'run_at',
+        'duration',
+    )
+    list_filter = ('status', 'name')
+    search_fields = ('name',)
+    empty_value_display = '-пусто-'
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'recipients',
+        'subject',
+        'status',
+        'attempts',
+        'created',
+        'sent_at',
+    )
+    list_filter = ('status',)
+    search_fields = ('recipients', 'subject')
+    empty_value_display = '-пусто-'
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'method',
+        'path',
+        'username',
+        'status_code',
+        'mode',
+        'duration',
+        'query_count',
+        'created',
+        'download_link',
+    )
+    list_filter = ('mode', 'method', 'status_code')
+    search_fields = ('path', 'username')
+    exclude = ('data',)
+    empty_value_display = '-пусто-'
+
+    def get_readonly_fields(self, request, obj=None):
+        return [
+            field.name
+            for field in self.model._meta.fields
+            if field.name != 'data'
+        ] + ['download_link']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                '<int:pk>/download/',
+                self.admin_site.admin_view(self.download),
+                name='core_requestprofile_download',
+            )
+        ] + super().get_urls()
+
+    def download_link(self, obj):
+        url = reverse('admin:core_requestprofile_download', args=[obj.pk])
+        return format_html('<a href="{}">{}</a>', url, obj.filename)
+
+    download_link.short_description = 'файл'
+
+    def download(self, request, pk):
+        if not self.has_view_permission(request):
+            return HttpResponse(status=403)
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        response = HttpResponse(
+            bytes(profile.data), content_type='application/octet-stream'
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{profile.filename}"'
+        )
+        return response
@@ -0,0 +1,56 @@
+"""
+Пользователь запроса из кеша.
+
+AuthenticationMiddleware на каждом запросе загружает пользователя по id
+из сессии. CachedModelBackend берёт его из кеша; запись сбрасывается
+сигналами при сохранении и удалении пользователя (core.signals), так что
+смена пароля или блокировка видны со следующего запроса.
+
+Сброс работает во всех процессах, только если кеш общий. В LocMemCache
+у каждого процесса своя копия, и другой воркер принимал бы старую сессию
+до истечения записи, поэтому с ним пользователь не кешируется (кроме
+AUTH_USER_CACHE_LOCAL для одного процесса, например в тестах).
+QuerySet.update() сигналов не отправляет: после изменения пользователей
+через update() вызывайте forget_user().
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import PermissionDenied
+
+USER_KEY = 'auth_user:{}'
+
+
+def forget_user(user_id):
+    cache.delete(USER_KEY.format(user_id))
+
+
+def cache_is_shared():
+    return settings.AUTH_USER_CACHE_LOCAL or not isinstance(
+        caches['default'], LocMemCache
+    )
+
+
+class CachedModelBackend(ModelBackend):
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user = super().authenticate(
+            request, username=username, password=password, **kwargs
+        )
+        if user is None and password is not None:
+            # Следующий в AUTHENTICATION_BACKENDS ModelBackend (он нужен
+            # для старых сессий) проверил бы тот же пароль ещё раз
+            raise PermissionDenied
+        return user
+
+    def get_user(self, user_id):
+        if not cache_is_shared():
+            return super().get_user(user_id)
+        key = USER_KEY.format(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
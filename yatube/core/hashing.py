@@ -0,0 +1,70 @@
+"""
+Хеширование паролей в ограниченном пуле потоков.
+
+PBKDF2 занимает процессор на десятки миллисекунд, и пачка входов после
+сбоя забирает под него все воркеры, а ленты перестают отвечать. Здесь
+хеш считается в пуле из PASSWORD_HASH_WORKERS потоков (hashlib отпускает
+GIL, потоки считают параллельно). Ждать пула могут не больше
+PASSWORD_HASH_QUEUE запросов сразу, остальные без ожидания получают
+PoolBusy, и OverloadMiddleware отвечает на него 503.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class PoolBusy(Exception):
+    """Очередь пула заполнена, работа отклонена без ожидания."""
+
+
+class BoundedPool:
+    """Пул потоков, который не ставит в очередь больше ``depth`` задач."""
+
+    def __init__(self, workers, depth):
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='password-hash'
+        )
+        self.slots = threading.BoundedSemaphore(depth)
+
+    def run(self, func, *args):
+        """Выполняет func в пуле и ждёт результата."""
+        if not self.slots.acquire(blocking=False):
+            raise PoolBusy
+        try:
+            future = self.executor.submit(func, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future.result()
+
+
+@lru_cache(maxsize=None)
+def hash_pool(workers, depth):
+    return BoundedPool(workers, depth)
+
+
+# Потоки пула не переживают fork: дочерний процесс создаст свой пул
+os.register_at_fork(after_in_child=hash_pool.cache_clear)
+
+
+class PooledPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 в формате Django, посчитанный в пуле. Число итераций
+    берётся из PASSWORD_HASH_ITERATIONS; хеш с другим числом итераций
+    Django пересчитывает при следующем успешном входе (must_update).
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
+
+    def encode(self, password, salt, iterations=None):
+        pool = hash_pool(
+            settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE
+        )
+        return pool.run(super().encode, password, salt, iterations)
@@ -0,0 +1,141 @@
+"""
+Очередь исходящих писем.
+
+OutboxBackend (EMAIL_BACKEND) не отправляет письмо, а сохраняет его
+в таблицу core_outboxmessage и ставит в очередь задачу доставки, так что
+запрос не ждёт SMTP или диска. Задача ``deliver_outbox`` выполняется
+воркером через OUTBOX_FLUSH_DELAY секунд, забирает письма пачками по
+OUTBOX_BATCH_SIZE и отправляет их настоящим бэкендом
+EMAIL_DELIVERY_BACKEND через одно соединение.
+
+Если воркер упал посреди отправки, его пачка через OUTBOX_CLAIM_TIMEOUT
+секунд снова доступна для отправки (задача доставки сама вернётся
+в очередь, см. core.tasks). Такие письма могут уйти дважды, но не
+потеряются.
+"""
+import json
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import OutboxMessage, Task
+from .tasks import enqueue
+
+DELIVER_TASK = 'core.mail.deliver_outbox'
+
+
+def serialize(message):
+    if message.attachments:
+        raise ValueError('Письма с вложениями очередь не поддерживает.')
+    return json.dumps(
+        {
+            'subject': message.subject,
+            'body': message.body,
+            'from_email': message.from_email,
+            'to': message.to,
+            'cc': message.cc,
+            'bcc': message.bcc,
+            'reply_to': message.reply_to,
+            'headers': message.extra_headers,
+            'alternatives': getattr(message, 'alternatives', []),
+        },
+        ensure_ascii=False,
+    )
+
+
+def deserialize(payload):
+    data = json.loads(payload)
+    alternatives = [tuple(item) for item in data.pop('alternatives')]
+    return EmailMultiAlternatives(alternatives=alternatives, **data)
+
+
+def schedule_delivery():
+    """Ставит доставку в очередь, если она ещё не запланирована."""
+    scheduled = Task.objects.filter(
+        name=DELIVER_TASK, status=Task.PENDING
+    ).exists()
+    if not scheduled:
+        enqueue(
+            DELIVER_TASK,
+            run_at=timezone.now()
+            + timedelta(seconds=settings.OUTBOX_FLUSH_DELAY),
+        )
+
+
+class OutboxBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        rows = [
+            OutboxMessage(
+                recipients=', '.join(message.recipients()),
+                subject=message.subject,
+                payload=serialize(message),
+            )
+            for message in email_messages
+        ]
+        if not rows:
+            return 0
+        OutboxMessage.objects.bulk_create(rows)
+        schedule_delivery()
+        return len(rows)
+
+
+def claimable(now):
+    """Письма в очереди и пачки, брошенные упавшим воркером."""
+    stale = now - timedelta(seconds=settings.OUTBOX_CLAIM_TIMEOUT)
+    return Q(status=OutboxMessage.PENDING) | Q(
+        status=OutboxMessage.SENDING, claimed_at__lt=stale
+    )
+
+
+def claim_batch(size):
+    """
+    Помечает пачку писем меткой воркера одним UPDATE: письмо, которое
+    успел забрать другой воркер, в пачку не попадёт.
+    """
+    token = uuid.uuid4().hex
+    now = timezone.now()
+    pending = OutboxMessage.objects.filter(claimable(now))
+    ids = list(pending.values_list('pk', flat=True)[:size])
+    OutboxMessage.objects.filter(claimable(now), pk__in=ids).update(
+        status=OutboxMessage.SENDING,
+        claim=token,
+        claimed_at=now,
+        attempts=F('attempts') + 1,
+    )
+    return list(OutboxMessage.objects.filter(pk__in=ids, claim=token))
+
+
+def deliver_outbox(batch_size=None):
+    """
+    Отправляет накопившиеся письма пачками через одно соединение.
+    Если отправка упала, пачка возвращается в очередь, а задача
+    повторяется по обычным правилам очереди.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    sent = 0
+    with get_connection(settings.EMAIL_DELIVERY_BACKEND) as connection:
+        while True:
+            batch = claim_batch(batch_size)
+            if not batch:
+                return sent
+            claimed = OutboxMessage.objects.filter(
+                pk__in=[row.pk for row in batch]
+            )
+            try:
+                connection.send_messages(
+                    [deserialize(row.payload) for row in batch]
+                )
+            except Exception as error:
+                claimed.update(
+                    status=OutboxMessage.PENDING,
+                    claim='',
+                    last_error=repr(error),
+                )
+                raise
+            claimed.update(status=OutboxMessage.SENT, sent_at=timezone.now())
+            sent += len(batch)
@@ -0,0 +1,98 @@
+import re
+import statistics
+import threading
+import time
+from collections import Counter
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, build_opener
+
+from django.core.management.base import BaseCommand
+
+CSRF_INPUT = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+def fetch(opener, url, data=None):
+    """Код ответа и время запроса в миллисекундах."""
+    started = time.monotonic()
+    try:
+        with opener.open(url, data=data) as response:
+            response.read()
+            status = response.status
+    except HTTPError as error:
+        status = error.code
+    return status, (time.monotonic() - started) * 1000
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return f'p50 {statistics.median(timings):.0f} мс, p95 {p95:.0f} мс'
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест входа на запущенном сервере: шлёт поток входов '
+        'с неверным паролем и замеряет, как при этом отвечает лента.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument('--feed-path', default='/')
+        parser.add_argument('--login-path', default='/auth/login/')
+        parser.add_argument('--logins', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--feed-requests', type=int, default=50)
+
+    def measure_feed(self, url, count):
+        opener = build_opener()
+        return [fetch(opener, url)[1] for _ in range(count)]
+
+    def login_worker(self, url, count, statuses, lock):
+        opener = build_opener(HTTPCookieProcessor(CookieJar()))
+        with opener.open(url) as response:
+            token = CSRF_INPUT.search(response.read().decode()).group(1)
+        data = urlencode(
+            {
+                'username': 'login-stress',
+                'password': 'wrong-password',
+                'csrfmiddlewaretoken': token,
+            }
+        ).encode()
+        for _ in range(count):
+            status = fetch(opener, url, data)[0]
+            with lock:
+                statuses[status] += 1
+
+    def handle(self, *args, **options):
+        base = options['url'].rstrip('/')
+        feed_url = base + options['feed_path']
+        login_url = base + options['login_path']
+
+        baseline = self.measure_feed(feed_url, options['feed_requests'])
+        self.stdout.write(f'Лента без нагрузки: {percentiles(baseline)}')
+
+        statuses = Counter()
+        lock = threading.Lock()
+        per_worker = max(1, options['logins'] // options['concurrency'])
+        workers = [
+            threading.Thread(
+                target=self.login_worker,
+                args=(login_url, per_worker, statuses, lock),
+            )
+            for _ in range(options['concurrency'])
+        ]
+        started = time.monotonic()
+        for worker in workers:
+            worker.start()
+        loaded = self.measure_feed(feed_url, options['feed_requests'])
+        for worker in workers:
+            worker.join()
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(f'Лента во время входов: {percentiles(loaded)}')
+        self.stdout.write(
+            f'Входов: {sum(statuses.values())} за {elapsed:.1f} с, '
+            f'ответы: {dict(sorted(statuses.items()))}'
+        )
@@ -0,0 +1,97 @@
+import os
+import statistics
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.tasks import claim, execute
+
+
+def init_worker():
+    """Подготовка дочернего процесса: свои соединения с базой."""
+    django.setup()
+    connections.close_all()
+
+
+def work(poll_interval, once):
+    """
+    Цикл воркера. Возвращает список (имя задачи, статус, длительность)
+    для итоговой статистики.
+    """
+    metrics = []
+    while True:
+        task = claim()
+        if task is None:
+            if once:
+                return metrics
+            time.sleep(poll_interval)
+            continue
+        task = execute(task)
+        metrics.append((task.name, task.status, task.duration))
+
+
+class Command(BaseCommand):
+    help = 'Запускает воркеры фоновой очереди задач.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Количество процессов-воркеров.',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=settings.TASK_POLL_INTERVAL,
+            help='Пауза в секундах, если очередь пуста.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить накопившиеся задачи и выйти.',
+        )
+
+    def handle(self, *args, **options):
+        processes = max(options['processes'], 1)
+        poll_interval = options['poll_interval']
+        once = options['once']
+
+        if processes == 1:
+            results = [work(poll_interval, once)]
+        else:
+            # Дочерние процессы не должны наследовать открытые соединения.
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=processes, initializer=init_worker
+            ) as pool:
+                futures = [
+                    pool.submit(work, poll_interval, once)
+                    for _ in range(processes)
+                ]
+                results = [future.result() for future in futures]
+
+        self.report([metric for result in results for metric in result])
+
+    def report(self, metrics):
+        durations = defaultdict(list)
+        statuses = defaultdict(lambda: defaultdict(int))
+        for name, status, duration in metrics:
+            durations[name].append(duration)
+            statuses[name][status] += 1
+
+        for name, values in sorted(durations.items()):
+            counts = ', '.join(
+                f'{status}: {count}'
+                for status, count in sorted(statuses[name].items())
+            )
+            self.stdout.write(
+                f'{name}: {len(values)} шт. ({counts}), '
+                f'среднее {statistics.mean(values):.3f} с, '
+                f'максимум {max(values):.3f} с'
+            )
@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.startup import TARGETS, measure
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает время холодного старта и дерево импортов '
+        'для yatube.wsgi и manage.py.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'targets', nargs='*', help=f'Цели: {", ".join(TARGETS)}.'
+        )
+        parser.add_argument(
+            '--min-ms',
+            type=float,
+            default=5.0,
+            help='Не показывать модули, импорт которых занял меньше.',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=10,
+            help='Сколько самых медленных модулей показать.',
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Завершиться с ошибкой, если бюджет старта превышен.',
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options['targets']) - set(TARGETS)
+        if unknown:
+            raise CommandError(f'Неизвестные цели: {", ".join(unknown)}')
+        min_us = options['min_ms'] * 1000
+        problems = []
+        for target in options['targets'] or list(TARGETS):
+            report = measure(target)
+            budget = settings.STARTUP_TIME_BUDGET[target]
+            self.stdout.write(
+                f'{target}: {report.seconds:.2f} с '
+                f'(бюджет {budget:.2f} с), '
+                f'модулей: {len(report.imports)}'
+            )
+            for entry in report.imports:
+                if entry.cumulative_us >= min_us:
+                    self.stdout.write(
+                        f'{entry.cumulative_us / 1000:9.1f} мс '
+                        f'{entry.self_us / 1000:9.1f} мс  '
+                        f'{"  " * entry.depth}{entry.name}'
+                    )
+            self.stdout.write('Дольше всего импортировались:')
+            for entry in report.slowest(options['top']):
+                self.stdout.write(
+                    f'{entry.self_us / 1000:9.1f} мс  {entry.name}'
+                )
+            if report.seconds > budget:
+                problems.append(f'{target}: старт дольше бюджета')
+            eager = report.deferred_imported()
+            if eager:
+                problems.append(
+                    f'{target}: при старте импортированы '
+                    f'{", ".join(sorted(eager))}'
+                )
+        for problem in problems:
+            self.stderr.write(problem)
+        if options['check'] and problems:
+            raise CommandError('Бюджет старта превышен.')
@@ -0,0 +1,286 @@
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import zlib
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import connection
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import get_max_age, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .hashing import PoolBusy
+from .profiling import Capture, QueryLog, capture_lock, choose_mode
+from .ratelimit import retry_response
+
+try:
+    import brotli
+except ImportError:  # brotli необязателен
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# style.1a2b3c4d5e6f.css — имя с хешем от ManifestStaticFilesStorage.
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^/]+$')
+
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding, кроме явно запрещённых через q=0."""
+    encodings = set()
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        quality = params.strip().replace(' ', '')
+        if name and quality not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            encodings.add(name.strip().lower())
+    return encodings
+
+
+class StaticFilesMiddleware:
+    """
+    Раздаёт собранную collectstatic статику из STATIC_ROOT до остальной
+    обработки запроса. Выбирает заранее сжатую копию (.br/.gz) по
+    Accept-Encoding и отдаёт файл через FileResponse, так что сервер
+    может использовать wsgi.file_wrapper/sendfile без копирования.
+    Файлы с хешем в имени кешируются браузером навсегда (immutable).
+    Если файла в STATIC_ROOT нет, запрос идёт дальше как обычно.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        prefix = settings.STATIC_URL
+        if (
+            settings.STATIC_ROOT
+            and request.method in ('GET', 'HEAD')
+            and request.path.startswith(prefix)
+        ):
+            response = self.serve(request, request.path[len(prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+
+        stat = os.stat(path)
+        immutable = HASHED_NAME.search(name) is not None
+        if not immutable and not was_modified_since(
+            request.META.get('HTTP_IF_MODIFIED_SINCE'),
+            stat.st_mtime,
+            stat.st_size,
+        ):
+            return HttpResponseNotModified()
+
+        content_type = mimetypes.guess_type(path)[0]
+        accepted = accepted_encodings(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        encoding = None
+        for candidate, suffix in PRECOMPRESSED:
+            if candidate in accepted and os.path.isfile(path + suffix):
+                encoding, path = candidate, path + suffix
+                break
+
+        response = FileResponse(
+            open(path, 'rb'),
+            content_type=content_type or 'application/octet-stream',
+        )
+        if encoding:
+            response['Content-Encoding'] = encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        if immutable:
+            response['Cache-Control'] = (
+                f'public, max-age={settings.STATIC_IMMUTABLE_MAX_AGE}, '
+                'immutable'
+            )
+        else:
+            response['Cache-Control'] = (
+                f'public, max-age={settings.STATIC_MAX_AGE}'
+            )
+        return response
+
+
+COMPRESSIBLE_TYPES = re.compile(
+    r'^(text/|application/(json|javascript|xml|x-ndjson|rss\+xml|atom\+xml)'
+    r'|image/svg\+xml)'
+)
+EVENT_STREAM = 'text/event-stream'
+
+
+def compress(data, encoding):
+    """Сжимает байты целиком в br или gzip."""
+    if encoding == 'br':
+        return brotli.compress(data)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks, encoding, flush_size=None):
+    """
+    Сжимает поток по мере генерации. Буфер сбрасывается, когда с прошлого
+    сброса накопилось ``flush_size`` (по умолчанию COMPRESSION_FLUSH_SIZE)
+    байт: клиент получает данные без долгой задержки, а сжатие не портится
+    сбросом на каждую строку. С ``flush_size=0`` сбрасывается каждый кусок.
+    """
+    if flush_size is None:
+        flush_size = settings.COMPRESSION_FLUSH_SIZE
+    if encoding == 'br':
+        compressor = brotli.Compressor()
+        process, flush = compressor.process, compressor.flush
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        process = compressor.compress
+
+        def flush():
+            return compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    pending = 0
+    for chunk in chunks:
+        data = process(chunk)
+        pending += len(chunk)
+        if pending >= flush_size:
+            data += flush()
+            pending = 0
+        if data:
+            yield data
+    yield compressor.finish() if encoding == 'br' else compressor.flush()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Сжатие ответов в brotli (если установлен пакет brotli) или gzip
+    по Accept-Encoding. Маленькие ответы не сжимаются. Потоковые ответы
+    сжимаются по кускам. Для кешируемых ответов (с max-age, например
+    от cache_page) сжатая версия сохраняется в кеше по хешу содержимого,
+    так что страница из кеша сжимается один раз, а не на каждый запрос.
+
+    Файлы (FileResponse) не сжимаются: статика уже сжата заранее,
+    а остальное лучше отдать через sendfile. HTML с CSRF-токеном тоже
+    не сжимается: токен рядом с данными из запроса в сжатом ответе
+    можно подобрать по длине ответа (атака BREACH).
+    """
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or (
+            not response.streaming
+            and len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+        content_type = response.get('Content-Type', '')
+        if isinstance(response, FileResponse) or not (
+            COMPRESSIBLE_TYPES.match(content_type)
+        ):
+            return response
+        if content_type.startswith('text/html') and request.META.get(
+            'CSRF_COOKIE_USED'
+        ):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accepted = accepted_encodings(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if brotli is not None and 'br' in accepted:
+            encoding = 'br'
+        elif 'gzip' in accepted:
+            encoding = 'gzip'
+        else:
+            return response
+
+        if response.streaming:
+            # Каждое событие text/event-stream нужно клиенту сразу
+            flush_size = 0 if content_type.startswith(EVENT_STREAM) else None
+            response.streaming_content = compress_stream(
+                response.streaming_content, encoding, flush_size
+            )
+            del response['Content-Length']
+        else:
+            content = self.compressed_content(response, encoding)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response['Content-Length'] = str(len(content))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def compressed_content(response, encoding):
+        max_age = get_max_age(response)
+        if not max_age:
+            return compress(response.content, encoding)
+        digest = hashlib.md5(response.content).hexdigest()
+        key = f'compressed:{encoding}:{digest}'
+        content = cache.get(key)
+        if content is None:
+            content = compress(response.content, encoding)
+            cache.set(key, content, max_age)
+        return content
+
+
+class OverloadMiddleware(MiddlewareMixin):
+    """
+    Отвечает 503 с Retry-After, если пул хеширования паролей переполнен
+    (core.hashing.PoolBusy): клиент повторит вход позже, а воркер сразу
+    освобождается для остальных страниц.
+    """
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, PoolBusy):
+            return retry_response(
+                request,
+                'core/503.html',
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                settings.PASSWORD_HASH_RETRY_AFTER,
+            )
+        return None
+
+
+class ProfilingMiddleware:
+    """
+    Профилирует выбранные запросы (см. core.profiling) вместе с журналом
+    SQL и отдаёт номер сохранённого профиля в заголовке X-Profile-Id.
+    Должен стоять после AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = settings.PROFILING_ENABLED and choose_mode(request)
+        if not mode or not capture_lock.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            capture = Capture(mode)
+            queries = QueryLog()
+            with connection.execute_wrapper(queries), capture:
+                response = self.get_response(request)
+            try:
+                profile = capture.save(request, response, queries.queries)
+            except Exception:
+                logger.exception('Не удалось сохранить профиль запроса')
+                return response
+        finally:
+            capture_lock.release()
+        response['X-Profile-Id'] = str(profile.pk)
+        return response
@@ -0,0 +1,127 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:44
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'name',
+                    models.CharField(
+                        help_text='Путь к функции, например posts.tasks.warm_thumbnails',
+                        max_length=200,
+                        verbose_name='Функция',
+                    ),
+                ),
+                (
+                    'args',
+                    models.TextField(
+                        default='[]', verbose_name='Аргументы (JSON)'
+                    ),
+                ),
+                (
+                    'kwargs',
+                    models.TextField(
+                        default='{}',
+                        verbose_name='Именованные аргументы (JSON)',
+                    ),
+                ),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[
+                            ('pending', 'В очереди'),
+                            ('running', 'Выполняется'),
+                            ('done', 'Выполнена'),
+                            ('failed', 'Ошибка'),
+                        ],
+                        default='pending',
+                        max_length=10,
+                        verbose_name='Статус',
+                    ),
+                ),
+                (
+                    'attempts',
+                    models.PositiveIntegerField(
+                        default=0, verbose_name='Попыток выполнения'
+                    ),
+                ),
+                (
+                    'max_attempts',
+                    models.PositiveIntegerField(
+                        default=5, verbose_name='Максимум попыток'
+                    ),
+                ),
+                (
+                    'run_at',
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name='Запустить не раньше',
+                    ),
+                ),
+                (
+                    'created',
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name='Дата создания'
+                    ),
+                ),
+                (
+                    'started_at',
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name='Начало выполнения'
+                    ),
+                ),
+                (
+                    'finished_at',
+                    models.DateTimeField(
+                        blank=True,
+                        null=True,
+                        verbose_name='Окончание выполнения',
+                    ),
+                ),
+                (
+                    'duration',
+                    models.FloatField(
+                        blank=True,
+                        null=True,
+                        verbose_name='Время выполнения, с',
+                    ),
+                ),
+                (
+                    'last_error',
+                    models.TextField(
+                        blank=True, verbose_name='Последняя ошибка'
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Фоновая задача',
+                'verbose_name_plural': 'Фоновые задачи',
+                'ordering': ['run_at', 'pk'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(
+                fields=['status', 'run_at'], name='core_task_status_5742ae_idx'
+            ),
+        ),
+    ]
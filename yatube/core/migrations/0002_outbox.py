@@ -0,0 +1,86 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('recipients', models.TextField(verbose_name='Получатели')),
+                ('subject', models.TextField(verbose_name='Тема')),
+                ('payload', models.TextField(verbose_name='Письмо (JSON)')),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[
+                            ('pending', 'В очереди'),
+                            ('sending', 'Отправляется'),
+                            ('sent', 'Отправлено'),
+                        ],
+                        default='pending',
+                        max_length=10,
+                        verbose_name='Статус',
+                    ),
+                ),
+                (
+                    'claim',
+                    models.CharField(
+                        blank=True,
+                        max_length=32,
+                        verbose_name='Метка отправляющего воркера',
+                    ),
+                ),
+                (
+                    'attempts',
+                    models.PositiveIntegerField(
+                        default=0, verbose_name='Попыток отправки'
+                    ),
+                ),
+                (
+                    'created',
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name='Дата создания'
+                    ),
+                ),
+                (
+                    'sent_at',
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name='Дата отправки'
+                    ),
+                ),
+                (
+                    'last_error',
+                    models.TextField(
+                        blank=True, verbose_name='Последняя ошибка'
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Письмо в очереди',
+                'verbose_name_plural': 'Очередь писем',
+                'ordering': ['pk'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outboxmessage',
+            index=models.Index(
+                fields=['status', 'id'], name='core_outbox_status_79eef4_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'method',
+                    models.CharField(max_length=10, verbose_name='Метод'),
+                ),
+                ('path', models.TextField(verbose_name='Адрес')),
+                (
+                    'username',
+                    models.CharField(
+                        blank=True, max_length=150, verbose_name='Пользователь'
+                    ),
+                ),
+                (
+                    'status_code',
+                    models.PositiveIntegerField(verbose_name='Код ответа'),
+                ),
+                (
+                    'mode',
+                    models.CharField(
+                        choices=[
+                            ('cprofile', 'cProfile'),
+                            ('flamegraph', 'Flamegraph (сэмплы стека)'),
+                        ],
+                        max_length=10,
+                        verbose_name='Профилировщик',
+                    ),
+                ),
+                (
+                    'duration',
+                    models.FloatField(verbose_name='Время ответа, с'),
+                ),
+                (
+                    'query_count',
+                    models.PositiveIntegerField(verbose_name='SQL-запросов'),
+                ),
+                ('stats', models.TextField(verbose_name='Сводка')),
+                (
+                    'data',
+                    models.BinaryField(
+                        help_text='Дамп pstats или свёрнутые стеки для flamegraph.pl',
+                        verbose_name='Данные для скачивания',
+                    ),
+                ),
+                ('sql', models.TextField(verbose_name='SQL-запросы (JSON)')),
+                (
+                    'created',
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name='Дата создания'
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Профиль запроса',
+                'verbose_name_plural': 'Профили запросов',
+                'ordering': ['-pk'],
+            },
+        ),
+    ]
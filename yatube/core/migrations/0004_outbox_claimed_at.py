@@ -0,0 +1,20 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_request_profile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='claimed_at',
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name='Забрано воркером'
+            ),
+        ),
+    ]
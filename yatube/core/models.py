@@ -0,0 +1,151 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(
+        max_length=200,
+        verbose_name="Функция",
+        help_text="Путь к функции, например posts.tasks.warm_thumbnails",
+    )
+    args = models.TextField(default='[]', verbose_name="Аргументы (JSON)")
+    kwargs = models.TextField(
+        default='{}', verbose_name="Именованные аргументы (JSON)"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name="Статус",
+    )
+    attempts = models.PositiveIntegerField(
+        default=0, verbose_name="Попыток выполнения"
+    )
+    max_attempts = models.PositiveIntegerField(
+        default=5, verbose_name="Максимум попыток"
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now, verbose_name="Запустить не раньше"
+    )
+    created = models.DateTimeField(
+        auto_now_add=True, verbose_name="Дата создания"
+    )
+    started_at = models.DateTimeField(
+        blank=True, null=True, verbose_name="Начало выполнения"
+    )
+    finished_at = models.DateTimeField(
+        blank=True, null=True, verbose_name="Окончание выполнения"
+    )
+    duration = models.FloatField(
+        blank=True, null=True, verbose_name="Время выполнения, с"
+    )
+    last_error = models.TextField(blank=True, verbose_name="Последняя ошибка")
+
+    def __str__(self):
+        return f'{self.name} [{self.status}]'
+
+    class Meta:
+        ordering = ["run_at", "pk"]
+        indexes = [models.Index(fields=['status', 'run_at'])]
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+
+
+class OutboxMessage(models.Model):
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (SENDING, 'Отправляется'),
+        (SENT, 'Отправлено'),
+    )
+
+    recipients = models.TextField(verbose_name="Получатели")
+    subject = models.TextField(verbose_name="Тема")
+    payload = models.TextField(verbose_name="Письмо (JSON)")
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name="Статус",
+    )
+    claim = models.CharField(
+        max_length=32, blank=True, verbose_name="Метка отправляющего воркера"
+    )
+    claimed_at = models.DateTimeField(
+        blank=True, null=True, verbose_name="Забрано воркером"
+    )
+    attempts = models.PositiveIntegerField(
+        default=0, verbose_name="Попыток отправки"
+    )
+    created = models.DateTimeField(
+        auto_now_add=True, verbose_name="Дата создания"
+    )
+    sent_at = models.DateTimeField(
+        blank=True, null=True, verbose_name="Дата отправки"
+    )
+    last_error = models.TextField(blank=True, verbose_name="Последняя ошибка")
+
+    def __str__(self):
+        return f'{self.recipients}: {self.subject}'
+
+    class Meta:
+        ordering = ["pk"]
+        indexes = [models.Index(fields=['status', 'id'])]
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+
+
+class RequestProfile(models.Model):
+    CPROFILE = 'cprofile'
+    FLAMEGRAPH = 'flamegraph'
+    MODE_CHOICES = (
+        (CPROFILE, 'cProfile'),
+        (FLAMEGRAPH, 'Flamegraph (сэмплы стека)'),
+    )
+
+    method = models.CharField(max_length=10, verbose_name="Метод")
+    path = models.TextField(verbose_name="Адрес")
+    username = models.CharField(
+        max_length=150, blank=True, verbose_name="Пользователь"
+    )
+    status_code = models.PositiveIntegerField(verbose_name="Код ответа")
+    mode = models.CharField(
+        max_length=10, choices=MODE_CHOICES, verbose_name="Профилировщик"
+    )
+    duration = models.FloatField(verbose_name="Время ответа, с")
+    query_count = models.PositiveIntegerField(verbose_name="SQL-запросов")
+    stats = models.TextField(verbose_name="Сводка")
+    data = models.BinaryField(
+        verbose_name="Данные для скачивания",
+        help_text="Дамп pstats или свёрнутые стеки для flamegraph.pl",
+    )
+    sql = models.TextField(verbose_name="SQL-запросы (JSON)")
+    created = models.DateTimeField(
+        auto_now_add=True, verbose_name="Дата создания"
+    )
+
+    def __str__(self):
+        return f'{self.method} {self.path}'
+
+    @property
+    def filename(self):
+        extension = 'prof' if self.mode == self.CPROFILE else 'folded'
+        return f'profile-{self.pk}.{extension}'
+
+    class Meta:
+        ordering = ["-pk"]
+        verbose_name = 'Профиль запроса'
+        verbose_name_plural = 'Профили запросов'
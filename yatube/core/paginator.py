@@ -0,0 +1,69 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+ELLIPSIS = '…'
+
+
+def elided_page_range(page_obj, on_each_side=2, on_ends=1):
+    """
+    Номера страниц для навигации: первые и последние on_ends страниц
+    и по on_each_side вокруг текущей, пропуски заменены на ELLIPSIS.
+    Размер навигации не зависит от общего числа страниц.
+    """
+    number = page_obj.number
+    num_pages = page_obj.paginator.num_pages
+    if num_pages <= (on_each_side + on_ends) * 2:
+        return list(range(1, num_pages + 1))
+
+    pages = []
+    if number > 1 + on_each_side + on_ends + 1:
+        pages.extend(range(1, on_ends + 1))
+        pages.append(ELLIPSIS)
+        pages.extend(range(number - on_each_side, number + 1))
+    else:
+        pages.extend(range(1, number + 1))
+
+    if number < num_pages - on_each_side - on_ends - 1:
+        pages.extend(range(number + 1, number + on_each_side + 1))
+        pages.append(ELLIPSIS)
+        pages.extend(range(num_pages - on_ends + 1, num_pages + 1))
+    else:
+        pages.extend(range(number + 1, num_pages + 1))
+    return pages
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator для админки больших таблиц. Для нефильтрованного списка
+    на PostgreSQL берёт оценку числа строк из статистики планировщика
+    вместо точного COUNT(*), который на миллионах строк читает всю таблицу.
+    В остальных случаях считает как обычный Paginator.
+    """
+
+    # Ниже этого порога оценка неточна, дешевле посчитать честно.
+    ESTIMATE_THRESHOLD: int = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is not None and not query.where:
+            estimate = self.estimate(queryset)
+            if estimate is not None and estimate > self.ESTIMATE_THRESHOLD:
+                return estimate
+        return super().count
+
+    @staticmethod
+    def estimate(queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row else None
@@ -0,0 +1,196 @@
+"""
+Профилирование отдельных запросов на боевом сервере.
+
+Профилируются запросы сотрудников с заголовком ``X-Profile: cprofile``
+или ``X-Profile: flamegraph``, а также доля PROFILING_SAMPLE_RATE
+запросов к адресам из PROFILING_PATHS. Для запроса сохраняется
+статистика cProfile или сэмплы стека (свёрнутые стеки для flamegraph.pl
+и speedscope) вместе с журналом SQL. Хранятся последние
+PROFILING_BUFFER_SIZE профилей, смотреть и скачивать их можно в админке.
+"""
+import cProfile
+import io
+import json
+import marshal
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+from .models import RequestProfile
+
+MODES = (RequestProfile.CPROFILE, RequestProfile.FLAMEGRAPH)
+# Строковые и числовые литералы: без них в профиле нет данных запроса
+# (email, токенов, текстов), а SQL не зависит от данных теста
+SQL_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+# Сколько строк статистики cProfile показывать в сводке
+STATS_LINES: int = 60
+# Профилируется не больше одного запроса процесса одновременно
+capture_lock = threading.Lock()
+
+
+def choose_mode(request):
+    """Режим профилирования запроса или None, если профилировать не нужно."""
+    requested = request.META.get('HTTP_X_PROFILE', '').lower()
+    if requested in MODES and request.user.is_staff:
+        return requested
+    rate = settings.PROFILING_SAMPLE_RATE
+    if rate and any(
+        re.match(pattern, request.path)
+        for pattern in settings.PROFILING_PATHS
+    ):
+        if random.random() < rate:
+            return settings.PROFILING_DEFAULT_MODE
+    return None
+
+
+def normalize_sql(sql):
+    return SQL_LITERALS.sub('?', sql)
+
+
+class QueryLog:
+    """
+    Журнал SQL для connection.execute_wrapper: текст запроса без
+    литералов и время выполнения в секундах.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                {
+                    'sql': normalize_sql(sql),
+                    'time': '%.3f' % (time.monotonic() - started),
+                }
+            )
+
+
+def frame_label(frame):
+    code = frame.f_code
+    filename = os.path.relpath(code.co_filename, settings.BASE_DIR)
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'
+
+
+class StackSampler:
+    """
+    Раз в ``interval`` секунд снимает стек потока ``thread_id``
+    и считает одинаковые стеки.
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def collapsed(self):
+        """Стеки в свёрнутом формате: «a;b;c число_сэмплов» на строку."""
+        return ''.join(
+            f'{stack} {count}\n' for stack, count in self.stacks.most_common()
+        )
+
+
+class CProfiler:
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def summary(self):
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=stream)
+        stats.sort_stats('cumulative').print_stats(STATS_LINES)
+        return stream.getvalue()
+
+    def dump(self):
+        """Данные в формате файла pstats (для snakeviz, pstats.Stats)."""
+        self.profile.create_stats()
+        return marshal.dumps(self.profile.stats)
+
+
+class Capture:
+    """Профилирование одного запроса в выбранном режиме."""
+
+    def __init__(self, mode):
+        self.mode = mode
+        if mode == RequestProfile.FLAMEGRAPH:
+            self.profiler = StackSampler(
+                threading.get_ident(), settings.PROFILING_SAMPLE_INTERVAL
+            )
+        else:
+            self.profiler = CProfiler()
+
+    def __enter__(self):
+        self.started = time.monotonic()
+        self.profiler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.stop()
+        self.duration = time.monotonic() - self.started
+
+    def save(self, request, response, queries):
+        if self.mode == RequestProfile.FLAMEGRAPH:
+            stats = self.profiler.collapsed()
+            data = stats.encode()
+        else:
+            stats = self.profiler.summary()
+            data = self.profiler.dump()
+        profile = RequestProfile.objects.create(
+            method=request.method,
+            path=request.get_full_path(),
+            username=getattr(request.user, 'username', ''),
+            status_code=response.status_code,
+            mode=self.mode,
+            duration=self.duration,
+            query_count=len(queries),
+            stats=stats,
+            data=data,
+            sql=json.dumps(queries, ensure_ascii=False),
+        )
+        trim_profiles(settings.PROFILING_BUFFER_SIZE)
+        return profile
+
+
+def trim_profiles(size):
+    """Оставляет ``size`` последних профилей: кольцевой буфер в таблице."""
+    oldest_kept = (
+        RequestProfile.objects.order_by('-pk')
+        .values_list('pk', flat=True)[size - 1:size]
+        .first()
+    )
+    if oldest_kept is not None:
+        RequestProfile.objects.filter(pk__lt=oldest_kept).delete()
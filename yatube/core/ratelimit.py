@@ -0,0 +1,174 @@
+"""
+Ограничение записи: частота запросов и число одновременных записей.
+
+``ratelimit`` — счётчики запросов в общем кеше отдельно на пользователя
+и на IP. Лимит 'N/m' пропускает N запросов за текущую минуту (окно
+периода), лишние получают 429 с Retry-After до начала следующего окна.
+Счётчики меняются атомарными ``cache.add`` и ``cache.incr``, поэтому
+параллельные запросы не проходят сверх лимита. Запрос, который не прошёл
+хотя бы по одному счётчику, не расходует остальные.
+
+Лимиты общие для процессов, только если CACHES указывает на общий кеш
+(memcached и т. п.); с LocMemCache у каждого процесса свои счётчики,
+и лимит фактически умножается на число процессов.
+
+``write_gate`` не пускает в запись больше WRITE_CONCURRENCY запросов
+процесса одновременно. Лишние ждут не дольше WRITE_QUEUE_TIMEOUT и
+получают 503, так что очередь на блокировку SQLite не растёт бесконечно.
+"""
+import math
+import threading
+import time
+from functools import lru_cache, wraps
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import render
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """'10/m' -> (10, 60): число запросов и период в секундах."""
+    count, _, period = rate.partition('/')
+    return int(count), PERIODS[period]
+
+
+def take_tokens(buckets, now=None):
+    """
+    Списывает ``cost`` с каждого счётчика из ``buckets`` — списка
+    (ключ, лимит, cost). Возвращает 0, если все лимиты соблюдены, иначе
+    сколько секунд ждать; тогда ни один счётчик не меняется.
+    """
+    now = time.time() if now is None else now
+    windows = []
+    for key, rate, cost in buckets:
+        capacity, period = parse_rate(rate)
+        windows.append(
+            (
+                f'{key}:{int(now // period)}',
+                capacity,
+                cost,
+                period,
+                period - now % period,
+            )
+        )
+    counts = cache.get_many([window[0] for window in windows])
+    waits = [
+        wait
+        for key, capacity, cost, period, wait in windows
+        if counts.get(key, 0) + cost > capacity
+    ]
+    if waits:
+        return max(waits)
+    charged = []
+    for key, capacity, cost, period, wait in windows:
+        cache.add(key, 0, period)
+        try:
+            count = cache.incr(key, cost)
+        except ValueError:  # окно истекло между add и incr
+            cache.add(key, cost, period)
+            count = cost
+        charged.append((key, cost))
+        if count > capacity:
+            # Параллельный запрос успел раньше: возвращаем списанное
+            for charged_key, charged_cost in charged:
+                try:
+                    cache.decr(charged_key, charged_cost)
+                except ValueError:
+                    pass
+            return wait
+    return 0
+
+
+def bucket_keys(request, scope):
+    """Счётчики запроса: пользователя (если вошёл) и IP-адреса."""
+    keys = {'ip': f'ratelimit:{scope}:ip:{request.META.get("REMOTE_ADDR")}'}
+    if request.user.is_authenticated:
+        keys['user'] = f'ratelimit:{scope}:user:{request.user.pk}'
+    return keys
+
+
+def retry_response(request, template, status, wait):
+    response = render(request, template, status=status)
+    response['Retry-After'] = str(max(1, math.ceil(wait)))
+    return response
+
+
+def limit_wait(request, costs):
+    """
+    Списывает ``costs`` — {scope: число запросов} — по лимитам RATELIMITS.
+    Возвращает 0 или сколько секунд ждать, если лимит превышен.
+    """
+    if not settings.RATELIMIT_ENABLED:
+        return 0
+    buckets = []
+    for scope, cost in costs.items():
+        if not cost:
+            continue
+        rates = settings.RATELIMITS[scope]
+        buckets.extend(
+            (key, rates[kind], cost)
+            for kind, key in bucket_keys(request, scope).items()
+            if kind in rates
+        )
+    return take_tokens(buckets)
+
+
+def limit_response(request, costs):
+    """Ответ 429, если лимит ``costs`` превышен, иначе None."""
+    wait = limit_wait(request, costs)
+    if wait:
+        return retry_response(
+            request, 'core/429.html', HTTPStatus.TOO_MANY_REQUESTS, wait
+        )
+    return None
+
+
+def ratelimit(scope):
+    """
+    Ограничивает POST-запросы к view лимитами RATELIMITS[scope]
+    вида {'user': '10/m', 'ip': '30/m'}.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method == 'POST':
+                response = limit_response(request, {scope: 1})
+                if response is not None:
+                    return response
+            return view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@lru_cache(maxsize=None)
+def write_slots(size):
+    return threading.BoundedSemaphore(size)
+
+
+def write_gate(view):
+    """Пускает POST-запрос в view, только когда есть свободный слот записи."""
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method != 'POST':
+            return view(request, *args, **kwargs)
+        slots = write_slots(settings.WRITE_CONCURRENCY)
+        if not slots.acquire(timeout=settings.WRITE_QUEUE_TIMEOUT):
+            return retry_response(
+                request,
+                'core/503.html',
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                settings.WRITE_QUEUE_TIMEOUT,
+            )
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            slots.release()
+
+    return wrapper
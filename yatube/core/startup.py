@@ -0,0 +1,105 @@
+"""
+Замер холодного старта.
+
+Цель запускается в отдельном интерпретаторе с ``-X importtime``: так
+видно и общее время старта, и дерево импортов с собственным
+и накопленным временем каждого модуля. Цели:
+
+* ``wsgi`` — импорт yatube.wsgi и загрузка URLconf, то есть всё, что
+  воркер делает до ответа на первый запрос;
+* ``manage`` — ``manage.py check``, обычный старт команды с проверками.
+
+Бюджет старта задаётся в STARTUP_TIME_BUDGET, а модули, которые должны
+импортироваться только при работе с картинками и т. п., перечислены
+в STARTUP_DEFERRED_MODULES.
+"""
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import namedtuple
+
+from django.conf import settings
+
+TARGETS = {
+    'wsgi': [
+        '-c',
+        'import yatube.wsgi\n'
+        'from django.urls import get_resolver\n'
+        'get_resolver().url_patterns',
+    ],
+    'manage': ['manage.py', 'check'],
+}
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+ImportEntry = namedtuple(
+    'ImportEntry', ['name', 'depth', 'self_us', 'cumulative_us']
+)
+
+
+class StartupReport:
+    def __init__(self, target, seconds, imports):
+        self.target = target
+        self.seconds = seconds
+        self.imports = imports
+
+    def modules(self):
+        return {entry.name for entry in self.imports}
+
+    def deferred_imported(self):
+        """
+        Модули из STARTUP_DEFERRED_MODULES, импортированные при старте
+        воркера. manage.py check импортирует Pillow сам, проверяя
+        ImageField, поэтому для него список не проверяется.
+        """
+        if self.target != 'wsgi':
+            return set()
+        return self.modules() & set(settings.STARTUP_DEFERRED_MODULES)
+
+    def slowest(self, limit):
+        """Модули с наибольшим собственным временем импорта."""
+        return sorted(
+            self.imports, key=lambda entry: entry.self_us, reverse=True
+        )[:limit]
+
+
+def parse_importtime(output):
+    """
+    Разбирает вывод ``-X importtime``. Python печатает модуль после всех
+    его зависимостей, поэтому строки переворачиваются: родитель идёт
+    перед детьми, как в дереве.
+    """
+    entries = []
+    for line in output.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append(
+                ImportEntry(
+                    name=name,
+                    depth=(len(indent) - 1) // 2,
+                    self_us=int(self_us),
+                    cumulative_us=int(cumulative_us),
+                )
+            )
+    entries.reverse()
+    return entries
+
+
+def measure(target):
+    """Запускает цель в новом интерпретаторе и возвращает StartupReport."""
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='yatube.settings')
+    started = time.monotonic()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', *TARGETS[target]],
+        cwd=settings.BASE_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    seconds = time.monotonic() - started
+    return StartupReport(target, seconds, parse_importtime(result.stderr))
@@ -0,0 +1,147 @@
+import gzip
+import hashlib
+import io
+import os
+import posixpath
+import uuid
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+try:
+    import brotli
+except ImportError:  # brotli необязателен
+    brotli = None
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Файловое хранилище, которое называет файлы по SHA-256 содержимого:
+    ``posts/ab/cd/abcd...ef.jpg``. Одинаковые загрузки попадают в один
+    файл (и в один набор превью sorl), коллизий имён не бывает.
+
+    Файлы могут использоваться несколькими записями, поэтому удалять их
+    вместе с записью нельзя: неиспользуемые файлы убирает
+    ``manage.py collect_images``.
+    """
+
+    def __init__(self, *args, shard_depth=2, shard_width=2, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.shard_depth = shard_depth
+        self.shard_width = shard_width
+
+    def shards(self, digest):
+        return [
+            digest[level * self.shard_width:(level + 1) * self.shard_width]
+            for level in range(self.shard_depth)
+        ]
+
+    def root_directory(self, name):
+        """
+        Каталог из upload_to. Если name уже выдан этим хранилищем (например,
+        при импорте выгрузки), каталоги-шарды его хеша отбрасываются, иначе
+        тот же файл лёг бы второй копией в posts/ab/cd/ab/cd/.
+        """
+        directory, filename = posixpath.split(name)
+        stem = os.path.splitext(filename)[0]
+        parts = directory.split('/') if directory else []
+        shards = self.shards(stem)
+        if len(stem) == 64 and parts[-len(shards):] == shards:
+            parts = parts[:-len(shards)]
+        return '/'.join(parts)
+
+    def content_name(self, name, content):
+        """Имя файла по содержимому; каталог и расширение берутся из name."""
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        digest = digest.hexdigest()
+
+        name = name.replace('\\', '/')
+        extension = os.path.splitext(name)[1].lower()
+        return posixpath.join(
+            self.root_directory(name),
+            *self.shards(digest),
+            digest + extension,
+        )
+
+    def get_available_name(self, name, max_length=None):
+        # Имя всё равно заменяется хешем в _save, подбирать свободное
+        # имя под исходное незачем.
+        return name
+
+    def _save(self, name, content):
+        name = self.content_name(name, content)
+        try:
+            # Повторная загрузка освежает дату файла: иначе старый файл
+            # без ссылок мог бы удалить collect_images сразу после того,
+            # как на него сослался новый пост.
+            os.utime(self.path(name))
+            return name
+        except FileNotFoundError:
+            pass
+        # Пишем во временный файл рядом и атомарно переименовываем:
+        # параллельная загрузка того же файла просто перезапишет его
+        # тем же содержимым, а читатели не увидят недописанный файл.
+        temporary = super()._save(f'{name}.{uuid.uuid4().hex}.tmp', content)
+        os.replace(self.path(temporary), self.path(name))
+        return name
+
+
+post_images = ContentAddressedStorage()
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Хранилище статики для collectstatic: имена файлов с хешем содержимого
+    (style.css -> style.1a2b3c4d5e6f.css) и рядом заранее сжатые копии
+    .gz и, если установлен пакет brotli, .br. Раздаёт их
+    core.middleware.StaticFilesMiddleware без сжатия на каждый запрос.
+    """
+
+    COMPRESSIBLE_EXTENSIONS = (
+        '.css',
+        '.js',
+        '.svg',
+        '.txt',
+        '.html',
+        '.json',
+        '.xml',
+        '.ico',
+        '.map',
+    )
+    # Сжатая копия не нужна, если экономит меньше 5 %.
+    MIN_RATIO = 0.95
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = set()
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names.add(hashed_name)
+            yield name, hashed_name, processed
+        if not dry_run:
+            for hashed_name in hashed_names:
+                if hashed_name.endswith(self.COMPRESSIBLE_EXTENSIONS):
+                    self.compress(hashed_name)
+
+    def compress(self, name):
+        path = self.path(name)
+        with open(path, 'rb') as source:
+            data = source.read()
+        buffer = io.BytesIO()
+        # mtime=0: одинаковый файл даёт одинаковый архив при каждой сборке.
+        with gzip.GzipFile(fileobj=buffer, mode='wb', mtime=0) as archive:
+            archive.write(data)
+        variants = [('.gz', buffer.getvalue())]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(data)))
+        for suffix, compressed in variants:
+            if len(compressed) < len(data) * self.MIN_RATIO:
+                with open(path + suffix, 'wb') as target:
+                    target.write(compressed)
@@ -0,0 +1,174 @@
+"""
+Фоновая очередь задач поверх основной базы данных.
+
+Задача — это путь к функции и её аргументы в JSON. Воркеры
+(``manage.py run_workers``) забирают задачи из таблицы ``core_task``:
+на PostgreSQL через ``SELECT ... FOR UPDATE SKIP LOCKED``, на SQLite через
+атомарный ``UPDATE ... WHERE status = 'pending'``, который успевает выполнить
+только один воркер. Задача, которая висит в running дольше
+TASK_VISIBILITY_TIMEOUT (воркер упал или был убит), снова доступна для
+захвата; если попытки исчерпаны, она помечается failed.
+"""
+import json
+import logging
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+# Сколько кандидатов перебирать на SQLite, если задачу перехватил сосед.
+CLAIM_CANDIDATES: int = 10
+
+
+def enqueue(name, *args, run_at=None, **kwargs):
+    """
+    Ставит вызов функции ``name`` (строка вида 'posts.tasks.func') в очередь.
+    Аргументы должны сериализоваться в JSON.
+    """
+    return Task.objects.create(
+        name=name,
+        args=json.dumps(args),
+        kwargs=json.dumps(kwargs),
+        max_attempts=settings.TASK_MAX_ATTEMPTS,
+        run_at=run_at or timezone.now(),
+    )
+
+
+def enqueue_many(name, calls, batch_size=None):
+    """
+    Ставит в очередь пачку вызовов одной функции одним bulk_create.
+    ``calls`` — итерируемое кортежей позиционных аргументов.
+    """
+    now = timezone.now()
+    return Task.objects.bulk_create(
+        (
+            Task(
+                name=name,
+                args=json.dumps(args),
+                max_attempts=settings.TASK_MAX_ATTEMPTS,
+                run_at=now,
+            )
+            for args in calls
+        ),
+        batch_size=batch_size,
+    )
+
+
+def claimable(now):
+    """Готовые к выполнению задачи и задачи, брошенные упавшим воркером."""
+    stale = now - timedelta(seconds=settings.TASK_VISIBILITY_TIMEOUT)
+    return Q(status=Task.PENDING, run_at__lte=now) | Q(
+        status=Task.RUNNING,
+        started_at__lt=stale,
+        attempts__lt=F('max_attempts'),
+    )
+
+
+def fail_abandoned(now):
+    """Брошенные задачи без оставшихся попыток помечает failed."""
+    stale = now - timedelta(seconds=settings.TASK_VISIBILITY_TIMEOUT)
+    return Task.objects.filter(
+        status=Task.RUNNING,
+        started_at__lt=stale,
+        attempts__gte=F('max_attempts'),
+    ).update(
+        status=Task.FAILED,
+        finished_at=now,
+        last_error='Воркер не завершил задачу за TASK_VISIBILITY_TIMEOUT',
+    )
+
+
+def claim():
+    """
+    Забирает одну готовую к выполнению задачу и помечает её как running.
+    Возвращает None, если очередь пуста.
+    """
+    now = timezone.now()
+    fail_abandoned(now)
+    pending = Task.objects.filter(claimable(now))
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            task = pending.select_for_update(skip_locked=True).first()
+            if task is None:
+                return None
+            task.status = Task.RUNNING
+            task.attempts += 1
+            task.started_at = now
+            task.save(update_fields=('status', 'attempts', 'started_at'))
+            return task
+
+    candidates = pending.values_list('pk', flat=True)[:CLAIM_CANDIDATES]
+    for pk in candidates:
+        # started_at меняется при захвате, поэтому брошенную задачу
+        # тоже перехватывает только один воркер
+        claimed = Task.objects.filter(claimable(now), pk=pk).update(
+            status=Task.RUNNING, attempts=F('attempts') + 1, started_at=now
+        )
+        if claimed:
+            return Task.objects.get(pk=pk)
+    return None
+
+
+def retry_delay(attempts):
+    """Экспоненциальная задержка перед повтором упавшей задачи."""
+    return timedelta(seconds=settings.TASK_RETRY_BACKOFF ** attempts)
+
+
+def execute(task):
+    """
+    Выполняет забранную задачу, сохраняет результат и время выполнения.
+    Упавшая задача возвращается в очередь с задержкой, пока не исчерпает
+    ``max_attempts``.
+    """
+    started = time.monotonic()
+    try:
+        func = import_string(task.name)
+        func(*json.loads(task.args), **json.loads(task.kwargs))
+    except Exception:
+        task.last_error = traceback.format_exc()
+        if task.attempts >= task.max_attempts:
+            task.status = Task.FAILED
+            logger.error('Задача %s упала: %s', task, task.last_error)
+        else:
+            task.status = Task.PENDING
+            task.run_at = timezone.now() + retry_delay(task.attempts)
+            logger.warning('Задача %s будет повторена', task)
+    else:
+        task.status = Task.DONE
+    task.duration = time.monotonic() - started
+    task.finished_at = timezone.now()
+    task.save(
+        update_fields=(
+            'status',
+            'run_at',
+            'duration',
+            'finished_at',
+            'last_error',
+        )
+    )
+    logger.info('%s выполнена за %.3f с', task, task.duration)
+    return task
+
+
+def run_pending(limit=None):
+    """
+    Выполняет готовые задачи в текущем процессе, пока очередь не опустеет
+    (или не будет выполнено ``limit`` задач). Возвращает выполненные задачи.
+    """
+    processed = []
+    while limit is None or len(processed) < limit:
+        task = claim()
+        if task is None:
+            break
+        processed.append(execute(task))
+    return processed
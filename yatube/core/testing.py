@@ -0,0 +1,164 @@
+"""
+Тестовая инфраструктура.
+
+Общие тестовые данные строятся один раз на процесс. Класс-наследник
+SnapshotTestCase описывает данные в ``seed()``. При первом обращении
+``seed()`` выполняется в транзакции, новые строки всех таблиц
+запоминаются, а транзакция откатывается. Остальные классы с тем же
+``seed()`` получают данные вставкой запомненных строк с теми же pk:
+без хеширования паролей, загрузки картинок и сигналов. Снимки живут
+в памяти процесса, так что при ``manage.py test --parallel`` каждый
+процесс строит свои.
+
+Бюджет запросов. QueryBudgetMixin и фикстура pytest ``query_budget``
+запрашивают страницу с холодным кешем, записывают её SQL-запросы и время
+ответа и сравнивают с бюджетом из QUERY_BUDGET_FILE. Если запросов стало
+больше, тест падает с diff'ом нового SQL против записанного. С переменной
+окружения QUERY_BUDGET_UPDATE=1 бюджет перезаписывается текущими
+значениями (запускать без --parallel).
+"""
+import difflib
+import json
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from .profiling import normalize_sql
+
+
+class Rollback(Exception):
+    pass
+
+
+def table_keys():
+    return {
+        model: set(model._base_manager.values_list('pk', flat=True))
+        for model in apps.get_models(include_auto_created=True)
+    }
+
+
+class Snapshot:
+    def __init__(self, seed):
+        before = table_keys()
+        try:
+            with transaction.atomic():
+                self.objects = seed()
+                self.rows = [
+                    (model, list(model._base_manager.exclude(pk__in=keys)))
+                    for model, keys in before.items()
+                ]
+                raise Rollback
+        except Rollback:
+            pass
+        self.rows = [(model, rows) for model, rows in self.rows if rows]
+
+    def restore(self):
+        # Внешние ключи в SQLite и PostgreSQL проверяются в конце
+        # транзакции, поэтому порядок таблиц неважен.
+        for model, rows in self.rows:
+            model._base_manager.bulk_create(rows)
+        # Строки вставлены с явными pk: в PostgreSQL последовательности
+        # об этом не знают, и следующая вставка получила бы занятый pk
+        reset = connection.ops.sequence_reset_sql(
+            no_style(), [model for model, _ in self.rows]
+        )
+        if reset:
+            with connection.cursor() as cursor:
+                for sql in reset:
+                    cursor.execute(sql)
+        return self.objects
+
+
+class SnapshotTestCase(TestCase):
+    """TestCase, данные которого восстанавливаются из снимка ``seed()``."""
+
+    snapshots = {}
+
+    @classmethod
+    def seed(cls):
+        """Создаёт данные и возвращает словарь атрибутов класса."""
+        return {}
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        seed = cls.seed.__func__
+        if seed not in cls.snapshots:
+            cls.snapshots[seed] = Snapshot(lambda: seed(cls))
+        for name, value in cls.snapshots[seed].restore().items():
+            setattr(cls, name, value)
+
+
+def load_budgets():
+    try:
+        with open(settings.QUERY_BUDGET_FILE, encoding='utf-8') as stream:
+            return json.load(stream)
+    except FileNotFoundError:
+        return {}
+
+
+def update_budget(key, sql):
+    budgets = load_budgets()
+    budgets[key] = {
+        'queries': len(sql),
+        'ms': budgets.get(key, {}).get('ms', settings.QUERY_BUDGET_MS),
+        'sql': sql,
+    }
+    with open(settings.QUERY_BUDGET_FILE, 'w', encoding='utf-8') as stream:
+        json.dump(
+            budgets, stream, ensure_ascii=False, indent=2, sort_keys=True
+        )
+        stream.write('\n')
+
+
+def budget_errors(key, sql, ms):
+    """Список нарушений бюджета ``key``; пустой, если бюджет соблюдён."""
+    if settings.QUERY_BUDGET_UPDATE:
+        update_budget(key, sql)
+        return []
+    budget = load_budgets().get(key)
+    if budget is None:
+        return [
+            f'{key}: нет бюджета в {settings.QUERY_BUDGET_FILE}, '
+            'запишите его с QUERY_BUDGET_UPDATE=1'
+        ]
+    errors = []
+    if len(sql) > budget['queries']:
+        diff = difflib.unified_diff(
+            budget['sql'], sql, 'бюджет', 'сейчас', lineterm=''
+        )
+        errors.append(
+            f'{key}: {len(sql)} SQL-запросов при бюджете '
+            f'{budget["queries"]}\n' + '\n'.join(diff)
+        )
+    if ms > budget['ms']:
+        errors.append(f'{key}: {ms:.0f} мс при бюджете {budget["ms"]} мс')
+    return errors
+
+
+def measure_view(client, url):
+    """Ответ, SQL-запросы и время ответа в мс для страницы с холодным кешем."""
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        response = client.get(url)
+        ms = (time.perf_counter() - started) * 1000
+    return response, [normalize_sql(query['sql']) for query in queries], ms
+
+
+class QueryBudgetMixin:
+    """Проверки бюджета запросов для TestCase."""
+
+    def assertWithinBudget(self, key, url, client=None):
+        response, sql, ms = measure_view(client or self.client, url)
+        self.assertEqual(response.status_code, 200)
+        errors = budget_errors(key, sql, ms)
+        if errors:
+            self.fail('\n\n'.join(errors))
+        return response
@@ -0,0 +1,101 @@
+from unittest import mock
+
+from django.contrib.auth import authenticate, get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from yatube import settings as project_settings
+
+User = get_user_model()
+
+
+class CachedAuthTests(TestCase):
+    """
+    Страница «Об авторе» не читает базу сама, так что все её запросы —
+    это загрузка сессии и пользователя.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(username='reader')
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.get(username='reader')
+        self.url = reverse('about:author')
+
+    def warm_queries(self):
+        """Запросы к базе на повторном просмотре страницы."""
+        self.client.force_login(self.user)
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.context['user'], self.user)
+        return len(queries)
+
+    def test_authenticated_page_costs_no_queries(self):
+        self.assertEqual(self.warm_queries(), 0)
+
+    @override_settings(
+        SESSION_ENGINE='django.contrib.sessions.backends.db',
+        AUTHENTICATION_BACKENDS=['django.contrib.auth.backends.ModelBackend'],
+    )
+    def test_db_sessions_cost_two_queries(self):
+        """Для сравнения: сессия в базе и ModelBackend — два запроса."""
+        self.assertEqual(self.warm_queries(), 2)
+
+    def test_saved_user_is_reloaded(self):
+        self.warm_queries()
+        self.user.first_name = 'Новое'
+        self.user.save()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.context['user'].first_name, 'Новое')
+
+    def test_deactivated_user_is_logged_out(self):
+        self.warm_queries()
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(self.url)
+
+        self.assertFalse(response.context['user'].is_authenticated)
+
+    @override_settings(AUTH_USER_CACHE_LOCAL=False)
+    def test_process_local_cache_is_not_used(self):
+        """С кешем в памяти процесса пользователь читается из базы."""
+        self.assertEqual(self.warm_queries(), 1)
+
+    def test_shipped_sessions_need_shared_cache(self):
+        """С LocMemCache сессии хранятся в базе, а не в кеше процесса."""
+        self.assertFalse(project_settings.CACHE_IS_SHARED)
+        self.assertEqual(
+            project_settings.SESSION_ENGINE,
+            'django.contrib.sessions.backends.db',
+        )
+
+    def test_sessions_of_model_backend_stay_valid(self):
+        """Сессии, созданные с ModelBackend, не разлогиниваются."""
+        self.client.force_login(
+            self.user, backend='django.contrib.auth.backends.ModelBackend'
+        )
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_wrong_password_is_checked_once(self):
+        self.user.set_password('secret')
+        self.user.save()
+
+        with mock.patch.object(
+            User, 'check_password', autospec=True, return_value=False
+        ) as check_password:
+            self.assertIsNone(
+                authenticate(username='reader', password='wrong')
+            )
+
+        self.assertEqual(check_password.call_count, 1)
@@ -0,0 +1,107 @@
+import gzip
+import zlib
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from core import middleware
+from core.middleware import CompressionMiddleware, accepted_encodings
+
+
+class CompressionMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_html_page_is_gzipped(self):
+        """Страница сжимается, если клиент принимает gzip."""
+        response = self.client.get('/', HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn(b'<html', gzip.decompress(response.content))
+
+    def test_not_compressed_without_accept_encoding(self):
+        """Без Accept-Encoding ответ отдаётся как есть."""
+        response = self.client.get('/')
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_cached_page_is_compressed_once(self):
+        """Страница из cache_page сжимается один раз на запись кеша."""
+        with mock.patch.object(
+            middleware, 'compress', wraps=middleware.compress
+        ) as compress:
+            first = self.client.get('/', HTTP_ACCEPT_ENCODING='gzip')
+            second = self.client.get('/', HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(compress.call_count, 1)
+
+    def test_streaming_response_is_compressed_incrementally(self):
+        """Потоковый ответ сжимается по кускам, без Content-Length."""
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        chunks = [b'{"id": %d}\n' % number for number in range(100)]
+        response = StreamingHttpResponse(
+            iter(chunks), content_type='application/x-ndjson'
+        )
+
+        response = CompressionMiddleware().process_response(request, response)
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        body = b''.join(response.streaming_content)
+        self.assertEqual(gzip.decompress(body), b''.join(chunks))
+
+    @override_settings(COMPRESSION_FLUSH_SIZE=1024)
+    def test_stream_is_flushed_per_size_not_per_chunk(self):
+        """Поток сбрасывается раз в COMPRESSION_FLUSH_SIZE байт."""
+        chunks = [b'x' * 100 for _ in range(100)]
+
+        parts = list(middleware.compress_stream(iter(chunks), 'gzip'))
+
+        self.assertLessEqual(len(parts), 100 * 100 // 1024 + 2)
+        self.assertEqual(gzip.decompress(b''.join(parts)), b''.join(chunks))
+
+    def test_event_is_sent_at_once(self):
+        """Небольшое событие text/event-stream уходит клиенту сразу."""
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        event = b'data: ping\n\n'
+
+        def events():
+            yield event
+            self.fail('Сжатие ждёт следующего события')
+
+        response = CompressionMiddleware().process_response(
+            request,
+            StreamingHttpResponse(events(), content_type='text/event-stream'),
+        )
+
+        first = next(iter(response.streaming_content))
+        self.assertEqual(zlib.decompressobj(31).decompress(first), event)
+
+    def test_file_response_is_not_compressed(self):
+        """Файлы отдаются как есть, без сжатия на лету."""
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        response = FileResponse(iter([b'a' * 4096]), content_type='text/plain')
+
+        response = CompressionMiddleware().process_response(request, response)
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_html_with_csrf_token_is_not_compressed(self):
+        """HTML с CSRF-токеном не сжимается из-за BREACH."""
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        request.META['CSRF_COOKIE_USED'] = True
+        response = HttpResponse(b'<html>' + b'a' * 4096)
+
+        response = CompressionMiddleware().process_response(request, response)
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_accepted_encodings(self):
+        """Кодировки с q=0 считаются запрещёнными."""
+        self.assertEqual(
+            accepted_encodings('gzip;q=0, br, deflate ; q=0.5'),
+            {'br', 'deflate'},
+        )
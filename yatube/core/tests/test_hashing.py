@@ -0,0 +1,82 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.hashing import PooledPBKDF2PasswordHasher, hash_pool
+
+User = get_user_model()
+
+POOLED_HASHERS = ['core.hashing.PooledPBKDF2PasswordHasher']
+
+
+@override_settings(PASSWORD_HASHERS=POOLED_HASHERS)
+class PooledHasherTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_hash_format_is_compatible(self):
+        """Хеши пула и стандартного PBKDF2 проверяются друг другом."""
+        pooled = PooledPBKDF2PasswordHasher()
+        standard = PBKDF2PasswordHasher()
+
+        self.assertTrue(standard.verify('pass', pooled.encode('pass', 's')))
+        self.assertTrue(pooled.verify('pass', standard.encode('pass', 's')))
+
+    def test_iterations_upgraded_on_login(self):
+        user = User.objects.create_user(username='reader', password='secret')
+
+        with override_settings(PASSWORD_HASH_ITERATIONS=1000):
+            self.assertTrue(
+                self.client.login(username='reader', password='secret')
+            )
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$1000$'))
+
+
+@override_settings(
+    PASSWORD_HASHERS=POOLED_HASHERS,
+    PASSWORD_HASH_WORKERS=1,
+    PASSWORD_HASH_QUEUE=1,
+)
+class OverloadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(username='reader', password='secret')
+
+    def setUp(self):
+        cache.clear()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.busy = threading.Thread(
+            target=hash_pool(1, 1).run, args=(self.occupy,)
+        )
+        self.busy.start()
+        self.started.wait()
+
+    def tearDown(self):
+        self.release.set()
+        self.busy.join()
+
+    def occupy(self):
+        self.started.set()
+        self.release.wait()
+
+    def test_login_rejected_fast_when_pool_is_full(self):
+        response = self.client.post(
+            reverse('users:login'),
+            {'username': 'reader', 'password': 'secret'},
+        )
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '5')
+
+    def test_feed_responds_while_pool_is_full(self):
+        """Пока пул занят входами, ленты отвечают как обычно."""
+        response = self.client.get(reverse('posts:index'))
+
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,100 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives, send_mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.mail import DELIVER_TASK, claim_batch, deliver_outbox
+from core.models import OutboxMessage, Task
+
+User = get_user_model()
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.OutboxBackend',
+    EMAIL_DELIVERY_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+)
+class OutboxTests(TestCase):
+    def test_password_reset_is_queued(self):
+        """Сброс пароля только кладёт письмо в очередь."""
+        User.objects.create_user(
+            username='reader', email='Reader@Example.com', password='secret'
+        )
+
+        response = self.client.post(
+            reverse('users:password_reset_form'),
+            {'email': 'reader@example.COM'},
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+
+        self.assertEqual(deliver_outbox(), 1)
+
+        self.assertEqual(mail.outbox[0].to, ['Reader@example.com'])
+        self.assertIn('/reset/', mail.outbox[0].body)
+        self.assertEqual(
+            OutboxMessage.objects.get().status, OutboxMessage.SENT
+        )
+
+    def test_one_delivery_task_for_many_messages(self):
+        for number in range(3):
+            send_mail(f'Тема {number}', 'Текст', None, ['to@example.com'])
+
+        self.assertEqual(
+            Task.objects.filter(name=DELIVER_TASK, status=Task.PENDING)
+            .count(),
+            1,
+        )
+
+    def test_batches_keep_message_content(self):
+        message = EmailMultiAlternatives(
+            'Тема', 'Текст', 'from@example.com', ['to@example.com']
+        )
+        message.attach_alternative('<p>Текст</p>', 'text/html')
+        message.send()
+        for number in range(4):
+            send_mail(f'Тема {number}', 'Текст', None, ['to@example.com'])
+
+        self.assertEqual(deliver_outbox(batch_size=2), 5)
+
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(
+            mail.outbox[0].alternatives, [('<p>Текст</p>', 'text/html')]
+        )
+        self.assertFalse(
+            OutboxMessage.objects.exclude(status=OutboxMessage.SENT).exists()
+        )
+
+    def test_failed_batch_returns_to_queue(self):
+        send_mail('Тема', 'Текст', None, ['to@example.com'])
+
+        with mock.patch(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages',
+            side_effect=OSError('SMTP недоступен'),
+        ):
+            with self.assertRaises(OSError):
+                deliver_outbox()
+
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.status, OutboxMessage.PENDING)
+        self.assertIn('SMTP недоступен', message.last_error)
+        self.assertEqual(deliver_outbox(), 1)
+
+    def test_abandoned_batch_is_sent_again(self):
+        """Пачка упавшего воркера отправляется после таймаута."""
+        send_mail('Тема', 'Текст', None, ['to@example.com'])
+        self.assertEqual(len(claim_batch(10)), 1)
+        self.assertEqual(deliver_outbox(), 0)
+
+        OutboxMessage.objects.update(
+            claimed_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertEqual(deliver_outbox(), 1)
+        self.assertEqual(len(mail.outbox), 1)
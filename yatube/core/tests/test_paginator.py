@@ -0,0 +1,39 @@
+from django.core.paginator import Paginator
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase
+
+from core.paginator import ELLIPSIS, elided_page_range
+
+
+class ElidedPageRangeTests(SimpleTestCase):
+    def page(self, number, num_pages=100):
+        return Paginator(range(num_pages), 1).page(number)
+
+    def test_few_pages_are_listed_in_full(self):
+        self.assertEqual(elided_page_range(self.page(2, 5)), [1, 2, 3, 4, 5])
+
+    def test_pages_around_current_and_ends(self):
+        """Первая, последняя и соседние с текущей страницы, между ними …"""
+        cases = {
+            1: [1, 2, 3, ELLIPSIS, 100],
+            4: [1, 2, 3, 4, 5, 6, ELLIPSIS, 100],
+            50: [1, ELLIPSIS, 48, 49, 50, 51, 52, ELLIPSIS, 100],
+            100: [1, ELLIPSIS, 98, 99, 100],
+        }
+        for number, expected in cases.items():
+            with self.subTest(number=number):
+                self.assertEqual(
+                    elided_page_range(self.page(number)), expected
+                )
+
+    def test_navigation_size_does_not_depend_on_page_count(self):
+        """Навигация по 5000 страницам не длиннее, чем по 50."""
+        sizes = []
+        for num_pages in (50, 5000):
+            page_obj = self.page(num_pages // 2, num_pages)
+            page_obj.elided_page_range = elided_page_range(page_obj)
+            html = render_to_string(
+                'posts/includes/paginator.html', {'page_obj': page_obj}
+            )
+            sizes.append(html.count('<li'))
+        self.assertEqual(sizes[0], sizes[1])
@@ -0,0 +1,156 @@
+import json
+import marshal
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import RequestProfile
+from core.profiling import QueryLog, StackSampler, trim_profiles
+
+User = get_user_model()
+
+
+def busy_loop(seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+
+
+class ProfilingMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(
+            username='admin', password='secret', is_staff=True
+        )
+        cls.reader = User.objects.create_user(username='reader')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_staff_header_captures_cprofile(self):
+        self.client.force_login(self.staff)
+
+        response = self.client.get('/', HTTP_X_PROFILE='cprofile')
+
+        profile = RequestProfile.objects.get()
+        self.assertEqual(response['X-Profile-Id'], str(profile.pk))
+        self.assertEqual(profile.path, '/')
+        self.assertEqual(profile.username, 'admin')
+        self.assertEqual(profile.status_code, 200)
+        self.assertIn('cumulative', profile.stats)
+        self.assertIsInstance(marshal.loads(bytes(profile.data)), dict)
+        queries = json.loads(profile.sql)
+        self.assertEqual(len(queries), profile.query_count)
+        self.assertGreater(profile.query_count, 0)
+
+    def test_sql_literals_are_redacted(self):
+        self.client.force_login(self.staff)
+
+        self.client.get('/profile/admin/', HTTP_X_PROFILE='cprofile')
+
+        self.assertNotIn('admin', RequestProfile.objects.get().sql)
+
+    def test_failed_save_keeps_response(self):
+        """Ошибка сохранения профиля только пишется в лог."""
+        self.client.force_login(self.staff)
+
+        with mock.patch(
+            'core.profiling.Capture.save', side_effect=DatabaseError
+        ), self.assertLogs('core.middleware', 'ERROR'):
+            response = self.client.get('/', HTTP_X_PROFILE='cprofile')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Profile-Id', response)
+
+    def test_header_ignored_for_regular_users(self):
+        self.client.force_login(self.reader)
+
+        response = self.client.get('/', HTTP_X_PROFILE='cprofile')
+
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertFalse(RequestProfile.objects.exists())
+
+    @override_settings(
+        PROFILING_PATHS=[r'^/group/'],
+        PROFILING_SAMPLE_RATE=1.0,
+        PROFILING_DEFAULT_MODE='flamegraph',
+    )
+    def test_sampled_paths(self):
+        self.client.get('/')
+        self.client.get('/group/missing/')
+
+        profile = RequestProfile.objects.get()
+        self.assertEqual(profile.path, '/group/missing/')
+        self.assertEqual(profile.mode, RequestProfile.FLAMEGRAPH)
+        self.assertEqual(profile.username, '')
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled(self):
+        self.client.force_login(self.staff)
+
+        self.client.get('/', HTTP_X_PROFILE='cprofile')
+
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_admin_download(self):
+        self.client.force_login(self.staff)
+        self.client.get('/', HTTP_X_PROFILE='flamegraph')
+        profile = RequestProfile.objects.get()
+        self.staff.is_superuser = True
+        self.staff.save()
+
+        response = self.client.get(
+            reverse('admin:core_requestprofile_download', args=[profile.pk])
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(profile.filename, response['Content-Disposition'])
+        self.assertEqual(response.content, bytes(profile.data))
+
+
+class ProfilingToolsTests(TestCase):
+    def test_query_log_drops_literals(self):
+        queries = QueryLog()
+        with connection.execute_wrapper(queries):
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 'secret@example.com', 42")
+
+        self.assertEqual(queries.queries[0]['sql'], 'SELECT ?, ?')
+
+    def test_stack_sampler_collects_stacks(self):
+        sampler = StackSampler(threading.get_ident(), 0.001)
+
+        sampler.start()
+        busy_loop(0.1)
+        sampler.stop()
+
+        self.assertIn('busy_loop', sampler.collapsed())
+
+    def test_trim_profiles_keeps_newest(self):
+        RequestProfile.objects.bulk_create(
+            RequestProfile(
+                method='GET',
+                path=f'/{number}/',
+                status_code=200,
+                mode=RequestProfile.CPROFILE,
+                duration=0,
+                query_count=0,
+                stats='',
+                data=b'',
+                sql='[]',
+            )
+            for number in range(5)
+        )
+
+        trim_profiles(3)
+
+        self.assertEqual(
+            list(RequestProfile.objects.values_list('path', flat=True)),
+            ['/4/', '/3/', '/2/'],
+        )
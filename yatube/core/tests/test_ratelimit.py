@@ -0,0 +1,128 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.ratelimit import take_tokens, write_slots
+from posts.models import Comment, Post
+
+User = get_user_model()
+
+
+class TakeTokensTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_window_allows_limit_then_waits(self):
+        """Лимит '2/m' пропускает два запроса, дальше ждать конца минуты."""
+        buckets = [('bucket', '2/m', 1)]
+        self.assertEqual(take_tokens(buckets, now=0), 0)
+        self.assertEqual(take_tokens(buckets, now=15), 0)
+        self.assertEqual(take_tokens(buckets, now=15), 45)
+        self.assertEqual(take_tokens(buckets, now=60), 0)
+
+    def test_rejected_request_charges_no_bucket(self):
+        """Отказ по одному счётчику не расходует другие."""
+        buckets = [('user', '10/m', 1), ('ip', '1/m', 1)]
+        self.assertEqual(take_tokens(buckets, now=0), 0)
+        for _ in range(5):
+            self.assertTrue(take_tokens(buckets, now=0))
+
+        self.assertEqual(take_tokens([('user', '10/m', 9)], now=0), 0)
+
+    def test_parallel_requests_do_not_exceed_limit(self):
+        """Параллельные запросы проходят не больше лимита."""
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            waits = list(
+                pool.map(
+                    lambda _: take_tokens([('flood', '5/m', 1)], now=0),
+                    range(40),
+                )
+            )
+
+        self.assertEqual(waits.count(0), 5)
+
+
+@override_settings(
+    RATELIMITS={
+        'post_create': {'user': '2/m', 'ip': '10/m'},
+        'post_edit': {'user': '1/m'},
+        'add_comment': {'user': '10/m', 'ip': '1/m'},
+    }
+)
+class RateLimitViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='writer')
+        cls.post = Post.objects.create(text='Пост', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_post_create_limited_per_user(self):
+        url = reverse('posts:post_create')
+        for number in range(2):
+            self.client.post(url, {'text': f'Пост {number}'})
+
+        response = self.client.post(url, {'text': 'Лишний'})
+
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(response.has_header('Retry-After'))
+        self.assertEqual(Post.objects.count(), 3)
+
+    def test_post_edit_is_limited(self):
+        url = reverse('posts:post_edit', args=[self.post.pk])
+        self.client.post(url, {'text': 'Правка'})
+
+        response = self.client.post(url, {'text': 'Ещё правка'})
+
+        self.assertEqual(response.status_code, 429)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.text, 'Правка')
+
+    def test_comment_limited_per_ip(self):
+        """Лимит по IP действует на всех пользователей с этого адреса."""
+        url = reverse('posts:add_comment', args=[self.post.pk])
+        self.client.post(url, {'text': 'Первый'})
+        self.client.force_login(User.objects.create_user(username='other'))
+
+        response = self.client.post(url, {'text': 'Второй'})
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(Comment.objects.count(), 1)
+
+    def test_get_is_not_limited(self):
+        url = reverse('posts:post_create')
+        for _ in range(3):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+
+
+class WriteGateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='writer')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    @override_settings(WRITE_CONCURRENCY=1, WRITE_QUEUE_TIMEOUT=0.01)
+    def test_busy_writes_get_503(self):
+        """Пока все слоты записи заняты, запись получает 503."""
+        slots = write_slots(1)
+        slots.acquire()
+        try:
+            response = self.client.post(
+                reverse('posts:post_create'), {'text': 'Пост'}
+            )
+        finally:
+            slots.release()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertFalse(Post.objects.exists())
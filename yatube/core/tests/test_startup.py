@@ -0,0 +1,31 @@
+from django.test import SimpleTestCase
+
+from core.startup import TARGETS, measure, parse_importtime
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     PIL._version
+import time:      2400 |       2520 |   PIL.Image
+import time:      1300 |       3820 | posts.forms
+"""
+
+
+class StartupBudgetTests(SimpleTestCase):
+    def test_parse_importtime_builds_tree(self):
+        entries = parse_importtime(IMPORTTIME_OUTPUT)
+
+        self.assertEqual(
+            [(entry.name, entry.depth) for entry in entries],
+            [('posts.forms', 0), ('PIL.Image', 1), ('PIL._version', 2)],
+        )
+        self.assertEqual(entries[0].cumulative_us, 3820)
+        self.assertEqual(entries[1].self_us, 2400)
+
+    def test_deferred_modules_not_imported_at_startup(self):
+        """
+        Время старта здесь не проверяется: на общей машине CI оно
+        нестабильно, его проверяет ``manage.py startup_report --check``.
+        """
+        for target in TARGETS:
+            with self.subTest(target=target):
+                self.assertEqual(measure(target).deferred_imported(), set())
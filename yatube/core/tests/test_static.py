@@ -0,0 +1,71 @@
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+STATIC_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    STATIC_ROOT=STATIC_ROOT,
+    STATICFILES_STORAGE='core.storage.CompressedManifestStaticFilesStorage',
+)
+class StaticPipelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        call_command('collectstatic', interactive=False, stdout=io.StringIO())
+        with open(os.path.join(STATIC_ROOT, 'staticfiles.json')) as manifest:
+            cls.css = json.load(manifest)['paths']['css/bootstrap.min.css']
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(STATIC_ROOT, ignore_errors=True)
+
+    def test_collectstatic_writes_hashed_and_compressed_files(self):
+        """collectstatic кладёт файл с хешем в имени и его сжатую копию."""
+        self.assertRegex(self.css, r'^css/bootstrap\.min\.[0-9a-f]{12}\.css$')
+        path = os.path.join(STATIC_ROOT, self.css)
+        with open(path, 'rb') as original, gzip.open(path + '.gz') as packed:
+            self.assertEqual(original.read(), packed.read())
+
+    def test_hashed_file_is_served_compressed_and_immutable(self):
+        """Файл с хешем отдаётся сжатым и с вечным кешированием."""
+        response = self.client.get(
+            f'/static/{self.css}', HTTP_ACCEPT_ENCODING='gzip, deflate'
+        )
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        response.close()
+
+    def test_refused_encoding_is_not_served(self):
+        """Кодировка с q=0 в Accept-Encoding не выбирается."""
+        response = self.client.get(
+            f'/static/{self.css}', HTTP_ACCEPT_ENCODING='gzip;q=0, identity'
+        )
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        response.close()
+
+    def test_plain_file_without_accept_encoding(self):
+        """Без Accept-Encoding отдаётся несжатый файл без immutable."""
+        response = self.client.get('/static/css/bootstrap.min.css')
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertNotIn('immutable', response['Cache-Control'])
+        response.close()
+
+    def test_templates_use_hashed_names(self):
+        """Шаблоны ссылаются на статику с хешем в имени."""
+        response = self.client.get('/about/author/')
+
+        self.assertContains(response, f'/static/{self.css}')
@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import Task
+from core.tasks import claim, enqueue, execute, run_pending
+
+CALLS = []
+
+
+def record(*args, **kwargs):
+    CALLS.append((args, kwargs))
+
+
+def explode():
+    raise RuntimeError('boom')
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_enqueued_task_is_executed(self):
+        """Задача из очереди выполняется с переданными аргументами."""
+        task = enqueue('core.tests.test_tasks.record', 1, 'a', flag=True)
+
+        processed = run_pending()
+
+        self.assertEqual(CALLS, [((1, 'a'), {'flag': True})])
+        self.assertEqual(len(processed), 1)
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.DONE)
+        self.assertEqual(task.attempts, 1)
+        self.assertIsNotNone(task.duration)
+
+    def test_claimed_task_is_not_claimed_twice(self):
+        """Задачу, которую уже забрал воркер, нельзя забрать повторно."""
+        enqueue('core.tests.test_tasks.record')
+
+        self.assertIsNotNone(claim())
+        self.assertIsNone(claim())
+
+    def test_delayed_task_waits(self):
+        """Задача с run_at в будущем не выполняется раньше времени."""
+        enqueue(
+            'core.tests.test_tasks.record',
+            run_at=timezone.now() + timedelta(hours=1),
+        )
+
+        self.assertEqual(run_pending(), [])
+        self.assertEqual(CALLS, [])
+
+    @override_settings(TASK_MAX_ATTEMPTS=2)
+    def test_failed_task_is_retried_with_backoff(self):
+        """Упавшая задача откладывается, а после последней попытки — failed."""
+        enqueue('core.tests.test_tasks.explode')
+
+        task = execute(claim())
+        self.assertEqual(task.status, Task.PENDING)
+        self.assertGreater(task.run_at, timezone.now())
+        self.assertIn('boom', task.last_error)
+
+        Task.objects.filter(pk=task.pk).update(run_at=timezone.now())
+        task = execute(claim())
+        self.assertEqual(task.status, Task.FAILED)
+        self.assertEqual(task.attempts, 2)
+
+    @override_settings(TASK_VISIBILITY_TIMEOUT=60)
+    def test_abandoned_task_is_claimed_again(self):
+        """Задача упавшего воркера снова забирается после таймаута."""
+        enqueue('core.tests.test_tasks.record')
+        task = claim()
+        self.assertIsNone(claim())
+
+        Task.objects.filter(pk=task.pk).update(
+            started_at=timezone.now() - timedelta(minutes=2)
+        )
+        reclaimed = claim()
+
+        self.assertEqual(reclaimed.pk, task.pk)
+        self.assertEqual(reclaimed.attempts, 2)
+        self.assertIsNone(claim())
+
+    @override_settings(TASK_VISIBILITY_TIMEOUT=60)
+    def test_abandoned_task_without_attempts_fails(self):
+        """Брошенная задача без оставшихся попыток помечается failed."""
+        task = enqueue('core.tests.test_tasks.record')
+        Task.objects.filter(pk=task.pk).update(
+            status=Task.RUNNING,
+            attempts=task.max_attempts,
+            started_at=timezone.now() - timedelta(minutes=2),
+        )
+
+        self.assertIsNone(claim())
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.FAILED)
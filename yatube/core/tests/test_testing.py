@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+
+from core.testing import SnapshotTestCase, budget_errors
+from posts.models import Group, Post
+
+User = get_user_model()
+
+SEED_CALLS = []
+
+
+class SnapshotTests(SnapshotTestCase):
+    @classmethod
+    def seed(cls):
+        SEED_CALLS.append(cls)
+        author = User.objects.create_user(username='author', password='pw')
+        group = Group.objects.create(title='Группа', slug='group')
+        Post.objects.create(text='Пост', author=author, group=group)
+        return {'author': author, 'group': group}
+
+    def test_rows_restored_from_snapshot(self):
+        post = Post.objects.select_related('author', 'group').get()
+
+        self.assertEqual(post.author, self.author)
+        self.assertEqual(post.group, self.group)
+        self.assertTrue(self.client.login(username='author', password='pw'))
+
+    def test_new_rows_after_restore(self):
+        """После восстановления новые строки получают свободные pk."""
+        post = Post.objects.create(text='Новый', author=self.author)
+
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertNotEqual(post.pk, Post.objects.get(text='Пост').pk)
+
+    def test_seed_runs_once_per_process(self):
+        self.assertEqual(len(SEED_CALLS), 1)
+
+
+class SharedSnapshotTests(SnapshotTests):
+    """Наследник с тем же seed() получает данные из снимка."""
+
+
+class QueryBudgetTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'budget.json')
+        with open(self.path, 'w', encoding='utf-8') as stream:
+            json.dump(
+                {'page': {'queries': 1, 'ms': 100, 'sql': ['SELECT a']}},
+                stream,
+            )
+
+    def test_extra_queries_reported_with_diff(self):
+        with override_settings(QUERY_BUDGET_FILE=self.path):
+            errors = budget_errors('page', ['SELECT a', 'SELECT b'], 10)
+
+        self.assertEqual(len(errors), 1)
+        self.assertIn('2 SQL-запросов при бюджете 1', errors[0])
+        self.assertIn('+SELECT b', errors[0])
+
+    def test_slow_response_and_missing_budget(self):
+        with override_settings(QUERY_BUDGET_FILE=self.path):
+            self.assertIn('мс', budget_errors('page', ['SELECT a'], 500)[0])
+            self.assertIn('нет бюджета', budget_errors('other', [], 1)[0])
+
+    def test_update_mode_rewrites_budget(self):
+        with override_settings(
+            QUERY_BUDGET_FILE=self.path, QUERY_BUDGET_UPDATE=True
+        ):
+            self.assertEqual(budget_errors('page', ['SELECT b'] * 3, 1), [])
+
+        with open(self.path, encoding='utf-8') as stream:
+            budget = json.load(stream)['page']
+        self.assertEqual(budget['queries'], 3)
+        self.assertEqual(budget['ms'], 100)
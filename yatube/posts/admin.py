@@ -1,8 +1,33 @@
+from core.paginator import EstimatedCountPaginator
 from django.contrib import admin
+from django.http import StreamingHttpResponse
 
+from .export import CONTENT_TYPES, KINDS_BY_MODEL, iter_export
 from .models import Comment, Follow, Group, Post
 
 
+def export_action(export_format):
+    """Действие админки: потоковая выгрузка выбранных записей."""
+
+    def export(modeladmin, request, queryset):
+        kind = KINDS_BY_MODEL[queryset.model]
+        response = StreamingHttpResponse(
+            iter_export(kind, queryset.order_by('pk'), export_format),
+            content_type=CONTENT_TYPES[export_format],
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{kind}.{export_format}"'
+        )
+        return response
+
+    export.__name__ = f'export_as_{export_format}'
+    export.short_description = f'Выгрузить в {export_format.upper()}'
+    return export
+
+
+EXPORT_ACTIONS = (export_action('ndjson'), export_action('csv'))
+
+
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
     list_display = (
@@ -13,9 +38,14 @@ class PostAdmin(admin.ModelAdmin):
         'group',
         'image',
     )
-    list_editable = ('group', 'image')
+    list_select_related = ('author', 'group')
+    raw_id_fields = ('author', 'group')
     search_fields = ('text',)
     list_filter = ('pub_date',)
+    date_hierarchy = 'pub_date'
+    paginator = EstimatedCountPaginator
+    actions = EXPORT_ACTIONS
+    show_full_result_count = False
     empty_value_display = '-пусто-'
 
 
@@ -34,11 +64,20 @@ class GroupAdmin(admin.ModelAdmin):
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('post', 'text', 'author')
-    list_editable = ('text',)
+    list_select_related = ('post', 'author')
+    raw_id_fields = ('post', 'author')
+    paginator = EstimatedCountPaginator
+    actions = EXPORT_ACTIONS
+    show_full_result_count = False
     empty_value_display = '-пусто-'
 
 
 @admin.register(Follow)
 class FollowAdmin(admin.ModelAdmin):
     list_display = ('user', 'author')
+    list_select_related = ('user', 'author')
+    raw_id_fields = ('user', 'author')
+    paginator = EstimatedCountPaginator
+    actions = EXPORT_ACTIONS
+    show_full_result_count = False
     empty_value_display = '-пусто-'
@@ -0,0 +1,135 @@
+"""
+Версии кешей лент. У каждой ленты своя область: 'all' (все посты),
+'group:<slug>', 'author:<username>'. Номер версии входит в ключи
+кеша и ETag, поэтому новый пост инвалидирует закешированные ленты
+одним cache.incr, без поиска и удаления ключей.
+
+Новая версия начинается со времени в наносекундах, а не с 1: если ключ
+версии вытеснен из кеша, новая версия не совпадёт ни с одной прежней,
+и старые страницы и ETag из кеша не вернутся.
+
+Группы по слагу хранятся в памяти процесса. Изменение группы в любом
+процессе поднимает версию области 'groups', и остальные процессы
+перечитывают группу при следующем обращении.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import get_object_or_404
+
+from .models import Group
+
+VERSION_KEY = 'feed_version:{}'
+GROUPS_SCOPE = 'groups'
+# slug -> (версия области 'groups', срок годности, Group)
+group_entries = {}
+
+
+def group_scope(slug):
+    return f'group:{slug}'
+
+
+def author_scope(username):
+    return f'author:{username}'
+
+
+def new_version():
+    return time.time_ns()
+
+
+def get_version(scope, create=True, initial=None):
+    """
+    Текущая версия области. Если версии нет, она создаётся (со значением
+    ``initial``, если оно задано), а с ``create=False`` возвращается None:
+    так вызывающий может сначала убедиться, что группа или автор
+    существуют, и не заводить ключи для несуществующих.
+    """
+    key = VERSION_KEY.format(scope)
+    version = cache.get(key)
+    if version is None and create:
+        version = initial or new_version()
+        cache.add(key, version, None)
+        version = cache.get(key, version)
+    return version
+
+
+def bump_version(scope):
+    key = VERSION_KEY.format(scope)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, new_version(), None)
+
+
+def post_scopes(post):
+    """Области лент, в которых виден пост."""
+    scopes = ['all', author_scope(post.author.username)]
+    if post.group_id:
+        scopes.append(group_scope(post.group.slug))
+    return scopes
+
+
+def posts_changed(posts):
+    """Инвалидирует ленты, в которых видны посты (по одному разу)."""
+    scopes = set()
+    for post in posts:
+        scopes.update(post_scopes(post))
+    for scope in scopes:
+        bump_version(scope)
+
+
+def cached_group(slug):
+    """
+    Группа по слагу (или 404) и версия её ленты. Обе версии читаются
+    одним get_many; база нужна, только если группы нет в памяти процесса,
+    она изменилась или запись устарела.
+    """
+    groups_key = VERSION_KEY.format(GROUPS_SCOPE)
+    feed_key = VERSION_KEY.format(group_scope(slug))
+    versions = cache.get_many([groups_key, feed_key])
+    if groups_key not in versions:
+        # Версия пропала из кеша (очистка, вытеснение), и сверять с ней
+        # записи в памяти нельзя
+        group_entries.clear()
+        versions[groups_key] = get_version(GROUPS_SCOPE)
+    entry = group_entries.get(slug)
+    now = time.monotonic()
+    if entry is None or entry[0] != versions[groups_key] or entry[1] < now:
+        group = get_object_or_404(Group, slug=slug)
+        entry = (
+            versions[groups_key],
+            now + settings.GROUP_CACHE_TIMEOUT,
+            group,
+        )
+        group_entries[slug] = entry
+    if feed_key not in versions:
+        # Только для существующей группы: несуществующие слаги не
+        # заводят ключей в кеше
+        versions[feed_key] = get_version(group_scope(slug))
+    return entry[2], versions[feed_key]
+
+
+def groups_changed(slugs):
+    """Сбрасывает группы в памяти всех процессов и их ленты."""
+    group_entries.clear()
+    bump_version(GROUPS_SCOPE)
+    for slug in slugs:
+        bump_version(group_scope(slug))
+
+
+def author_changed(author, usernames):
+    """
+    Имя автора показывается в лентах его постов: устаревают общая лента,
+    ленты автора под прежним и новым именем и ленты его групп.
+    """
+    slugs = (
+        Group.objects.filter(posts__author=author)
+        .values_list('slug', flat=True)
+        .distinct()
+    )
+    scopes = {'all'}
+    scopes.update(author_scope(username) for username in usernames)
+    scopes.update(group_scope(slug) for slug in slugs)
+    for scope in scopes:
+        bump_version(scope)
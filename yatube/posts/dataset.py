@@ -0,0 +1,308 @@
+"""
+Синтетические данные в объёмах продакшена для нагрузочных проверок.
+
+Распределения похожи на живой сайт: число постов у автора и подписчиков
+у пользователя подчиняется закону Ципфа (немногие авторы пишут и читаются
+больше всех), комментарии приходят всплесками вскоре после публикации,
+часть постов с картинками из небольшого набора. Строки собираются
+кортежами с заранее назначенными id и вставляются ``executemany`` пачками
+в отдельных транзакциях, мимо моделей и сигналов: построение экземпляров
+моделей и компиляция INSERT в ORM в несколько раз дольше самой вставки.
+После генерации счётчики id сдвигаются, а кеш лент сбрасывается.
+"""
+import io
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .cache import bump_version
+from .importer import batches
+from .models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+WORDS = (
+    'день вечер город дорога книга письмо море лето зима дом окно сад '
+    'друг работа музыка кино поезд утро ночь снег дождь солнце река лес '
+    'сегодня вчера снова очень просто долго быстро тихо рядом далеко '
+    'читал видел думал писал ждал нашёл увидел вспомнил любил хотел'
+).split()
+# Сколько разных текстов сгенерировать для постов и комментариев
+TEXTS = 5000
+# Показатели степени закона Ципфа: авторы постов, популярность при
+# подписке, активность подписчиков и комментаторов
+POSTS_EXPONENT = 1.1
+FOLLOWED_EXPONENT = 1.2
+FOLLOWER_EXPONENT = 0.6
+COMMENTER_EXPONENT = 1.0
+# Доля постов в группах
+GROUP_SHARE = 0.6
+# Размер всплеска комментариев — распределение Парето с этим параметром
+BURST_ALPHA = 1.5
+# Комментарии всплеска приходят в течение стольких часов после поста
+BURST_HOURS = 48
+
+
+def zipf_rank(rnd, size, exponent):
+    """
+    Номер от 0 до size - 1, номер k выпадает с вероятностью ~1 / (k+1)^s.
+    Обратная функция непрерывного приближения: без таблицы весов,
+    одинаково быстро для любого size.
+    """
+    u = rnd.random()
+    if exponent == 1:
+        value = (size + 1) ** u
+    else:
+        power = 1 - exponent
+        value = (((size + 1) ** power - 1) * u + 1) ** (1 / power)
+    return min(int(value) - 1, size - 1)
+
+
+# Таблицы в порядке заполнения и поля в порядке значений кортежей
+TABLES = {
+    'users': (
+        User,
+        (
+            'id',
+            'username',
+            'email',
+            'password',
+            'first_name',
+            'last_name',
+            'is_superuser',
+            'is_staff',
+            'is_active',
+            'date_joined',
+        ),
+    ),
+    'groups': (Group, ('id', 'title', 'slug', 'description')),
+    'posts': (
+        Post,
+        ('id', 'text', 'pub_date', 'author', 'group', 'image'),
+    ),
+    'comments': (
+        Comment,
+        ('id', 'post', 'author', 'text', 'created'),
+    ),
+    'follows': (Follow, ('id', 'user', 'author')),
+}
+
+
+def insert_sql(model, fields, ignore_conflicts=False):
+    """
+    INSERT строки с полями ``fields``; с ``ignore_conflicts`` строки,
+    которые нарушают уникальность, пропускаются.
+    """
+    ops = connection.ops
+    columns = ', '.join(
+        ops.quote_name(model._meta.get_field(name).column) for name in fields
+    )
+    placeholders = ', '.join(['%s'] * len(fields))
+    return (
+        f'{ops.insert_statement(ignore_conflicts=ignore_conflicts)} '
+        f'{ops.quote_name(model._meta.db_table)} ({columns}) '
+        f'VALUES ({placeholders}) '
+        f'{ops.ignore_conflicts_suffix_sql(ignore_conflicts=ignore_conflicts)}'
+    )
+
+
+def next_pk(model):
+    return (model.objects.aggregate(top=Max('pk'))['top'] or 0) + 1
+
+
+class DatasetGenerator:
+    def __init__(
+        self,
+        users,
+        groups,
+        posts,
+        comments,
+        follows,
+        image_share=0.1,
+        images=20,
+        days=365,
+        batch_size=10000,
+        prefix='gen',
+        seed=None,
+    ):
+        self.counts = {
+            'users': users,
+            'groups': groups,
+            'posts': posts,
+            'comments': comments,
+            'follows': follows,
+        }
+        self.image_share = image_share
+        self.images = images
+        self.batch_size = batch_size
+        self.prefix = prefix
+        self.random = random.Random(seed)
+        self.end = timezone.now()
+        self.start = self.end - timedelta(days=days)
+        self.first = {}
+        self.text_pool = []
+
+    def insert(self, model, fields, rows):
+        """
+        Вставляет кортежи ``rows`` пачками; возвращает число вставленных
+        строк. Повторы пропускаются только у подписок: случайные пары
+        подписчик — автор могут совпасть. В остальных таблицах конфликт —
+        ошибка (например, имя пользователя уже занято), а не тихий пропуск.
+        """
+        sql = insert_sql(model, fields, ignore_conflicts=model is Follow)
+        total = 0
+        for batch in batches(rows, self.batch_size):
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(sql, batch)
+                total += cursor.rowcount
+        return total
+
+    def text(self):
+        if not self.text_pool:
+            self.text_pool = [
+                ' '.join(
+                    self.random.choices(WORDS, k=self.random.randint(5, 60))
+                ).capitalize()
+                for _ in range(TEXTS)
+            ]
+        return self.random.choice(self.text_pool)
+
+    def moment(self, value):
+        return connection.ops.adapt_datetimefield_value(value)
+
+    def pub_date(self, index):
+        """
+        Даты постов равномерно растут вместе с id, как на живом сайте;
+        дата считается по номеру, так что комментарии её не запрашивают.
+        """
+        span = (self.end - self.start).total_seconds()
+        offset = (index + 0.5) * span / self.counts['posts']
+        return self.start + timedelta(seconds=offset)
+
+    def user_id(self, exponent):
+        rank = zipf_rank(self.random, self.counts['users'], exponent)
+        return self.first['users'] + rank
+
+    def image_pool(self):
+        """Несколько разных картинок; посты ссылаются на одни и те же файлы."""
+        if not self.image_share or not self.images:
+            return []
+        # Pillow нужен только здесь
+        from PIL import Image
+
+        storage = Post._meta.get_field('image').storage
+        names = []
+        for _ in range(self.images):
+            color = tuple(self.random.randrange(256) for _ in range(3))
+            buffer = io.BytesIO()
+            Image.new('RGB', (960, 540), color).save(buffer, format='JPEG')
+            content = ContentFile(buffer.getvalue())
+            names.append(storage.save('posts/generated.jpg', content))
+        return names
+
+    def users(self):
+        password = make_password(None)
+        joined = self.moment(self.start)
+        for number in range(self.counts['users']):
+            pk = self.first['users'] + number
+            name = f'{self.prefix}{pk}'
+            yield (
+                pk,
+                name,
+                f'{name}@example.com',
+                password,
+                '',
+                '',
+                False,
+                False,
+                True,
+                joined,
+            )
+
+    def groups(self):
+        for number in range(self.counts['groups']):
+            pk = self.first['groups'] + number
+            yield (
+                pk,
+                f'Группа {pk}',
+                f'{self.prefix}-group-{pk}',
+                self.text(),
+            )
+
+    def posts(self):
+        images = self.image_pool()
+        for number in range(self.counts['posts']):
+            group_id = None
+            if self.counts['groups'] and self.random.random() < GROUP_SHARE:
+                group_id = self.first['groups'] + zipf_rank(
+                    self.random, self.counts['groups'], POSTS_EXPONENT
+                )
+            image = None
+            if images and self.random.random() < self.image_share:
+                image = self.random.choice(images)
+            yield (
+                self.first['posts'] + number,
+                self.text(),
+                self.moment(self.pub_date(number)),
+                self.user_id(POSTS_EXPONENT),
+                group_id,
+                image,
+            )
+
+    def comments(self):
+        """Всплески комментариев к случайным постам вскоре после публикации."""
+        created = 0
+        while created < self.counts['comments']:
+            number = self.random.randrange(self.counts['posts'])
+            published = self.pub_date(number)
+            burst = min(
+                int(self.random.paretovariate(BURST_ALPHA)),
+                self.counts['comments'] - created,
+            )
+            for _ in range(burst):
+                delay = self.random.expovariate(3 / BURST_HOURS)
+                moment = min(published + timedelta(hours=delay), self.end)
+                yield (
+                    self.first['comments'] + created,
+                    self.first['posts'] + number,
+                    self.user_id(COMMENTER_EXPONENT),
+                    self.text(),
+                    self.moment(moment),
+                )
+                created += 1
+
+    def follows(self):
+        """Граф подписок со степенным распределением числа подписчиков."""
+        for number in range(self.counts['follows']):
+            user_id = self.user_id(FOLLOWER_EXPONENT)
+            author_id = self.user_id(FOLLOWED_EXPONENT)
+            if user_id != author_id:
+                yield (self.first['follows'] + number, user_id, author_id)
+
+    def run(self, report=None):
+        """Создаёт все данные; ``report(kind, count)`` вызывается по ходу."""
+        if not self.counts['users']:
+            raise ValueError('Нужен хотя бы один пользователь.')
+        if self.counts['comments'] and not self.counts['posts']:
+            raise ValueError('Комментариям нужны посты.')
+        for kind, (model, fields) in TABLES.items():
+            self.first[kind] = next_pk(model)
+        created = {}
+        for kind, (model, fields) in TABLES.items():
+            created[kind] = self.insert(model, fields, getattr(self, kind)())
+            if report:
+                report(kind, created[kind])
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(), [model for model, fields in TABLES.values()]
+            ):
+                cursor.execute(sql)
+        bump_version('all')
+        return created
@@ -0,0 +1,136 @@
+"""
+Потоковая выгрузка постов, комментариев и подписок в NDJSON или CSV.
+
+Строки читаются из базы кусками через ``.iterator(chunk_size=...)``
+и сразу отдаются потребителю, поэтому расход памяти не зависит
+от размера выгрузки.
+"""
+import csv
+import datetime
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Comment, Follow, Post
+
+# Для каждого вида выгрузки: модель и пары (имя колонки, путь к полю).
+EXPORTS = {
+    'posts': (
+        Post,
+        (
+            ('id', 'pk'),
+            ('text', 'text'),
+            ('pub_date', 'pub_date'),
+            ('author', 'author__username'),
+            ('group', 'group__slug'),
+            ('image', 'image'),
+        ),
+    ),
+    'comments': (
+        Comment,
+        (
+            ('id', 'pk'),
+            ('post', 'post_id'),
+            ('author', 'author__username'),
+            ('text', 'text'),
+            ('created', 'created'),
+        ),
+    ),
+    'follows': (
+        Follow,
+        (
+            ('id', 'pk'),
+            ('user', 'user__username'),
+            ('author', 'author__username'),
+        ),
+    ),
+}
+
+KINDS_BY_MODEL = {model: kind for kind, (model, _) in EXPORTS.items()}
+
+# Поля для фильтров по дате и по группе.
+FILTER_FIELDS = {
+    'posts': ('pub_date', 'group__slug'),
+    'comments': ('created', 'post__group__slug'),
+    'follows': (None, None),
+}
+
+FORMATS = ('ndjson', 'csv')
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def guess_format(path):
+    """Формат по расширению файла, с учётом сжатия: data.csv.gz — csv."""
+    if path and path.endswith('.gz'):
+        path = path[:-3]
+    return 'csv' if path and path.endswith('.csv') else 'ndjson'
+
+
+def get_queryset(kind, group=None, author=None, since=None, until=None):
+    """
+    Набор записей для выгрузки ``kind`` с необязательными фильтрами
+    по слагу группы, имени автора и интервалу дат.
+    """
+    model, _ = EXPORTS[kind]
+    date_field, group_field = FILTER_FIELDS[kind]
+    queryset = model.objects.order_by('pk')
+    if group_field and group:
+        queryset = queryset.filter(**{group_field: group})
+    if author:
+        queryset = queryset.filter(author__username=author)
+    if date_field and since:
+        queryset = queryset.filter(**{f'{date_field}__gte': since})
+    if date_field and until:
+        queryset = queryset.filter(**{f'{date_field}__lt': until})
+    return queryset
+
+
+def iter_rows(kind, queryset, chunk_size=None):
+    """Кортежи значений колонок выгрузки ``kind`` без создания моделей."""
+    _, columns = EXPORTS[kind]
+    paths = [path for _, path in columns]
+    return queryset.values_list(*paths).iterator(
+        chunk_size=chunk_size or settings.EXPORT_CHUNK_SIZE
+    )
+
+
+class ExportJSONEncoder(DjangoJSONEncoder):
+    """Даты с микросекундами: DjangoJSONEncoder обрезает их до миллисекунд."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class Echo:
+    """Псевдо-файл для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def iter_export(kind, queryset, export_format='ndjson', chunk_size=None):
+    """Строки выгрузки в выбранном формате, по одной на запись."""
+    names = [name for name, _ in EXPORTS[kind][1]]
+    rows = iter_rows(kind, queryset, chunk_size)
+    if export_format == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow(names)
+        for row in rows:
+            yield writer.writerow(row)
+    else:
+        for row in rows:
+            yield (
+                json.dumps(
+                    dict(zip(names, row)),
+                    cls=ExportJSONEncoder,
+                    ensure_ascii=False,
+                )
+                + '\n'
+            )
@@ -0,0 +1,148 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+
+from .cache import author_scope, get_version, group_scope, new_version
+from .models import Group, Post, User
+
+
+class LatestPostsFeed(Feed):
+    title = 'Yatube: последние записи'
+    description = 'Последние записи всех авторов Yatube.'
+
+    def link(self):
+        return reverse('posts:index')
+
+    def items(self):
+        return Post.objects.select_related('author', 'group')[
+            :settings.FEED_ITEMS
+        ]
+
+    def item_title(self, item):
+        return item.text[:50]
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', args=[item.pk])
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class GroupPostsFeed(LatestPostsFeed):
+    def get_object(self, request, slug):
+        return get_object_or_404(Group, slug=slug)
+
+    def title(self, group):
+        return f'Yatube: {group.title}'
+
+    def description(self, group):
+        return group.description
+
+    def link(self, group):
+        return reverse('posts:group_list', args=[group.slug])
+
+    def items(self, group):
+        return group.posts.select_related('author')[:settings.FEED_ITEMS]
+
+
+class GroupPostsAtomFeed(GroupPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, group):
+        return group.description
+
+
+class AuthorPostsFeed(LatestPostsFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, author):
+        return f'Yatube: записи {author.get_full_name() or author.username}'
+
+    def description(self, author):
+        return f'Последние записи пользователя {author.username}.'
+
+    def link(self, author):
+        return reverse('posts:profile', args=[author.username])
+
+    def items(self, author):
+        return author.posts.select_related('group')[:settings.FEED_ITEMS]
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = AuthorPostsFeed.description
+
+
+def cached_feed(feed, scope):
+    """
+    Отдаёт ленту из кеша. Ключ кеша и ETag содержат версию области
+    (posts.cache), которую сбрасывает новый пост. Читатель, который опрашивает
+    неизменную ленту, получает 304 или ответ из кеша без запросов к базе.
+    ``scope`` — функция от аргументов URL, возвращающая область ленты.
+    Версия области заводится только после того, как лента отрисована,
+    то есть группа или автор найдены: запросы к несуществующим лентам
+    отвечают 404 и не оставляют ключей в кеше.
+    """
+
+    def view(request, **kwargs):
+        version = get_version(scope(**kwargs), create=False)
+        rendered = None
+        if version is None:
+            initial = new_version()
+            rendered = feed(request, **kwargs)
+            version = get_version(scope(**kwargs), initial=initial)
+            if version != initial:
+                # Пока лента рисовалась, версию создали или подняли
+                rendered = None
+        digest = hashlib.md5(
+            f'{request.get_full_path()}:{version}'.encode()
+        ).hexdigest()
+        etag = f'"{digest}"'
+        if rendered is None and etag in request.META.get(
+            'HTTP_IF_NONE_MATCH', ''
+        ):
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            return response
+
+        key = f'feed:{digest}'
+        cached = cache.get(key) if rendered is None else None
+        if cached is None:
+            rendered = rendered or feed(request, **kwargs)
+            cached = (rendered.content, rendered['Content-Type'])
+            cache.set(key, cached, settings.FEED_CACHE_TIMEOUT)
+        response = HttpResponse(cached[0], content_type=cached[1])
+        response['ETag'] = etag
+        return response
+
+    return view
+
+
+def all_scope():
+    return 'all'
+
+
+latest_rss = cached_feed(LatestPostsFeed(), all_scope)
+latest_atom = cached_feed(LatestPostsAtomFeed(), all_scope)
+group_rss = cached_feed(GroupPostsFeed(), group_scope)
+group_atom = cached_feed(GroupPostsAtomFeed(), group_scope)
+author_rss = cached_feed(AuthorPostsFeed(), author_scope)
+author_atom = cached_feed(AuthorPostsAtomFeed(), author_scope)
@@ -1,13 +1,91 @@
+import io
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import InMemoryUploadedFile, UploadedFile
 from django.forms import ModelForm
+from django.template.defaultfilters import filesizeformat
 
 from .models import Comment, Post
 
 
+def check_image_limits(upload):
+    """
+    Проверяет размер файла и число пикселей загруженной картинки.
+    ImageField к этому моменту только прочитал заголовок файла Pillow,
+    поэтому слишком большая картинка отклоняется до полного декодирования.
+    """
+    if upload.size > settings.POST_IMAGE_MAX_BYTES:
+        raise ValidationError(
+            'Файл слишком большой: %(size)s, допустимо не больше %(max)s.',
+            code='file_too_large',
+            params={
+                'size': filesizeformat(upload.size),
+                'max': filesizeformat(settings.POST_IMAGE_MAX_BYTES),
+            },
+        )
+    width, height = upload.image.size
+    if width * height > settings.POST_IMAGE_MAX_PIXELS:
+        raise ValidationError(
+            'Слишком большое разрешение: %(width)s×%(height)s.',
+            code='too_many_pixels',
+            params={'width': width, 'height': height},
+        )
+
+
+def downscale(upload, max_side):
+    """
+    Уменьшает загруженную картинку до max_side по большей стороне, чтобы
+    превью и прочая обработка всегда начинались с ограниченного размера.
+    Анимированные картинки не трогаем, чтобы не потерять анимацию.
+    Поворот из EXIF применяется к пикселям, цветовой профиль ICC
+    переносится в новый файл.
+    """
+    # Pillow импортируется только при обработке картинки, а не на старте
+    from PIL import Image, ImageOps
+
+    upload.seek(0)
+    with Image.open(upload) as image:
+        if (
+            max(image.size) <= max_side
+            or getattr(image, 'is_animated', False)
+        ):
+            upload.seek(0)
+            return upload
+        image_format = image.format
+        options = {'quality': 90}
+        if image.info.get('icc_profile'):
+            options['icc_profile'] = image.info['icc_profile']
+        # Для JPEG декодирует сразу в уменьшенном масштабе.
+        image.draft(image.mode, (max_side, max_side))
+        # Фото с телефона хранятся повёрнутыми с тегом Orientation, а
+        # новый файл сохраняется без EXIF
+        resized = ImageOps.exif_transpose(image)
+        resized.thumbnail((max_side, max_side), Image.LANCZOS)
+        buffer = io.BytesIO()
+        resized.save(buffer, format=image_format, **options)
+    return InMemoryUploadedFile(
+        buffer,
+        'image',
+        upload.name,
+        upload.content_type,
+        buffer.tell(),
+        None,
+    )
+
+
 class PostForm(ModelForm):
     class Meta:
         model = Post
         fields = ('text', 'group', 'image')
 
+    def clean_image(self):
+        image = self.cleaned_data.get('image')
+        if isinstance(image, UploadedFile):
+            check_image_limits(image)
+            return downscale(image, settings.POST_IMAGE_MAX_SIDE)
+        return image
+
 
 class CommentForm(ModelForm):
     class Meta:
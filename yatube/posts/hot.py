@@ -0,0 +1,208 @@
+"""
+Рейтинг «горячих» постов и популярных групп.
+
+Очки начисляют события: комментарий к посту и новый пост. Вклад события
+затухает вдвое за HOT_HALF_LIFE секунд. Чтобы не пересчитывать затухание,
+вклад сразу умножается на 2 ** ((t - начало эпохи) / HOT_HALF_LIFE): в
+любой момент порядок по таким суммам совпадает с порядком по затухшим
+очкам, и очки меняются только от новых событий.
+
+Время делится на эпохи по ERA_HALF_LIVES периодов полураспада, чтобы
+множитель не переполнял float. Очки хранятся в таблице HotScore вместе
+с эпохой, в которой начислены. Событие прибавляет очки одним атомарным
+UPDATE: очки прошлой эпохи в нём же переводятся в текущую, так что
+параллельные комментарии из разных процессов не теряются, а общего
+состояния в памяти процесса или в кеше нет. Более старые очки
+не учитываются и удаляются.
+
+Готовый список id кешируется на HOT_TOP_CACHE_TIMEOUT секунд, таблица
+комментариев при показе рейтинга не читается.
+"""
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, FloatField, Value, When
+
+from .models import Comment, HotScore, Post
+
+POSTS = 'posts'
+GROUPS = 'groups'
+TOP_KEY = 'hot:top:{}'
+# Длина эпохи в периодах полураспада: множитель не больше 2 ** 64
+ERA_HALF_LIVES: int = 64
+# Во сколько раз очки прошлой эпохи меньше в масштабе текущей
+ERA_DECAY: float = 2.0 ** -ERA_HALF_LIVES
+
+
+def era_of(moment):
+    return int(moment // (ERA_HALF_LIVES * settings.HOT_HALF_LIFE))
+
+
+def boost(moment, era):
+    start = era * ERA_HALF_LIVES * settings.HOT_HALF_LIFE
+    return 2 ** ((moment - start) / settings.HOT_HALF_LIFE)
+
+
+def added_score(value, era):
+    """Очки строки после прибавки ``value`` в эпохе ``era``."""
+    return Case(
+        When(era=era, then=F('score') + value),
+        When(era=era - 1, then=F('score') * ERA_DECAY + value),
+        default=Value(value),
+        output_field=FloatField(),
+    )
+
+
+def add_one(kind, pk, value, era):
+    rows = HotScore.objects.filter(kind=kind, item_id=pk)
+    if rows.update(score=added_score(value, era), era=era):
+        return
+    try:
+        with transaction.atomic():
+            HotScore.objects.create(
+                kind=kind, item_id=pk, era=era, score=value
+            )
+    except IntegrityError:
+        # Строку только что создал параллельный запрос
+        rows.update(score=added_score(value, era), era=era)
+
+
+def add_scores(kind, increments, era):
+    """
+    Прибавляет очки ``increments`` — {id: очки эпохи era}. Новые строки
+    вставляются одним bulk_create, так что пакет новых постов стоит
+    постоянного числа запросов.
+    """
+    if len(increments) == 1:
+        add_one(kind, *next(iter(increments.items())), era)
+        return
+    existing = set(
+        HotScore.objects.filter(
+            kind=kind, item_id__in=increments
+        ).values_list('item_id', flat=True)
+    )
+    missing = [pk for pk in increments if pk not in existing]
+    if missing:
+        try:
+            with transaction.atomic():
+                HotScore.objects.bulk_create(
+                    HotScore(kind=kind, item_id=pk, era=era, score=value)
+                    for pk, value in increments.items()
+                    if pk in missing
+                )
+        except IntegrityError:
+            existing.update(missing)
+    for pk in existing:
+        add_one(kind, pk, increments[pk], era)
+
+
+def record(kind, events, now=None):
+    """Начисляет очки; ``events`` — пары (id, вес события)."""
+    now = time.time() if now is None else now
+    era = era_of(now)
+    factor = boost(now, era)
+    increments = defaultdict(float)
+    for pk, weight in events:
+        increments[pk] += weight * factor
+    if increments:
+        add_scores(kind, increments, era)
+
+
+def discard(kind, pk):
+    HotScore.objects.filter(kind=kind, item_id=pk).delete()
+    cache.delete(TOP_KEY.format(kind))
+
+
+def prune(kind, era):
+    """Удаляет очки, начисленные раньше прошлой эпохи."""
+    HotScore.objects.filter(kind=kind, era__lt=era - 1).delete()
+
+
+def ranked(kind, now=None):
+    """id с наибольшими очками по таблице, по убыванию."""
+    era = era_of(time.time() if now is None else now)
+    prune(kind, era)
+    return list(
+        HotScore.objects.filter(kind=kind, era__gte=era - 1)
+        .annotate(
+            current=Case(
+                When(era=era - 1, then=F('score') * ERA_DECAY),
+                default=F('score'),
+                output_field=FloatField(),
+            )
+        )
+        .order_by('-current')
+        .values_list('item_id', flat=True)[:settings.HOT_SIZE]
+    )
+
+
+def top(kind, limit=None, now=None):
+    """id с наибольшими очками, по убыванию."""
+    key = TOP_KEY.format(kind)
+    ids = cache.get(key)
+    if ids is None:
+        ids = ranked(kind, now)
+        cache.set(key, ids, settings.HOT_TOP_CACHE_TIMEOUT)
+    return ids[:limit or settings.HOT_SIZE]
+
+
+def posts_added(posts):
+    posts = list(posts)
+    weight = settings.HOT_POST_WEIGHT
+    record(POSTS, ((post.pk, weight) for post in posts if post.pk))
+    record(
+        GROUPS,
+        ((post.group_id, weight) for post in posts if post.group_id),
+    )
+
+
+def comments_added(post_groups):
+    """Комментарии по парам (id поста, id группы поста или None)."""
+    post_groups = list(post_groups)
+    weight = settings.HOT_COMMENT_WEIGHT
+    record(POSTS, ((post_id, weight) for post_id, _ in post_groups))
+    record(
+        GROUPS,
+        ((group_id, weight) for _, group_id in post_groups if group_id),
+    )
+
+
+def rebuild(since):
+    """
+    Пересчитывает рейтинги заново по постам и комментариям не старше
+    ``since``: после импорта или если таблица очков потеряна. Строки
+    читаются потоком, без GROUP BY.
+    """
+    era = era_of(time.time())
+    scores = {POSTS: defaultdict(float), GROUPS: defaultdict(float)}
+
+    def add(kind, pk, weight, moment):
+        scores[kind][pk] += weight * boost(moment.timestamp(), era)
+
+    posts = Post.objects.filter(pub_date__gte=since).order_by()
+    for pk, group_id, pub_date in posts.values_list(
+        'pk', 'group_id', 'pub_date'
+    ).iterator():
+        add(POSTS, pk, settings.HOT_POST_WEIGHT, pub_date)
+        if group_id:
+            add(GROUPS, group_id, settings.HOT_POST_WEIGHT, pub_date)
+    comments = Comment.objects.filter(created__gte=since).order_by()
+    for post_id, group_id, created in comments.values_list(
+        'post_id', 'post__group_id', 'created'
+    ).iterator():
+        add(POSTS, post_id, settings.HOT_COMMENT_WEIGHT, created)
+        if group_id:
+            add(GROUPS, group_id, settings.HOT_COMMENT_WEIGHT, created)
+
+    with transaction.atomic():
+        for kind, items in scores.items():
+            HotScore.objects.filter(kind=kind).delete()
+            HotScore.objects.bulk_create(
+                HotScore(kind=kind, item_id=pk, era=era, score=score)
+                for pk, score in items.items()
+            )
+    for kind in scores:
+        cache.delete(TOP_KEY.format(kind))
@@ -0,0 +1,66 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from sorl.thumbnail import delete
+from sorl.thumbnail.images import ImageFile
+
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет файлы картинок постов, на которые не ссылается ни один '
+        'пост, вместе с их превью.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=3600,
+            help='Не трогать файлы моложе стольких секунд: их могли '
+            'загрузить, но ещё не сохранить пост.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать, что будет удалено.',
+        )
+
+    def handle(self, *args, **options):
+        field = Post._meta.get_field('image')
+        storage = field.storage
+        root = storage.path(field.upload_to)
+        if not os.path.isdir(root):
+            return
+
+        referenced = set(
+            Post.objects.exclude(image='')
+            .exclude(image=None)
+            .values_list('image', flat=True)
+            .iterator()
+        )
+        deadline = time.time() - options['min_age']
+        removed = 0
+        for directory, _, files in os.walk(root):
+            for filename in files:
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, storage.location).replace(
+                    os.sep, '/'
+                )
+                if name in referenced or os.path.getmtime(path) > deadline:
+                    continue
+                # Список ссылок мог устареть за время обхода: файл могли
+                # загрузить заново (тогда дата обновилась) и сослаться на него
+                if (
+                    os.path.getmtime(path) > deadline
+                    or Post.objects.filter(image=name).exists()
+                ):
+                    continue
+                removed += 1
+                if options['dry_run']:
+                    self.stdout.write(name)
+                else:
+                    delete(ImageFile(name, storage))
+        self.stdout.write(f'Неиспользуемых файлов: {removed}')
@@ -0,0 +1,72 @@
+import gzip
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from posts.export import (
+    EXPORTS,
+    FORMATS,
+    get_queryset,
+    guess_format,
+    iter_export,
+)
+
+
+def parse_date(value):
+    parsed = parse_datetime(value) if value else None
+    if value and parsed is None:
+        raise CommandError(f'Неверный формат даты: {value}')
+    return parsed
+
+
+class Command(BaseCommand):
+    help = 'Потоковая выгрузка постов, комментариев или подписок.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORTS))
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='По умолчанию определяется по расширению --output, '
+            'иначе ndjson.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для записи; с расширением .gz будет сжат gzip. '
+            'По умолчанию — stdout.',
+        )
+        parser.add_argument('--group', help='Слаг группы.')
+        parser.add_argument('--author', help='Имя пользователя автора.')
+        parser.add_argument(
+            '--since', help='Не раньше даты (ISO 8601), включительно.'
+        )
+        parser.add_argument('--until', help='Раньше даты (ISO 8601).')
+        parser.add_argument('--chunk-size', type=int)
+
+    def handle(self, *args, **options):
+        kind = options['kind']
+        queryset = get_queryset(
+            kind,
+            group=options['group'],
+            author=options['author'],
+            since=parse_date(options['since']),
+            until=parse_date(options['until']),
+        )
+        output = options['output']
+        lines = iter_export(
+            kind,
+            queryset,
+            options['format'] or guess_format(output),
+            options['chunk_size'],
+        )
+
+        if not output:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        if output.endswith('.gz'):
+            stream = gzip.open(output, 'wt', encoding='utf-8', newline='')
+        else:
+            stream = open(output, 'w', encoding='utf-8', newline='')
+        with stream:
+            stream.writelines(lines)
@@ -0,0 +1,82 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.dataset import DatasetGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт синтетических пользователей, группы, посты, комментарии '
+        'и подписки в объёмах продакшена для нагрузочных проверок. '
+        'После генерации стоит запустить rebuild_hot.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--groups', type=int, default=100)
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--comments', type=int, default=300000)
+        parser.add_argument(
+            '--follows',
+            type=int,
+            default=200000,
+            help='Сколько подписок создать (повторы пропускаются).',
+        )
+        parser.add_argument(
+            '--image-share',
+            type=float,
+            default=0.1,
+            help='Доля постов с картинкой.',
+        )
+        parser.add_argument(
+            '--images',
+            type=int,
+            default=20,
+            help='Сколько разных картинок создать для постов.',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365,
+            help='За сколько последних дней распределить посты.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Сколько записей вставлять в одной транзакции.',
+        )
+        parser.add_argument(
+            '--prefix',
+            default='gen',
+            help='Префикс имён пользователей и слагов групп.',
+        )
+        parser.add_argument(
+            '--seed', type=int, help='Зерно генератора для повторяемости.'
+        )
+
+    def report(self, kind, count):
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(f'{kind}: {count} за {elapsed:.1f} с')
+
+    def handle(self, *args, **options):
+        generator = DatasetGenerator(
+            users=options['users'],
+            groups=options['groups'],
+            posts=options['posts'],
+            comments=options['comments'],
+            follows=options['follows'],
+            image_share=options['image_share'],
+            images=options['images'],
+            days=options['days'],
+            batch_size=options['batch_size'],
+            prefix=options['prefix'],
+            seed=options['seed'],
+        )
+        self.started = time.monotonic()
+        try:
+            created = generator.run(report=self.report)
+        except ValueError as error:
+            raise CommandError(error)
+        self.stdout.write(f'Всего записей: {sum(created.values())}')
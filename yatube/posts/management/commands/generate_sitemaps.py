@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from posts.sitemaps import generate_sitemaps
+
+
+class Command(BaseCommand):
+    help = (
+        'Обновляет файлы карты сайта в SITEMAP_ROOT. Перезаписываются '
+        'только изменившиеся файлы, запускать можно по расписанию.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Перестроить все файлы, не сверяясь с манифестом.',
+        )
+        parser.add_argument(
+            '--base-url', help='Адрес сайта, по умолчанию SITE_URL.'
+        )
+
+    def handle(self, *args, **options):
+        writer = generate_sitemaps(
+            full=options['full'], base_url=options['base_url']
+        )
+        self.stdout.write(
+            f'Файлов карты: {len(writer.files)}, '
+            f'перезаписано: {writer.written}'
+        )
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+
+from posts.export import EXPORTS, FORMATS
+from posts.importer import Importer, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Массовая загрузка постов, комментариев или подписок из архива '
+        'NDJSON/CSV, созданного export_data.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORTS))
+        parser.add_argument('path', help='Файл архива, можно .gz.')
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='По умолчанию определяется по расширению файла.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько записей вставлять в одной транзакции.',
+        )
+        parser.add_argument(
+            '--media-source',
+            help='Каталог, из которого копировать картинки постов.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Потоков для копирования картинок.',
+        )
+
+    def handle(self, *args, **options):
+        importer = Importer(
+            batch_size=options['batch_size'],
+            media_source=options['media_source'],
+            workers=options['workers'],
+        )
+        total = importer.run(
+            options['kind'], read_rows(options['path'], options['format'])
+        )
+        self.stdout.write(
+            f'Загружено записей: {total}, '
+            f'создано пользователей: {importer.created_users}, '
+            f'групп: {importer.created_groups}'
+        )
+        if importer.skipped:
+            shown = ', '.join(str(pk) for pk in importer.skipped[:20])
+            more = ', …' if len(importer.skipped) > 20 else ''
+            self.stdout.write(
+                f'Пропущено уже существующих: {len(importer.skipped)} '
+                f'(id: {shown}{more})'
+            )
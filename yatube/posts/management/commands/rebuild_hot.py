@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts import hot
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинг горячих постов и популярных групп по '
+        'недавним постам и комментариям, например после импорта.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--half-lives',
+            type=int,
+            default=10,
+            help='Глубина пересчёта в периодах полураспада HOT_HALF_LIFE: '
+            'более старые события почти ничего не весят.',
+        )
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(
+            seconds=settings.HOT_HALF_LIFE * options['half_lives']
+        )
+        hot.rebuild(since)
+        self.stdout.write(f'Рейтинг пересчитан с {since:%Y-%m-%d %H:%M}')
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_auto_20221110_2233'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='pub_date',
+            field=models.DateTimeField(
+                auto_now_add=True,
+                db_index=True,
+                help_text='Введите дату публикации поста',
+                verbose_name='Дата публикации',
+            ),
+        ),
+    ]
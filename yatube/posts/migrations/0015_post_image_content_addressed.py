@@ -0,0 +1,25 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:48
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0014_post_pub_date_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                storage=core.storage.ContentAddressedStorage(),
+                upload_to='posts/',
+                verbose_name='Картинка',
+            ),
+        ),
+    ]
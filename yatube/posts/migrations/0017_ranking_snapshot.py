@@ -0,0 +1,44 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0016_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankingSnapshot',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'kind',
+                    models.CharField(
+                        max_length=20, unique=True, verbose_name='Рейтинг'
+                    ),
+                ),
+                (
+                    'epoch',
+                    models.FloatField(verbose_name='Эпоха очков, unix-время'),
+                ),
+                ('scores', models.TextField(verbose_name='Очки (JSON)')),
+                (
+                    'updated',
+                    models.DateTimeField(
+                        auto_now=True, verbose_name='Сохранён'
+                    ),
+                ),
+            ],
+        ),
+    ]
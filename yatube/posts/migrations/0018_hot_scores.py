@@ -0,0 +1,55 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0017_ranking_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HotScore',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'kind',
+                    models.CharField(max_length=20, verbose_name='Рейтинг'),
+                ),
+                (
+                    'item_id',
+                    models.PositiveIntegerField(
+                        verbose_name='id поста или группы'
+                    ),
+                ),
+                (
+                    'era',
+                    models.PositiveIntegerField(verbose_name='Эпоха очков'),
+                ),
+                ('score', models.FloatField(verbose_name='Очки')),
+            ],
+        ),
+        migrations.DeleteModel(
+            name='RankingSnapshot',
+        ),
+        migrations.AddIndex(
+            model_name='hotscore',
+            index=models.Index(
+                fields=['kind', 'era'], name='posts_hotsc_kind_f4ece7_idx'
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name='hotscore',
+            unique_together={('kind', 'item_id')},
+        ),
+    ]
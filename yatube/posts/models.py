@@ -1,3 +1,4 @@
+from core.storage import post_images
 from django.contrib.auth import get_user_model
 from django.db import models
 
@@ -30,6 +31,7 @@ class Post(models.Model):
     )
     pub_date = models.DateTimeField(
         auto_now_add=True,
+        db_index=True,
         verbose_name="Дата публикации",
         help_text="Введите дату публикации поста",
     )
@@ -50,7 +52,11 @@ class Post(models.Model):
         help_text="Выберети группу для публикации",
     )
     image = models.ImageField(
-        verbose_name='Картинка', upload_to='posts/', blank=True, null=True
+        verbose_name='Картинка',
+        upload_to='posts/',
+        storage=post_images,
+        blank=True,
+        null=True,
     )
 
     def __str__(self):
@@ -58,6 +64,11 @@ class Post(models.Model):
 
     class Meta:
         ordering = ["-pub_date"]
+        # Ленты автора и группы отдаются от новых к старым
+        indexes = [
+            models.Index(fields=['author', '-pub_date']),
+            models.Index(fields=['group', '-pub_date']),
+        ]
         verbose_name = 'Пост'
         verbose_name_plural = 'Посты'
 
@@ -87,6 +98,7 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["-created"]
+        indexes = [models.Index(fields=['post', '-created'])]
 
 
 class Follow(models.Model):
@@ -110,3 +122,19 @@ class Follow(models.Model):
             'user',
             'author',
         )
+
+
+class HotScore(models.Model):
+    """Очки поста или группы в рейтинге горячего, см. posts.hot."""
+
+    kind = models.CharField(max_length=20, verbose_name="Рейтинг")
+    item_id = models.PositiveIntegerField(verbose_name="id поста или группы")
+    era = models.PositiveIntegerField(verbose_name="Эпоха очков")
+    score = models.FloatField(verbose_name="Очки")
+
+    def __str__(self):
+        return f'{self.kind}:{self.item_id}'
+
+    class Meta:
+        unique_together = ('kind', 'item_id')
+        indexes = [models.Index(fields=['kind', 'era'])]
@@ -0,0 +1,98 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import hot
+from .cache import (
+    author_changed,
+    bump_version,
+    group_scope,
+    groups_changed,
+    posts_changed,
+)
+from .models import Comment, Group, Post
+
+User = get_user_model()
+# Поля пользователя, которые показываются в лентах
+AUTHOR_FIELDS = ('username', 'first_name', 'last_name')
+
+
+@receiver(pre_save, sender=Post)
+def remember_group(sender, instance, **kwargs):
+    """При переносе поста в другую группу старая лента тоже устаревает."""
+    instance._previous_group_slug = None
+    if instance.pk:
+        instance._previous_group_slug = (
+            Post.objects.filter(pk=instance.pk)
+            .values_list('group__slug', flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_feeds(sender, instance, **kwargs):
+    """Новый, изменённый или удалённый пост обновляет версии лент."""
+    posts_changed([instance])
+    previous = getattr(instance, '_previous_group_slug', None)
+    if previous and previous != (instance.group and instance.group.slug):
+        bump_version(group_scope(previous))
+
+
+@receiver(pre_save, sender=Group)
+def remember_slug(sender, instance, **kwargs):
+    instance._previous_slug = None
+    if instance.pk:
+        instance._previous_slug = (
+            Group.objects.filter(pk=instance.pk)
+            .values_list('slug', flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_groups(sender, instance, **kwargs):
+    """Изменённая или удалённая группа устаревает во всех процессах."""
+    previous = getattr(instance, '_previous_slug', None)
+    groups_changed({instance.slug, previous} - {None})
+
+
+@receiver(pre_save, sender=User)
+def remember_author_fields(sender, instance, update_fields=None, **kwargs):
+    instance._previous_author_fields = None
+    if instance.pk and (
+        update_fields is None or set(update_fields) & set(AUTHOR_FIELDS)
+    ):
+        instance._previous_author_fields = (
+            User.objects.filter(pk=instance.pk)
+            .values_list(*AUTHOR_FIELDS)
+            .first()
+        )
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_feeds(sender, instance, **kwargs):
+    """Смена имени автора обновляет ленты с его постами."""
+    previous = getattr(instance, '_previous_author_fields', None)
+    current = tuple(getattr(instance, field) for field in AUTHOR_FIELDS)
+    if previous and previous != current:
+        author_changed(instance, {previous[0], instance.username})
+
+
+@receiver(post_save, sender=Post)
+def rank_new_post(sender, instance, created, **kwargs):
+    if created:
+        hot.posts_added([instance])
+
+
+@receiver(post_delete, sender=Post)
+def unrank_post(sender, instance, **kwargs):
+    hot.discard(hot.POSTS, instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+def rank_commented_post(sender, instance, created, **kwargs):
+    """Комментарий поднимает в рейтинге пост и его группу."""
+    if created:
+        hot.comments_added([(instance.post_id, instance.post.group_id)])
@@ -0,0 +1,242 @@
+"""
+Карта сайта для поисковых роботов: индекс ``sitemap.xml`` и файлы
+``sitemap-<раздел>-<номер>.xml`` со ссылками на посты, группы и профили.
+
+Файлы строит команда ``generate_sitemaps`` в SITEMAP_ROOT, роботы
+получают готовые файлы без запросов к базе. Посты разложены по файлам
+по диапазонам первичного ключа, поэтому пост всегда попадает в один
+и тот же файл, а файл перезаписывается, только если в его диапазоне
+изменилось число постов или последняя дата публикации. Подписи файлов
+хранятся в ``manifest.json`` рядом с картой.
+"""
+import hashlib
+import json
+import os
+from datetime import timezone
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, Max
+from django.urls import reverse
+
+from .models import Group, Post
+
+User = get_user_model()
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+INDEX_NAME = 'sitemap.xml'
+MANIFEST_NAME = 'manifest.json'
+
+
+def w3c_date(value):
+    """Дата в формате W3C Datetime по UTC или None."""
+    if value is None:
+        return None
+    return value.astimezone(timezone.utc).isoformat(timespec='seconds')
+
+
+def render(root_tag, tag, entries):
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        f'<{root_tag} xmlns="{SITEMAP_NS}">',
+    ]
+    for location, lastmod in entries:
+        lastmod = f'<lastmod>{lastmod}</lastmod>' if lastmod else ''
+        lines.append(f'<{tag}><loc>{escape(location)}</loc>{lastmod}</{tag}>')
+    lines.append(f'</{root_tag}>')
+    return '\n'.join(lines) + '\n'
+
+
+def render_urlset(entries):
+    """XML файла карты из пар (адрес, дата изменения)."""
+    return render('urlset', 'url', entries)
+
+
+def render_index(entries):
+    """XML индекса карты из пар (адрес файла, дата изменения)."""
+    return render('sitemapindex', 'sitemap', entries)
+
+
+class SitemapWriter:
+    """
+    Один проход генерации карты. Файлы, подпись которых совпала с прошлым
+    запуском, не перезаписываются; файлы пропавших разделов удаляются.
+    """
+
+    def __init__(self, root=None, base_url=None, limit=None, full=False):
+        self.root = root or settings.SITEMAP_ROOT
+        self.base_url = (base_url or settings.SITE_URL).rstrip('/')
+        self.limit = limit or settings.SITEMAP_LIMIT
+        self.manifest = {} if full else self.load_manifest()
+        self.files = {}
+        self.written = 0
+
+    def load_manifest(self):
+        try:
+            path = os.path.join(self.root, MANIFEST_NAME)
+            with open(path, encoding='utf-8') as stream:
+                return json.load(stream)
+        except (OSError, ValueError):
+            return {}
+
+    def absolute(self, path):
+        return self.base_url + path
+
+    def write_file(self, name, content):
+        """Пишет файл через временный: робот не увидит его недописанным."""
+        path = os.path.join(self.root, name)
+        with open(path + '.tmp', 'w', encoding='utf-8') as stream:
+            stream.write(content)
+        os.replace(path + '.tmp', path)
+
+    def unchanged(self, name, signature):
+        previous = self.manifest.get(name)
+        return (
+            previous is not None
+            and previous['signature'] == signature
+            and os.path.isfile(os.path.join(self.root, name))
+        )
+
+    def keep(self, name):
+        self.files[name] = self.manifest[name]
+
+    def save(self, name, entries, signature=None):
+        """
+        Записывает файл карты из пар (адрес, дата), если он изменился.
+        Без ``signature`` подписью служит хеш содержимого.
+        """
+        entries = list(entries)
+        content = render_urlset(entries)
+        if signature is None:
+            signature = hashlib.md5(content.encode()).hexdigest()
+        if not self.unchanged(name, signature):
+            self.write_file(name, content)
+            self.written += 1
+        lastmods = [lastmod for _, lastmod in entries if lastmod]
+        self.files[name] = {
+            'signature': signature,
+            'lastmod': max(lastmods, default=None),
+        }
+
+    def chunks(self, queryset):
+        """
+        Строки ``values_list`` с pk первым полем порциями по ``limit``,
+        с продолжением от последнего pk, без OFFSET.
+        """
+        last_pk = 0
+        while True:
+            chunk = list(
+                queryset.filter(pk__gt=last_pk).order_by('pk')[: self.limit]
+            )
+            if not chunk:
+                return
+            yield chunk
+            last_pk = chunk[-1][0]
+
+    def posts(self):
+        """
+        Файл на каждые ``limit`` значений pk. Подпись файла — число постов
+        и последняя дата публикации в диапазоне, их даёт один агрегирующий
+        запрос; строки читаются только для изменившихся диапазонов.
+        """
+        buckets = (
+            Post.objects.order_by()
+            .annotate(bucket=F('pk') / self.limit)
+            .values('bucket')
+            .annotate(count=Count('pk'), lastmod=Max('pub_date'))
+            .order_by('bucket')
+        )
+        for bucket in buckets:
+            name = f'sitemap-posts-{bucket["bucket"]}.xml'
+            signature = f'{bucket["count"]}:{w3c_date(bucket["lastmod"])}'
+            if self.unchanged(name, signature):
+                self.keep(name)
+                continue
+            start = bucket['bucket'] * self.limit
+            rows = (
+                Post.objects.filter(pk__gte=start, pk__lt=start + self.limit)
+                .order_by('pk')
+                .values_list('pk', 'pub_date')
+                .iterator()
+            )
+            self.save(
+                name,
+                (
+                    (
+                        self.absolute(
+                            reverse('posts:post_detail', args=[pk])
+                        ),
+                        w3c_date(pub_date),
+                    )
+                    for pk, pub_date in rows
+                ),
+                signature,
+            )
+
+    def groups(self):
+        queryset = Group.objects.annotate(
+            lastmod=Max('posts__pub_date')
+        ).values_list('pk', 'slug', 'lastmod')
+        for number, chunk in enumerate(self.chunks(queryset)):
+            self.save(
+                f'sitemap-groups-{number}.xml',
+                (
+                    (
+                        self.absolute(
+                            reverse('posts:group_list', args=[slug])
+                        ),
+                        w3c_date(lastmod),
+                    )
+                    for _, slug, lastmod in chunk
+                ),
+            )
+
+    def profiles(self):
+        """Профили авторов хотя бы одного поста."""
+        queryset = (
+            User.objects.annotate(lastmod=Max('posts__pub_date'))
+            .filter(lastmod__isnull=False)
+            .values_list('pk', 'username', 'lastmod')
+        )
+        for number, chunk in enumerate(self.chunks(queryset)):
+            self.save(
+                f'sitemap-profiles-{number}.xml',
+                (
+                    (
+                        self.absolute(
+                            reverse('posts:profile', args=[username])
+                        ),
+                        w3c_date(lastmod),
+                    )
+                    for _, username, lastmod in chunk
+                ),
+            )
+
+    def finish(self):
+        """Пишет индекс и манифест, удаляет файлы пропавших диапазонов."""
+        for name in set(self.manifest) - set(self.files):
+            path = os.path.join(self.root, name)
+            if os.path.isfile(path):
+                os.remove(path)
+        self.write_file(
+            INDEX_NAME,
+            render_index(
+                (self.absolute('/' + name), entry['lastmod'])
+                for name, entry in self.files.items()
+            ),
+        )
+        self.write_file(MANIFEST_NAME, json.dumps(self.files, indent=1))
+
+    def generate(self):
+        os.makedirs(self.root, exist_ok=True)
+        self.posts()
+        self.groups()
+        self.profiles()
+        self.finish()
+        return self
+
+
+def generate_sitemaps(**options):
+    """Обновляет карту сайта; возвращает отработавший SitemapWriter."""
+    return SitemapWriter(**options).generate()
@@ -0,0 +1,17 @@
+from .models import Post
+
+# Размер превью должен совпадать с шаблонами includes/article.html
+# и posts/post_detail.html, иначе sorl построит превью заново.
+THUMBNAIL_GEOMETRY = '960x339'
+THUMBNAIL_OPTIONS = {'crop': 'center', 'upscale': True}
+
+
+def warm_thumbnails(post_id):
+    """Заранее строит превью картинки поста, чтобы не делать это в запросе."""
+    post = Post.objects.filter(pk=post_id).only('image').first()
+    if post is None or not post.image:
+        return
+    # sorl тянет за собой Pillow, импортируем его только в воркере
+    from sorl.thumbnail import get_thumbnail
+
+    get_thumbnail(post.image, THUMBNAIL_GEOMETRY, **THUMBNAIL_OPTIONS)
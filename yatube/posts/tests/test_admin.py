@@ -0,0 +1,60 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class AdminChangelistTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        # Пользователь запроса кешируется: первый запрос не сравниваем
+        self.client.get(reverse('admin:index'))
+
+    def create_records(self, count):
+        for number in range(count):
+            author = User.objects.create_user(
+                username=f'author{User.objects.count()}'
+            )
+            post = Post.objects.create(
+                text=f'Пост {number}', author=author, group=self.group
+            )
+            Comment.objects.create(post=post, author=author, text='Коммент')
+            Follow.objects.create(user=self.admin, author=author)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Число запросов списка в админке не зависит от числа строк."""
+        for model in ('post', 'comment', 'follow'):
+            with self.subTest(model=model):
+                url = reverse(f'admin:posts_{model}_changelist')
+                self.create_records(2)
+                few = self.count_queries(url)
+                self.create_records(20)
+                many = self.count_queries(url)
+                self.assertEqual(few, many)
+
+    def test_comment_changelist_has_no_formset(self):
+        """Комментарии правятся в форме записи, а не формсетом списка."""
+        self.create_records(2)
+        response = self.client.get(reverse('admin:posts_comment_changelist'))
+        self.assertIsNone(response.context['cl'].formset)
@@ -0,0 +1,79 @@
+import io
+import random
+
+from django.core.management import call_command
+from django.db.models import Count, F
+from django.test import TestCase
+from posts.dataset import zipf_rank
+from posts.models import Comment, Follow, Group, Post, User
+
+
+class GenerateDatasetTests(TestCase):
+    def generate(self):
+        stdout = io.StringIO()
+        call_command(
+            'generate_dataset',
+            '--users=50',
+            '--groups=3',
+            '--posts=300',
+            '--comments=400',
+            '--follows=200',
+            '--image-share=0.5',
+            '--images=2',
+            '--seed=1',
+            stdout=stdout,
+        )
+        return stdout.getvalue()
+
+    def test_volumes_and_relations(self):
+        output = self.generate()
+
+        self.assertIn('Всего записей', output)
+        self.assertEqual(User.objects.count(), 50)
+        self.assertEqual(Group.objects.count(), 3)
+        self.assertEqual(Post.objects.count(), 300)
+        self.assertEqual(Comment.objects.count(), 400)
+        self.assertGreater(Follow.objects.count(), 100)
+        self.assertFalse(Follow.objects.filter(user=F('author')).exists())
+        self.assertFalse(
+            Comment.objects.filter(created__lt=F('post__pub_date')).exists()
+        )
+        self.assertEqual(
+            len(set(Post.objects.exclude(image=None).values_list('image'))), 2
+        )
+
+    def test_reports_inserted_rows(self):
+        """Повторяющиеся подписки пропускаются и не попадают в отчёт."""
+        output = self.generate()
+
+        self.assertIn(f'follows: {Follow.objects.count()}', output)
+
+    def test_skewed_authors_and_dates_follow_ids(self):
+        self.generate()
+
+        counts = list(
+            Post.objects.values('author')
+            .annotate(posts=Count('pk'))
+            .order_by('-posts')
+            .values_list('posts', flat=True)
+        )
+        self.assertGreater(counts[0], 5 * 300 / 50)
+        dates = list(Post.objects.order_by('pk').values_list('pub_date'))
+        self.assertEqual(dates, sorted(dates))
+
+    def test_ids_continue_after_generation(self):
+        self.generate()
+
+        user = User.objects.create_user(username='after')
+        post = Post.objects.create(text='Новый пост', author=user)
+
+        self.assertGreater(post.pk, 300)
+        self.assertEqual(User.objects.count(), 51)
+
+    def test_zipf_rank_stays_in_range(self):
+        rnd = random.Random(1)
+        ranks = [zipf_rank(rnd, 10, 1.2) for _ in range(1000)]
+
+        self.assertEqual(min(ranks), 0)
+        self.assertLessEqual(max(ranks), 9)
+        self.assertGreater(ranks.count(0), ranks.count(9))
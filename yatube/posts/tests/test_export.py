@@ -0,0 +1,85 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.post_in_group = Post.objects.create(
+            text='Пост в группе', author=cls.author, group=cls.group
+        )
+        cls.post = Post.objects.create(text='Пост', author=cls.reader)
+        Comment.objects.create(
+            post=cls.post_in_group, author=cls.reader, text='Коммент'
+        )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def export(self, *args):
+        stdout = io.StringIO()
+        call_command('export_data', *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_export_posts_ndjson(self):
+        """Каждый пост выгружается отдельной строкой JSON."""
+        rows = [json.loads(line) for line in self.export('posts').splitlines()]
+
+        self.assertEqual(
+            [row['id'] for row in rows], [self.post_in_group.pk, self.post.pk]
+        )
+        self.assertEqual(rows[0]['author'], 'author')
+        self.assertEqual(rows[0]['group'], 'group')
+        self.assertIsNone(rows[1]['group'])
+
+    def test_export_filters(self):
+        """Фильтры по группе и автору сужают выгрузку."""
+        by_group = self.export('comments', '--group', 'group')
+        by_author = self.export('posts', '--author', 'reader')
+        follows = self.export('follows', '--author', 'nobody')
+
+        self.assertEqual(len(by_group.splitlines()), 1)
+        self.assertEqual(json.loads(by_author)['text'], 'Пост')
+        self.assertEqual(follows, '')
+
+    def test_export_csv_to_gzip_file(self):
+        """CSV пишется в gzip-файл с заголовком."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'follows.csv.gz')
+            self.export('follows', '--format', 'csv', '--output', path)
+            with gzip.open(path, 'rt', encoding='utf-8') as stream:
+                rows = list(csv.reader(stream))
+
+        self.assertEqual(rows[0], ['id', 'user', 'author'])
+        self.assertEqual(rows[1][1:], ['reader', 'author'])
+
+    def test_admin_action_streams_selected_rows(self):
+        """Действие админки отдаёт выбранные посты потоковым ответом."""
+        admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        self.client.force_login(admin)
+
+        response = self.client.post(
+            reverse('admin:posts_post_changelist'),
+            {'action': 'export_as_ndjson', '_selected_action': [self.post.pk]},
+        )
+
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content).decode()
+        self.assertEqual(json.loads(body)['id'], self.post.pk)
@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from posts.cache import VERSION_KEY, group_scope
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class FeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая', slug='other', description='Описание'
+        )
+        cls.post = Post.objects.create(
+            text='Пост в группе', author=cls.author, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_feeds_render(self):
+        """Все ленты отдаются и содержат пост."""
+        urls = (
+            reverse('posts:rss'),
+            reverse('posts:atom'),
+            reverse('posts:group_rss', args=['group']),
+            reverse('posts:group_atom', args=['group']),
+            reverse('posts:profile_rss', args=['author']),
+            reverse('posts:profile_atom', args=['author']),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, 'Пост в группе')
+                self.assertIn('xml', response['Content-Type'])
+
+    def test_unknown_group_feed_is_404(self):
+        response = self.client.get(reverse('posts:group_rss', args=['nope']))
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        self.assertIsNone(cache.get(VERSION_KEY.format(group_scope('nope'))))
+
+    def test_lost_version_does_not_revive_old_feed(self):
+        """После вытеснения версии старые ленты и ETag не возвращаются."""
+        url = reverse('posts:group_rss', args=['group'])
+        key = VERSION_KEY.format(group_scope('group'))
+        etag = self.client.get(url)['ETag']
+        Post.objects.create(
+            text='Свежий пост', author=self.author, group=self.group
+        )
+        self.client.get(url)
+
+        cache.delete(key)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertContains(response, 'Свежий пост')
+
+    def test_repeated_poll_costs_no_queries(self):
+        """Повторный опрос — 304 или кеш, без запросов к базе."""
+        url = reverse('posts:group_rss', args=['group'])
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(0):
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            cached = self.client.get(url)
+
+        self.assertEqual(not_modified.status_code, HTTPStatus.NOT_MODIFIED)
+        self.assertContains(cached, 'Пост в группе')
+
+    def test_new_post_invalidates_feed(self):
+        """Новый пост меняет ETag и попадает в ленту."""
+        url = reverse('posts:group_atom', args=['group'])
+        etag = self.client.get(url)['ETag']
+
+        Post.objects.create(
+            text='Свежий пост', author=self.author, group=self.group
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertContains(response, 'Свежий пост')
+
+    def test_moved_post_leaves_old_group_feed(self):
+        """Пост, перенесённый в другую группу, пропадает из старой ленты."""
+        url = reverse('posts:group_rss', args=['group'])
+        self.client.get(url)
+
+        self.post.group = self.other_group
+        self.post.save()
+
+        self.assertNotContains(self.client.get(url), 'Пост в группе')
@@ -1,19 +1,16 @@
-import shutil
-import tempfile
+import io
 
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import Client, TestCase, override_settings
 from django.urls import reverse
+from PIL import Image, ImageCms
+from posts.forms import PostForm
 from posts.models import Comment, Group, Post
 
 User = get_user_model()
 
-TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
 
-
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
 class DataBaseRecords(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -37,11 +34,6 @@ class DataBaseRecords(TestCase):
             post=cls.new_post,
         )
 
-    @classmethod
-    def tearDownClass(cls):
-        super().tearDownClass()
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
-
     def setUp(self):
         # неавторизированный клиент
         self.guest_client = Client()
@@ -99,13 +91,12 @@ class PostCreateEditTests(DataBaseRecords):
         self.assertEqual(post.text, form_data['text'])
         self.assertEqual(post.group.pk, form_data['group'])
         self.assertEqual(post.author, self.author)
+        # Картинка сохраняется под именем из хеша своего содержимого
         self.assertEqual(
-            post.image.name.split('/')[1], form_data['image'].name
+            post.image.name,
+            post.image.storage.content_name('posts/small.gif', post.image),
         )
 
-        # удаляем загруженную картинку, чтобы следующие тесты не дублировали
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
-
     def test_create_post_by_guest_client(self):
         """
         Проверка возможности создания поста анонимным пользователем.
@@ -159,13 +150,12 @@ class PostCreateEditTests(DataBaseRecords):
         self.assertEqual(post.text, form_data['text'])
         self.assertEqual(post.group.pk, form_data['group'])
         self.assertEqual(post.author, self.author)
+        # Картинка сохраняется под именем из хеша своего содержимого
         self.assertEqual(
-            post.image.name.split('/')[1], form_data['image'].name
+            post.image.name,
+            post.image.storage.content_name('posts/small.gif', post.image),
         )
 
-        # удаляем загруженную картинку, чтобы следующие тесты не дублировали
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
-
 
 class CommentCreateTests(DataBaseRecords):
     def test_create_comment(self):
@@ -223,3 +213,80 @@ class CommentCreateTests(DataBaseRecords):
         self.assertRedirects(
             response, f'/auth/login/?next=/posts/{self.new_post.pk}/comment/'
         )
+
+
+class PostImageLimitsTests(TestCase):
+    @staticmethod
+    def make_image(width, height, image_format='PNG'):
+        buffer = io.BytesIO()
+        Image.new('RGB', (width, height), 'red').save(buffer, image_format)
+        return SimpleUploadedFile(
+            name=f'image.{image_format.lower()}',
+            content=buffer.getvalue(),
+            content_type=f'image/{image_format.lower()}',
+        )
+
+    def validate(self, upload):
+        form = PostForm(data={'text': 'Текст'}, files={'image': upload})
+        form.is_valid()
+        return form
+
+    @override_settings(POST_IMAGE_MAX_BYTES=100)
+    def test_large_file_is_rejected(self):
+        """Файл больше лимита отклоняется до разбора картинки."""
+        form = self.validate(self.make_image(200, 200))
+
+        self.assertEqual(
+            form.errors.as_data()['image'][0].code, 'file_too_large'
+        )
+
+    @override_settings(POST_IMAGE_MAX_PIXELS=100)
+    def test_too_many_pixels_is_rejected(self):
+        """Картинка с числом пикселей больше лимита отклоняется."""
+        form = self.validate(self.make_image(20, 10))
+
+        self.assertEqual(
+            form.errors.as_data()['image'][0].code, 'too_many_pixels'
+        )
+
+    @override_settings(POST_IMAGE_MAX_SIDE=50)
+    def test_large_image_is_downscaled(self):
+        """Большая картинка уменьшается до POST_IMAGE_MAX_SIDE."""
+        for image_format in ('PNG', 'JPEG'):
+            with self.subTest(image_format=image_format):
+                form = self.validate(self.make_image(200, 100, image_format))
+
+                image = Image.open(form.cleaned_data['image'])
+                self.assertEqual(image.size, (50, 25))
+                self.assertEqual(image.format, image_format)
+
+    @override_settings(POST_IMAGE_MAX_SIDE=50)
+    def test_small_image_is_kept(self):
+        """Картинка в пределах лимита сохраняется как есть."""
+        upload = self.make_image(40, 20)
+
+        form = self.validate(upload)
+
+        self.assertIs(form.cleaned_data['image'], upload)
+
+    @override_settings(POST_IMAGE_MAX_SIDE=50)
+    def test_downscale_applies_orientation_and_keeps_profile(self):
+        """Поворот из EXIF применяется, профиль ICC сохраняется."""
+        exif = Image.Exif()
+        # Orientation = 6: повернуть на 90° по часовой стрелке
+        exif[0x0112] = 6
+        profile = ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB'))
+        profile = profile.tobytes()
+        buffer = io.BytesIO()
+        Image.new('RGB', (200, 100), 'red').save(
+            buffer, 'JPEG', exif=exif, icc_profile=profile
+        )
+        upload = SimpleUploadedFile(
+            'photo.jpg', buffer.getvalue(), content_type='image/jpeg'
+        )
+
+        form = self.validate(upload)
+
+        image = Image.open(form.cleaned_data['image'])
+        self.assertEqual(image.size, (25, 50))
+        self.assertEqual(image.info.get('icc_profile'), profile)
@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.paginator import Page
+from django.test import TestCase
+from django.urls import reverse
+from posts.cache import VERSION_KEY, cached_group, group_scope
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class GroupPageCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        Post.objects.create(
+            text='Первый пост', author=cls.author, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('posts:group_list', args=['group'])
+
+    def test_repeated_page_served_from_cache(self):
+        self.client.force_login(self.author)
+        self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+
+        self.assertContains(response, 'Первый пост')
+        self.assertIsInstance(response.context['page_obj'], Page)
+
+    def test_new_post_invalidates_fragment(self):
+        self.client.get(self.url)
+
+        Post.objects.create(
+            text='Второй пост', author=self.author, group=self.group
+        )
+
+        self.assertContains(self.client.get(self.url), 'Второй пост')
+
+    def test_group_change_invalidates_metadata(self):
+        self.client.get(self.url)
+        group = Group.objects.get(pk=self.group.pk)
+
+        group.title = 'Новое название'
+        group.save()
+
+        self.assertContains(self.client.get(self.url), 'Новое название')
+
+    def test_lost_version_drops_process_entries(self):
+        cached_group('group')
+        Group.objects.filter(pk=self.group.pk).update(title='Без сигнала')
+
+        cache.clear()
+
+        self.assertEqual(cached_group('group')[0].title, 'Без сигнала')
+
+    def test_unknown_group(self):
+        response = self.client.get(
+            reverse('posts:group_list', args=['missing'])
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        self.assertIsNone(
+            cache.get(VERSION_KEY.format(group_scope('missing')))
+        )
+
+    def test_author_rename_invalidates_fragment(self):
+        """Фрагмент с именем автора обновляется при смене имени."""
+        self.client.get(self.url)
+        author = User.objects.get(pk=self.author.pk)
+
+        author.first_name, author.last_name = 'Новое', 'Имя'
+        author.save()
+
+        self.assertContains(self.client.get(self.url), 'Новое Имя')
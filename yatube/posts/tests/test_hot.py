@@ -0,0 +1,125 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from posts import hot
+from posts.models import Comment, Group, HotScore, Post
+
+User = get_user_model()
+
+
+@override_settings(HOT_HALF_LIFE=100, HOT_SIZE=2, HOT_TOP_CACHE_TIMEOUT=0)
+class RankingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_old_activity_decays(self):
+        """Три комментария час назад весят меньше одного свежего."""
+        hot.record(hot.POSTS, [(1, 1)] * 3, now=0)
+        hot.record(hot.POSTS, [(2, 1)], now=100)
+        self.assertEqual(hot.top(hot.POSTS, now=100), [1, 2])
+
+        hot.record(hot.POSTS, [(3, 1)], now=300)
+        hot.record(hot.POSTS, [(2, 1)], now=300)
+        self.assertEqual(hot.top(hot.POSTS, now=300), [2, 3])
+
+    def test_next_era_keeps_order(self):
+        """Очки прошлой эпохи переводятся в масштаб новой."""
+        era = hot.ERA_HALF_LIVES * 100
+        hot.record(hot.POSTS, [(1, 2.4), (2, 1)], now=era - 100)
+
+        hot.record(hot.POSTS, [(3, 1), (2, 1)], now=era)
+
+        # Очки на момент era: 1 — 1.2, 2 — 0.5 + 1, 3 — 1
+        self.assertEqual(hot.top(hot.POSTS, now=era), [2, 1])
+        self.assertEqual(
+            HotScore.objects.get(item_id=2).score, 1.5
+        )
+
+    def test_old_eras_are_pruned(self):
+        hot.record(hot.POSTS, [(1, 1)], now=0)
+        hot.record(hot.POSTS, [(2, 1)], now=hot.ERA_HALF_LIVES * 100 * 2)
+
+        self.assertEqual(hot.top(hot.POSTS, now=hot.ERA_HALF_LIVES * 200), [2])
+        self.assertEqual(HotScore.objects.count(), 1)
+
+    def test_batch_of_new_items_costs_constant_queries(self):
+        with CaptureQueriesContext(connection) as few:
+            hot.record(hot.POSTS, [(pk, 1) for pk in range(1, 3)], now=0)
+        with CaptureQueriesContext(connection) as many:
+            hot.record(hot.POSTS, [(pk, 1) for pk in range(3, 50)], now=0)
+
+        self.assertEqual(len(few), len(many))
+
+    def test_concurrent_events_are_not_lost(self):
+        """События разных процессов складываются, а не перезаписываются."""
+        hot.record(hot.POSTS, [(1, 1)], now=0)
+        hot.record(hot.POSTS, [(2, 1), (2, 1)], now=0)
+        for _ in range(3):
+            hot.record(hot.POSTS, [(1, 1)], now=0)
+
+        self.assertEqual(
+            dict(HotScore.objects.values_list('item_id', 'score')),
+            {1: 4, 2: 2},
+        )
+
+
+class HotPostsViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая', slug='other', description='Описание'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.quiet = Post.objects.create(
+            text='Тихий', author=self.user, group=self.other_group
+        )
+        self.discussed = Post.objects.create(
+            text='Обсуждаемый', author=self.user, group=self.group
+        )
+        self.client.force_login(self.user)
+        for number in range(3):
+            self.client.post(
+                reverse('posts:add_comment', args=[self.discussed.pk]),
+                {'text': f'Комментарий {number}'},
+            )
+
+    def test_commented_post_and_group_rank_first(self):
+        response = self.client.get(reverse('posts:hot'))
+
+        self.assertEqual(
+            list(response.context['page_obj']), [self.discussed, self.quiet]
+        )
+        self.assertEqual(
+            response.context['groups'], [self.group, self.other_group]
+        )
+
+    def test_deleted_post_leaves_ranking(self):
+        self.discussed.delete()
+
+        self.assertEqual(hot.top(hot.POSTS), [self.quiet.pk])
+
+    def test_rebuild_matches_signals(self):
+        """Пересчёт по базе даёт тот же порядок, что и сигналы."""
+        expected = hot.top(hot.POSTS), hot.top(hot.GROUPS)
+        cache.clear()
+        HotScore.objects.all().delete()
+        Comment.objects.create(
+            post=self.quiet, author=self.user, text='Ещё один'
+        )
+        cache.clear()
+
+        call_command('rebuild_hot', stdout=io.StringIO())
+
+        self.assertEqual((hot.top(hot.POSTS), hot.top(hot.GROUPS)), expected)
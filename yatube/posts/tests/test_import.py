@@ -0,0 +1,125 @@
+import io
+import os
+import shutil
+import tempfile
+
+from core.models import Task
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class ImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user(username='author')
+        reader = User.objects.create_user(username='reader')
+        group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        post = Post.objects.create(
+            text='Пост', author=author, group=group, image='posts/small.gif'
+        )
+        Comment.objects.create(post=post, author=reader, text='Коммент')
+        Follow.objects.create(user=reader, author=author)
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def export(self, kind, extension):
+        path = os.path.join(self.directory, f'{kind}.{extension}')
+        call_command('export_data', kind, '--output', path)
+        return path
+
+    def test_round_trip_keeps_ids_dates_and_relations(self):
+        """Выгрузка и загрузка обратно восстанавливают записи как были."""
+        before = list(Post.objects.values_list('pk', 'pub_date', 'text'))
+        paths = [
+            self.export('posts', 'ndjson.gz'),
+            self.export('comments', 'ndjson'),
+            self.export('follows', 'csv'),
+        ]
+        Post.objects.all().delete()
+        Follow.objects.all().delete()
+        User.objects.filter(username='reader').delete()
+
+        for kind, path in zip(('posts', 'comments', 'follows'), paths):
+            call_command(
+                'import_data',
+                kind,
+                path,
+                '--batch-size',
+                '1',
+                stdout=io.StringIO(),
+            )
+
+        self.assertEqual(
+            list(Post.objects.values_list('pk', 'pub_date', 'text')), before
+        )
+        comment = Comment.objects.get()
+        self.assertEqual(comment.author.username, 'reader')
+        self.assertFalse(comment.author.has_usable_password())
+        self.assertTrue(
+            Follow.objects.filter(
+                user__username='reader', author__username='author'
+            ).exists()
+        )
+
+    def test_images_are_copied_and_thumbnails_queued(self):
+        """Картинки копируются из media_source, превью ставятся в очередь."""
+        source = os.path.join(self.directory, 'media')
+        os.makedirs(os.path.join(source, 'posts'))
+        with open(os.path.join(source, 'posts', 'small.gif'), 'wb') as image:
+            image.write(b'GIF89a')
+        path = self.export('posts', 'ndjson')
+        Post.objects.all().delete()
+
+        call_command(
+            'import_data',
+            'posts',
+            path,
+            '--media-source',
+            source,
+            stdout=io.StringIO(),
+        )
+
+        post = Post.objects.get()
+        self.assertTrue(post.image.storage.exists(post.image.name))
+        self.assertEqual(
+            Task.objects.filter(name='posts.tasks.warm_thumbnails').count(), 1
+        )
+
+    def test_existing_records_are_skipped_and_reported(self):
+        """Записи с уже занятыми id не вставляются и не ставят превью."""
+        path = self.export('posts', 'ndjson')
+        follows = self.export('follows', 'ndjson')
+        post = Post.objects.get()
+        output = io.StringIO()
+
+        call_command('import_data', 'posts', path, stdout=output)
+        call_command('import_data', 'follows', follows, stdout=output)
+
+        self.assertIn('Загружено записей: 0', output.getvalue())
+        self.assertIn(
+            f'Пропущено уже существующих: 1 (id: {post.pk})',
+            output.getvalue(),
+        )
+        self.assertFalse(
+            Task.objects.filter(name='posts.tasks.warm_thumbnails').exists()
+        )
+
+    def test_missing_group_is_created(self):
+        """Пост группы, которой нет в базе, не теряет группу."""
+        path = self.export('posts', 'ndjson')
+        Post.objects.all().delete()
+        Group.objects.all().delete()
+        output = io.StringIO()
+
+        call_command('import_data', 'posts', path, stdout=output)
+
+        self.assertIn('групп: 1', output.getvalue())
+        self.assertEqual(Post.objects.get().group.slug, 'group')
@@ -0,0 +1,92 @@
+import io
+
+from core.testing import QueryBudgetMixin, SnapshotTestCase, measure_view
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from posts.models import Comment, Follow, Group, Post
+from PIL import Image
+
+User = get_user_model()
+
+
+def small_gif(number):
+    """
+    Картинка 2×1 своего цвета для каждого поста: хранилище сводит
+    одинаковые файлы в один, и общая миниатюра занизила бы бюджет.
+    """
+    stream = io.BytesIO()
+    Image.new('RGB', (2, 1), (number, 0, 0)).save(stream, 'GIF')
+    return stream.getvalue()
+
+
+# Размеры страницы: рост числа запросов с размером страницы — это N+1
+PAGE_SIZES = (1, 10)
+
+
+class QueryBudgetTests(QueryBudgetMixin, SnapshotTestCase):
+    @classmethod
+    def seed(cls):
+        authors = [
+            User.objects.create_user(username=f'author{number}')
+            for number in range(3)
+        ]
+        reader = User.objects.create_user(username='reader')
+        group = Group.objects.create(title='Группа', slug='group')
+        for number in range(12):
+            Post.objects.create(
+                text=f'Пост номер {number}',
+                author=authors[number % len(authors)],
+                group=group if number % 2 else None,
+                image=SimpleUploadedFile(
+                    f'small{number}.gif', small_gif(number), 'image/gif'
+                ),
+            )
+        post = Post.objects.latest('pk')
+        for number, author in enumerate(authors * 2):
+            Comment.objects.create(
+                text=f'Комментарий {number}', author=author, post=post
+            )
+        for author in authors:
+            Follow.objects.create(user=reader, author=author)
+        return {'author': authors[0], 'reader': reader, 'post': post}
+
+    def setUp(self):
+        self.client.force_login(self.reader)
+
+    def pages(self):
+        return {
+            'posts:index': reverse('posts:index'),
+            'posts:hot': reverse('posts:hot'),
+            'posts:group_list': reverse(
+                'posts:group_list', kwargs={'slug': 'group'}
+            ),
+            'posts:profile': reverse(
+                'posts:profile', kwargs={'username': self.author.username}
+            ),
+            'posts:follow_index': reverse('posts:follow_index'),
+        }
+
+    def test_paginated_pages(self):
+        for name, url in self.pages().items():
+            for page_size in PAGE_SIZES:
+                with self.subTest(name, page_size=page_size):
+                    with override_settings(RECORDS_PER_PAGE=page_size):
+                        self.assertWithinBudget(f'{name} [{page_size}]', url)
+
+    def test_page_size_adds_no_queries(self):
+        """Картинки и превью страницы загружаются пачкой, без N+1."""
+        for name, url in self.pages().items():
+            counts = []
+            for page_size in PAGE_SIZES:
+                with override_settings(RECORDS_PER_PAGE=page_size):
+                    counts.append(len(measure_view(self.client, url)[1]))
+            with self.subTest(name):
+                self.assertEqual(len(set(counts)), 1, counts)
+
+    def test_post_detail(self):
+        self.assertWithinBudget(
+            'posts:post_detail',
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        )
@@ -0,0 +1,114 @@
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from posts.models import Group, Post
+from posts.sitemaps import generate_sitemaps
+
+User = get_user_model()
+
+SITEMAP_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    SITEMAP_ROOT=SITEMAP_ROOT,
+    SITEMAP_LIMIT=2,
+    SITE_URL='https://example.com',
+)
+class SitemapTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        User.objects.create_user(username='silent')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.posts = [
+            Post.objects.create(
+                pk=pk, text=f'Пост {pk}', author=cls.author, group=cls.group
+            )
+            for pk in (1, 2, 3)
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(SITEMAP_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        shutil.rmtree(SITEMAP_ROOT, ignore_errors=True)
+
+    def read(self, name):
+        with open(os.path.join(SITEMAP_ROOT, name), encoding='utf-8') as f:
+            return f.read()
+
+    def test_index_lists_sitemap_files(self):
+        """Индекс ссылается на файлы постов по диапазонам pk, групп и
+        профилей."""
+        generate_sitemaps()
+
+        index = self.read('sitemap.xml')
+        for name in (
+            'sitemap-posts-0.xml',
+            'sitemap-posts-1.xml',
+            'sitemap-groups-0.xml',
+            'sitemap-profiles-0.xml',
+        ):
+            self.assertIn(f'<loc>https://example.com/{name}</loc>', index)
+        self.assertIn('<lastmod>', index)
+
+    def test_files_contain_urls_and_lastmod(self):
+        generate_sitemaps()
+
+        posts = self.read('sitemap-posts-1.xml')
+        self.assertIn('<loc>https://example.com/posts/2/</loc>', posts)
+        self.assertIn('<loc>https://example.com/posts/3/</loc>', posts)
+        self.assertNotIn('/posts/1/', posts)
+        lastmod = self.posts[2].pub_date.isoformat(timespec='seconds')
+        self.assertIn(f'<lastmod>{lastmod}</lastmod>', posts)
+        self.assertIn('/group/group/', self.read('sitemap-groups-0.xml'))
+        profiles = self.read('sitemap-profiles-0.xml')
+        self.assertIn('/profile/author/', profiles)
+        self.assertNotIn('/profile/silent/', profiles)
+
+    def test_unchanged_files_are_not_rewritten(self):
+        """Повторный запуск переписывает только изменившиеся диапазоны."""
+        self.assertEqual(generate_sitemaps().written, 4)
+        self.assertEqual(generate_sitemaps().written, 0)
+
+        Post.objects.create(pk=5, text='Новый', author=self.author)
+        Post.objects.filter(pk=5).update(
+            pub_date=self.posts[2].pub_date + timedelta(hours=1)
+        )
+        writer = generate_sitemaps()
+
+        # Новый диапазон постов и профиль автора с новой датой
+        self.assertEqual(writer.written, 2)
+        self.assertIn('/posts/5/', self.read('sitemap-posts-2.xml'))
+
+    def test_stale_files_are_removed(self):
+        generate_sitemaps()
+        Post.objects.filter(pk=1).delete()
+
+        generate_sitemaps()
+
+        self.assertFalse(
+            os.path.exists(os.path.join(SITEMAP_ROOT, 'sitemap-posts-0.xml'))
+        )
+        self.assertNotIn('sitemap-posts-0.xml', self.read('sitemap.xml'))
+
+    def test_sitemap_is_served_as_file(self):
+        stdout = io.StringIO()
+        call_command('generate_sitemaps', stdout=stdout)
+
+        self.assertIn('перезаписано: 4', stdout.getvalue())
+        response = self.client.get('/sitemap.xml')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            b'sitemap-posts-0.xml', b''.join(response.streaming_content)
+        )
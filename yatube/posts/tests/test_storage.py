@@ -0,0 +1,86 @@
+import io
+import os
+import tempfile
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from posts.models import Post
+
+User = get_user_model()
+
+
+# collect_images обходит весь MEDIA_ROOT: отдельный каталог внутри
+# тестового (tmpfs, см. yatube.test_settings), чтобы не удалить файлы
+# других тестов
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(dir=settings.MEDIA_ROOT))
+class ContentAddressedStorageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+
+    def create_post(self, filename, content):
+        post = Post(text='Пост', author=self.author)
+        post.image.save(filename, ContentFile(content))
+        return post
+
+    def test_identical_uploads_share_one_file(self):
+        """Одинаковые файлы с разными именами хранятся один раз."""
+        first = self.create_post('cat.gif', b'GIF89a-cat')
+        second = self.create_post('copy-of-cat.GIF', b'GIF89a-cat')
+        other = self.create_post('cat.gif', b'GIF89a-dog')
+
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertNotEqual(first.image.name, other.image.name)
+        self.assertRegex(
+            first.image.name,
+            r'^posts/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.gif$',
+        )
+        directory = os.path.dirname(first.image.path)
+        self.assertEqual(
+            os.listdir(directory), [os.path.basename(first.image.path)]
+        )
+
+    def test_saving_stored_name_keeps_it(self):
+        """Имя, уже выданное хранилищем, при повторном сохранении то же."""
+        post = self.create_post('cat.gif', b'GIF89a-cat')
+        storage = post.image.storage
+
+        name = storage.save(post.image.name, ContentFile(b'GIF89a-cat'))
+
+        self.assertEqual(name, post.image.name)
+
+    def test_collect_images_removes_only_unreferenced_files(self):
+        """Сборщик удаляет файлы без постов и не трогает используемые."""
+        kept = self.create_post('kept.gif', b'GIF89a-kept')
+        orphan = self.create_post('orphan.gif', b'GIF89a-orphan')
+        orphan_path = orphan.image.path
+        orphan.delete()
+
+        call_command('collect_images', stdout=io.StringIO())
+        self.assertTrue(os.path.exists(orphan_path), 'свежий файл удалён')
+
+        old = time.time() - 7200
+        os.utime(orphan_path, (old, old))
+        os.utime(kept.image.path, (old, old))
+        call_command('collect_images', stdout=io.StringIO())
+
+        self.assertFalse(os.path.exists(orphan_path))
+        self.assertTrue(os.path.exists(kept.image.path))
+
+    def test_reupload_of_old_orphan_is_kept(self):
+        """Повторная загрузка старого файла без ссылок защищает его."""
+        orphan = self.create_post('orphan.gif', b'GIF89a-again')
+        path = orphan.image.path
+        orphan.delete()
+        old = time.time() - 7200
+        os.utime(path, (old, old))
+
+        self.create_post('again.gif', b'GIF89a-again')
+        self.assertGreater(os.path.getmtime(path), old)
+        call_command('collect_images', stdout=io.StringIO())
+
+        self.assertTrue(os.path.exists(path))
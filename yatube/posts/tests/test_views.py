@@ -1,31 +1,27 @@
-import shutil
-import tempfile
 from http import HTTPStatus
 
+from core.testing import SnapshotTestCase
 from django import forms
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import Client, TestCase, override_settings
+from django.test import Client
 from django.urls import reverse
 from posts.models import Comment, Follow, Group, Post
 
-TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
-
 User = get_user_model()
 
 
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
-class DataBaseRecords(TestCase):
-    @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+class DataBaseRecords(SnapshotTestCase):
+    number_of_records: int = 12
 
-        cls.author = User.objects.create_user(
+    @classmethod
+    def seed(cls):
+        author = User.objects.create_user(
             username='abcUser',
         )
-        cls.follower = User.objects.create_user(
+        follower = User.objects.create_user(
             username='followerUser',
         )
 
@@ -50,20 +46,18 @@ class DataBaseRecords(TestCase):
             name='small.gif', content=small_gif, content_type='image/gif'
         )
 
-        cls.number_of_records: int = 12
-
         # 12 постов, где первый принадлежит другой группе
         for record in range(cls.number_of_records):
             if record == 1:
                 Post.objects.create(
                     text=f'Пост номер {record}',
-                    author=cls.author,
+                    author=author,
                     group=Group.objects.first(),
                     image=uploaded,
                 )
             Post.objects.create(
                 text=f'Пост номер {record}',
-                author=cls.author,
+                author=author,
                 group=Group.objects.last(),
                 image=uploaded,
             )
@@ -73,19 +67,15 @@ class DataBaseRecords(TestCase):
             if record == 1:
                 Comment.objects.create(
                     text=f'Комментарий номер {record}',
-                    author=cls.author,
+                    author=author,
                     post=Post.objects.first(),
                 )
             Comment.objects.create(
                 text=f'Комментарий номер {record}',
-                author=cls.author,
+                author=author,
                 post=Post.objects.last(),
             )
-
-    @classmethod
-    def tearDownClass(cls):
-        super().tearDownClass()
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+        return {'author': author, 'follower': follower}
 
     def setUp(self):
         cache.clear()
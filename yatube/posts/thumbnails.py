@@ -0,0 +1,73 @@
+"""
+Превью картинок для страниц со списком постов.
+
+Тег {% thumbnail %} ищет запись о каждом превью в хранилище ключей sorl
+отдельно: в кеше, а при промахе — запросом к thumbnail_kvstore, то есть
+по запросу на пост. ``prefetch_thumbnails`` заранее читает записи всей
+страницы одним get_many и одним запросом и кладёт их в кеш, так что
+теги страницы обходятся без базы.
+
+Ключ записи sorl строит из имени картинки, геометрии и опций превью,
+поэтому они должны совпадать с шаблонами (см. posts.tasks).
+"""
+from .tasks import THUMBNAIL_GEOMETRY, THUMBNAIL_OPTIONS
+
+
+def thumbnail_options(source):
+    """Опции превью с умолчаниями, как их дополняет ThumbnailBackend."""
+    from sorl.thumbnail import default
+    from sorl.thumbnail.conf import defaults, settings
+
+    options = dict(THUMBNAIL_OPTIONS)
+    if settings.THUMBNAIL_PRESERVE_FORMAT:
+        options.setdefault('format', default.backend._get_format(source))
+    for key, value in default.backend.default_options.items():
+        options.setdefault(key, value)
+    for key, attr in default.backend.extra_options:
+        value = getattr(settings, attr)
+        if value != getattr(defaults, attr):
+            options.setdefault(key, value)
+    return options
+
+
+def thumbnail_key(image):
+    """Ключ записи о превью ``image`` в кеше хранилища ключей sorl."""
+    from sorl.thumbnail import default
+    from sorl.thumbnail.images import ImageFile
+    from sorl.thumbnail.kvstores.base import add_prefix
+
+    source = ImageFile(image)
+    name = default.backend._get_thumbnail_filename(
+        source, THUMBNAIL_GEOMETRY, thumbnail_options(source)
+    )
+    return add_prefix(ImageFile(name, default.storage).key)
+
+
+def prefetch_thumbnails(posts):
+    """Кладёт в кеш записи о превью картинок ``posts``, которых там нет."""
+    images = [post.image for post in posts if post.image]
+    if not images:
+        return
+    # sorl тянет за собой Pillow: импортируем его только при показе картинок
+    from sorl.thumbnail import default
+    from sorl.thumbnail.conf import settings
+    from sorl.thumbnail.kvstores.cached_db_kvstore import EMPTY_VALUE, KVStore
+    from sorl.thumbnail.models import KVStore as KVStoreModel
+
+    if not isinstance(default.kvstore, KVStore):
+        return
+    kv_cache = default.kvstore.cache
+    keys = {thumbnail_key(image) for image in images}
+    missing = keys - set(kv_cache.get_many(keys))
+    if not missing:
+        return
+    found = dict(
+        KVStoreModel.objects.filter(key__in=missing).values_list(
+            'key', 'value'
+        )
+    )
+    # Отсутствие записи тоже кешируется, как в самом KVStore
+    kv_cache.set_many(
+        {key: found.get(key, EMPTY_VALUE) for key in missing},
+        settings.THUMBNAIL_CACHE_TIMEOUT,
+    )
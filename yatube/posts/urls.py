@@ -1,11 +1,13 @@
-from django.urls import path
+from django.urls import path, re_path
 
-from . import views
+from . import feeds, views
 
 app_name = "posts"
 
 urlpatterns = [
     path("", views.index, name="index"),
+    # Горячие посты и популярные группы
+    path("hot/", views.hot_posts, name="hot"),
     path("group/<slug:slug>/", views.group_posts, name="group_list"),
     # Cтраница создания поста
     path("create/", views.post_create, name="post_create"),
@@ -33,4 +35,19 @@ urlpatterns = [
         views.profile_unfollow,
         name='profile_unfollow',
     ),
+    # RSS и Atom ленты
+    path('feeds/rss/', feeds.latest_rss, name='rss'),
+    path('feeds/atom/', feeds.latest_atom, name='atom'),
+    path('group/<slug:slug>/rss/', feeds.group_rss, name='group_rss'),
+    path('group/<slug:slug>/atom/', feeds.group_atom, name='group_atom'),
+    path('profile/<str:username>/rss/', feeds.author_rss, name='profile_rss'),
+    path(
+        'profile/<str:username>/atom/', feeds.author_atom, name='profile_atom'
+    ),
+    # Готовые файлы карты сайта; в продакшене их отдаёт веб-сервер
+    re_path(
+        r'^(?P<path>sitemap[\w-]*\.xml)$',
+        views.sitemap_file,
+        name='sitemap',
+    ),
 ]
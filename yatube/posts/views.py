@@ -1,11 +1,20 @@
+from core.paginator import elided_page_range
+from core.ratelimit import ratelimit, write_gate
+from core.tasks import enqueue
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
+from django.db.models import QuerySet
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.functional import SimpleLazyObject
 from django.views.decorators.cache import cache_page
+from django.views.static import serve
 
+from . import hot
+from .cache import cached_group
 from .forms import CommentForm, PostForm
 from .models import Follow, Group, Post, User
+from .thumbnails import prefetch_thumbnails
 
 
 def get_page_obj(request, posts):
@@ -15,6 +24,12 @@ def get_page_obj(request, posts):
     paginator = Paginator(posts, settings.RECORDS_PER_PAGE)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    if isinstance(posts, QuerySet):
+        page_obj.object_list = list(page_obj.object_list)
+        prefetch_thumbnails(page_obj.object_list)
+    page_obj.elided_page_range = elided_page_range(
+        page_obj, settings.PAGINATOR_ON_EACH_SIDE, settings.PAGINATOR_ON_ENDS
+    )
     return page_obj
 
 
@@ -30,15 +45,47 @@ def index(request):
     return render(request, "posts/index.html", context)
 
 
+def hot_posts(request):
+    """
+    Горячие посты и популярные группы по рейтингу из posts.hot.
+    Страница постов выбирается из готового списка id.
+    """
+    page_obj = get_page_obj(request, hot.top(hot.POSTS))
+    posts = Post.objects.select_related('author', 'group').in_bulk(
+        page_obj.object_list
+    )
+    page_obj.object_list = [
+        posts[pk] for pk in page_obj.object_list if pk in posts
+    ]
+    prefetch_thumbnails(page_obj.object_list)
+    group_ids = hot.top(hot.GROUPS, settings.HOT_GROUPS)
+    groups = Group.objects.in_bulk(group_ids)
+    context = {
+        'page_obj': page_obj,
+        'groups': [groups[pk] for pk in group_ids if pk in groups],
+    }
+    return render(request, 'posts/hot.html', context)
+
+
 def group_posts(request, slug):
     """
     Страница сообщества. Возвращает последние 10 постов сообщества.
+    Группа берётся из памяти процесса, а список постов — из кеша
+    фрагментов по версии ленты группы; страница постов запрашивается
+    из базы, только если фрагмента в кеше нет.
     """
-    group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.select_related("author")
+    group, feed_version = cached_group(slug)
+    page_number = request.GET.get('page', '1')
     context = {
         "group": group,
-        "page_obj": get_page_obj(request, posts),
+        "page_obj": SimpleLazyObject(
+            lambda: get_page_obj(
+                request, group.posts.select_related("author")
+            )
+        ),
+        "page_number": page_number if page_number.isdigit() else '1',
+        "feed_version": feed_version,
+        "fragment_timeout": settings.GROUP_PAGE_CACHE_TIMEOUT,
     }
     return render(request, "posts/group_list.html", context)
 
@@ -85,6 +132,8 @@ def post_detail(request, post_id):
 
 
 @login_required
+@ratelimit('post_create')
+@write_gate
 def post_create(request):
     """
     Страница создания нового поста.
@@ -94,11 +143,15 @@ def post_create(request):
         post = form.save(commit=False)
         post.author = request.user
         post.save()
+        if post.image:
+            enqueue('posts.tasks.warm_thumbnails', post.pk)
         return redirect('posts:profile', request.user)
     return render(request, 'posts/create_post.html', {'form': form})
 
 
 @login_required
+@ratelimit('post_edit')
+@write_gate
 def post_edit(request, post_id):
     """
     Страница редактирования поста.
@@ -111,6 +164,8 @@ def post_edit(request, post_id):
         return redirect('posts:post_detail', post_id)
     if form.is_valid():
         form.save()
+        if 'image' in form.changed_data and forum_post.image:
+            enqueue('posts.tasks.warm_thumbnails', forum_post.pk)
         return redirect('posts:post_detail', forum_post.pk)
     context = {
         'form': form,
@@ -121,6 +176,8 @@ def post_edit(request, post_id):
 
 
 @login_required
+@ratelimit('add_comment')
+@write_gate
 def add_comment(request, post_id):
     """
     Функция для добавления комментария к посту.
@@ -143,7 +200,9 @@ def follow_index(request):
     отсоритированая по дате добавления поста.
     """
 
-    posts = Post.objects.filter(author__following__user=request.user)
+    posts = Post.objects.filter(
+        author__following__user=request.user
+    ).select_related('author', 'group')
 
     context = {'page_obj': get_page_obj(request, posts)}
     return render(request, 'posts/follow.html', context)
@@ -181,3 +240,10 @@ def profile_unfollow(request, username):
         follow_qs.delete()
 
     return redirect('posts:follow_index')
+
+
+def sitemap_file(request, path):
+    """
+    Файл карты сайта, заранее построенный командой generate_sitemaps.
+    """
+    return serve(request, path, document_root=settings.SITEMAP_ROOT)
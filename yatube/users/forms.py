@@ -1,10 +1,74 @@
+from functools import reduce
+from operator import or_
+
+from django.contrib.auth import forms as auth_forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
+from django.db.models import Count, Q, Value
+from django.db.models.functions import Upper
 
 User = get_user_model()
 
 
 class CreationForm(UserCreationForm):
+    TAKEN_MESSAGES = {
+        'username': 'Пользователь с таким именем уже существует.',
+        'email': 'Пользователь с таким email уже существует.',
+    }
+
     class Meta(UserCreationForm.Meta):
         model = User
         fields = ('first_name', 'last_name', 'username', 'email')
+
+    def clean(self):
+        """
+        Имя и email проверяются на занятость без учёта регистра одним
+        запросом по индексам UPPER(username) и UPPER(email).
+        """
+        cleaned_data = super().clean()
+        lookups = {
+            field: Q(**{f'{field}_upper': Upper(Value(cleaned_data[field]))})
+            for field in ('username', 'email')
+            if cleaned_data.get(field)
+        }
+        if not lookups:
+            return cleaned_data
+        taken = (
+            User._default_manager.annotate(
+                username_upper=Upper('username'), email_upper=Upper('email')
+            )
+            .filter(reduce(or_, lookups.values()))
+            .aggregate(
+                **{
+                    f'{field}_taken': Count('pk', filter=lookup)
+                    for field, lookup in lookups.items()
+                }
+            )
+        )
+        for field in lookups:
+            if taken[f'{field}_taken']:
+                self.add_error(field, self.TAKEN_MESSAGES[field])
+        return cleaned_data
+
+
+class PasswordResetForm(auth_forms.PasswordResetForm):
+    def get_users(self, email):
+        """
+        Активные пользователи с таким email без учёта регистра. Сравнение
+        UPPER(email) с UPPER(значения) идёт по индексу
+        auth_user_email_upper_idx, а не перебором таблицы, как iexact.
+        Найденные адреса сверяются ещё и по Unicode, как в Django
+        (CVE-2019-19844): UPPER в базе может совпасть для разных адресов.
+        """
+        email_field_name = User.get_email_field_name()
+        users = User._default_manager.annotate(
+            email_upper=Upper(email_field_name)
+        ).filter(email_upper=Upper(Value(email)), is_active=True)
+        return (
+            user
+            for user in users
+            if user.has_usable_password()
+            and auth_forms._unicode_ci_compare(
+                email, getattr(user, email_field_name)
+            )
+        )
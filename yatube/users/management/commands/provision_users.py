@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+
+from posts.export import FORMATS
+from posts.importer import read_rows
+from users.provisioning import Provisioner
+
+
+class Command(BaseCommand):
+    help = (
+        'Массовое создание пользователей из NDJSON/CSV с полями username, '
+        'email, first_name, last_name и password или password_hash.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл с пользователями, можно .gz.')
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='По умолчанию определяется по расширению файла.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько пользователей вставлять в одной транзакции.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Процессов для хеширования паролей, по умолчанию по '
+            'числу ядер; 0 — хешировать в текущем процессе.',
+        )
+        parser.add_argument(
+            '--follow',
+            action='append',
+            default=[],
+            metavar='USERNAME',
+            help='Подписать новых пользователей на этого автора; '
+            'можно указать несколько раз.',
+        )
+
+    def handle(self, *args, **options):
+        provisioner = Provisioner(
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+            follow=options['follow'],
+        )
+        created = provisioner.run(
+            read_rows(options['path'], options['format'])
+        )
+        self.stdout.write(
+            f'Создано пользователей: {created}, '
+            f'пропущено занятых имён: {provisioner.skipped}'
+        )
@@ -0,0 +1,20 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:06
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0011_update_proxy_permissions'),
+    ]
+
+    # Индекс по выражению для поиска по email без учёта регистра,
+    # см. users.forms.PasswordResetForm
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX auth_user_email_upper_idx '
+            'ON auth_user (UPPER(email));',
+            'DROP INDEX auth_user_email_upper_idx;',
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_user_email_upper_index'),
+    ]
+
+    # Проверка занятости имени без учёта регистра, см. users.forms
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX auth_user_username_upper_idx '
+            'ON auth_user (UPPER(username));',
+            'DROP INDEX auth_user_username_upper_idx;',
+        ),
+    ]
@@ -0,0 +1,155 @@
+"""
+Массовое создание пользователей (перенос учётных записей из SSO).
+
+Записи читаются из NDJSON или CSV (username, email, first_name,
+last_name и password или готовый password_hash). Пароли хешируются
+в пуле процессов, пользователи вставляются bulk_create пачками, и тем же
+проходом каждому новому пользователю создаются подписки по умолчанию.
+Имена, занятые без учёта регистра, пропускаются.
+"""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, connection, transaction
+from django.db.models.functions import Upper
+from posts.importer import batches
+from posts.models import Follow
+
+User = get_user_model()
+
+
+def db_upper(values):
+    """UPPER() базы для каждого значения, одним запросом."""
+    if not values:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT ' + ', '.join(['UPPER(%s)'] * len(values)), values
+        )
+        return list(cursor.fetchone())
+
+
+def hash_password(password):
+    """Хеш пароля или непригодный пароль, если его нет."""
+    return make_password(password or None)
+
+
+class Provisioner:
+    def __init__(self, batch_size=1000, workers=None, follow=()):
+        self.batch_size = batch_size
+        self.workers = workers
+        self.authors = list(
+            User.objects.filter(username__in=follow).values_list(
+                'pk', flat=True
+            )
+        )
+        self.seen = set()
+        self.created = 0
+        self.skipped = 0
+
+    def fresh_rows(self, rows):
+        """
+        Строки с именами, которые не встречались и не заняты в базе. Имена
+        сравниваются по UPPER базы, как в CreationForm: в SQLite он меняет
+        только ASCII, и str.upper() в Python разошёлся бы с ним.
+        """
+        names = dict(
+            zip(
+                (row['username'] for row in rows),
+                db_upper([row['username'] for row in rows]),
+            )
+        )
+        taken = set(
+            User.objects.annotate(username_upper=Upper('username'))
+            .filter(username_upper__in=set(names.values()))
+            .values_list('username_upper', flat=True)
+        )
+        fresh = []
+        batch_names = set()
+        for row in rows:
+            name = names[row['username']]
+            if name in taken or name in self.seen or name in batch_names:
+                self.skipped += 1
+                continue
+            batch_names.add(name)
+            fresh.append(row)
+        return fresh
+
+    def build_users(self, rows, executor):
+        plain = [row for row in rows if not row.get('password_hash')]
+        hashes = dict(
+            zip(
+                (row['username'] for row in plain),
+                executor.map(
+                    hash_password,
+                    (row.get('password') for row in plain),
+                    chunksize=64,
+                ),
+            )
+        )
+        return [
+            User(
+                username=row['username'],
+                email=User.objects.normalize_email(row.get('email') or ''),
+                first_name=row.get('first_name') or '',
+                last_name=row.get('last_name') or '',
+                password=row.get('password_hash') or hashes[row['username']],
+            )
+            for row in rows
+        ]
+
+    def executor(self):
+        if self.workers == 0:
+            # Без дочерних процессов: из демона (например, воркера
+            # manage.py test --parallel) их запускать нельзя.
+            return ThreadPoolExecutor(max_workers=1)
+        return ProcessPoolExecutor(
+            max_workers=self.workers, initializer=django.setup
+        )
+
+    def run(self, rows):
+        """Создаёт пользователей из ``rows``; возвращает их число."""
+        with self.executor() as executor:
+            for batch in batches(rows, self.batch_size):
+                self.insert(self.fresh_rows(batch), executor)
+        return self.created
+
+    def insert(self, rows, executor):
+        """
+        Вставляет пачку без ignore_conflicts: если имя успели занять
+        параллельно, пачка проверяется заново, так что считаются и
+        подписываются только действительно созданные пользователи.
+        """
+        while rows:
+            users = self.build_users(rows, executor)
+            try:
+                with transaction.atomic():
+                    User.objects.bulk_create(users)
+                    self.follow_authors([user.username for user in users])
+            except IntegrityError:
+                fresh = self.fresh_rows(rows)
+                if len(fresh) == len(rows):
+                    raise
+                rows = fresh
+                continue
+            self.seen.update(db_upper([user.username for user in users]))
+            self.created += len(users)
+            return
+
+    def follow_authors(self, usernames):
+        if not self.authors:
+            return
+        user_ids = User.objects.filter(username__in=usernames).values_list(
+            'pk', flat=True
+        )
+        Follow.objects.bulk_create(
+            (
+                Follow(user_id=user_id, author_id=author_id)
+                for user_id in user_ids
+                for author_id in self.authors
+                if user_id != author_id
+            ),
+            ignore_conflicts=True,
+        )
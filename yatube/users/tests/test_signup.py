@@ -0,0 +1,140 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from posts.models import Follow
+
+User = get_user_model()
+
+
+class SignUpTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(username='Reader', email='reader@example.com')
+
+    def signup(self, **data):
+        form_data = {
+            'username': 'newcomer',
+            'email': 'newcomer@example.com',
+            'password1': 'Pg7-unique-pass',
+            'password2': 'Pg7-unique-pass',
+        }
+        form_data.update(data)
+        return self.client.post(reverse('users:signup'), form_data)
+
+    def test_taken_username_ignores_case(self):
+        response = self.signup(username='rEADER')
+
+        self.assertFormError(
+            response,
+            'form',
+            'username',
+            'Пользователь с таким именем уже существует.',
+        )
+
+    def test_taken_email_ignores_case(self):
+        response = self.signup(email='READER@example.com')
+
+        self.assertFormError(
+            response,
+            'form',
+            'email',
+            'Пользователь с таким email уже существует.',
+        )
+
+    def test_uniqueness_checked_in_one_query(self):
+        """
+        Имя и email без учёта регистра проверяются одним запросом, ещё
+        один — проверка уникальности модели; затем вставка.
+        """
+        with self.assertNumQueries(3):
+            response = self.signup()
+
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(User.objects.filter(username='newcomer').exists())
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class ProvisionUsersTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(username='Existing')
+        User.objects.create_user(username='author')
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def provision(self, rows, *args):
+        path = os.path.join(self.directory, 'users.ndjson')
+        with open(path, 'w', encoding='utf-8') as stream:
+            for row in rows:
+                stream.write(json.dumps(row) + '\n')
+        stdout = io.StringIO()
+        call_command(
+            'provision_users', path, '--workers=0', *args, stdout=stdout
+        )
+        return stdout.getvalue()
+
+    def test_users_created_with_hashes_and_follows(self):
+        output = self.provision(
+            [
+                {'username': 'first', 'password': 'secret'},
+                {
+                    'username': 'second',
+                    'email': 'Second@EXAMPLE.com',
+                    'password_hash': 'pbkdf2_sha256$1$salt$hash',
+                },
+                {'username': 'nopassword'},
+            ],
+            '--follow=author',
+            '--batch-size=2',
+        )
+
+        self.assertIn('Создано пользователей: 3', output)
+        first = User.objects.get(username='first')
+        self.assertTrue(first.check_password('secret'))
+        second = User.objects.get(username='second')
+        self.assertEqual(second.password, 'pbkdf2_sha256$1$salt$hash')
+        self.assertEqual(second.email, 'Second@example.com')
+        self.assertFalse(
+            User.objects.get(username='nopassword').has_usable_password()
+        )
+        self.assertEqual(
+            set(
+                Follow.objects.filter(author__username='author').values_list(
+                    'user__username', flat=True
+                )
+            ),
+            {'first', 'second', 'nopassword'},
+        )
+
+    def test_taken_names_are_skipped(self):
+        output = self.provision(
+            [
+                {'username': 'EXISTING'},
+                {'username': 'twin'},
+                {'username': 'Twin'},
+            ]
+        )
+
+        self.assertIn('Создано пользователей: 1', output)
+        self.assertIn('пропущено занятых имён: 2', output)
+        self.assertEqual(
+            User.objects.filter(username__iexact='twin').count(), 1
+        )
+
+    def test_non_ascii_taken_name_is_skipped(self):
+        """Имена сравниваются так же, как их сравнивает база."""
+        User.objects.create_user(username='straße')
+
+        output = self.provision([{'username': 'straße'}])
+
+        self.assertIn('Создано пользователей: 0', output)
+        self.assertIn('пропущено занятых имён: 1', output)
@@ -2,6 +2,7 @@ from django.contrib.auth.views import LoginView, LogoutView, PasswordResetView
 from django.urls import path
 
 from . import views
+from .forms import PasswordResetForm
 
 app_name = "users"
 
@@ -10,7 +11,8 @@ urlpatterns = [
     path(
         "password_reset_form/",
         PasswordResetView.as_view(
-            template_name="users/password_reset_form.html"
+            template_name="users/password_reset_form.html",
+            form_class=PasswordResetForm,
         ),
         name="password_reset_form",
     ),
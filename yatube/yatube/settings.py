@@ -58,6 +58,7 @@ INSTALLED_APPS = [
     'users.apps.UsersConfig',
     'core.apps.CoreConfig',
     'about.apps.AboutConfig',
+    'api.apps.ApiConfig',
     # 3d party
     'sorl.thumbnail',
     'debug_toolbar',
@@ -65,16 +66,26 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    'core.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.OverloadMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+# Панель отладки нужна только при разработке, а её модули заметно
+# удлиняют старт воркера (см. manage.py startup_report)
+if not DEBUG:
+    INSTALLED_APPS.remove('debug_toolbar')
+    MIDDLEWARE.remove('debug_toolbar.middleware.DebugToolbarMiddleware')
+
 ROOT_URLCONF = 'yatube.urls'
 
 TEMPLATES = [
@@ -108,6 +119,39 @@ DATABASES = {
 }
 
 
+# Authentication and sessions
+
+# Пользователь запроса берётся из кеша, см. core.auth. ModelBackend
+# остаётся в списке: сессии, созданные до CachedModelBackend, хранят его
+# путь и без него бы разлогинились
+AUTHENTICATION_BACKENDS = [
+    'core.auth.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+# Страховочный срок: запись сбрасывается при сохранении пользователя
+AUTH_USER_CACHE_TIMEOUT: int = 5 * 60
+# Кешировать пользователя и в LocMemCache; безопасно, только если сайт
+# работает в одном процессе
+AUTH_USER_CACHE_LOCAL = False
+
+
+# Password hashing
+
+# Хеши паролей считаются в ограниченном пуле потоков, см. core.hashing
+PASSWORD_HASHERS = [
+    'core.hashing.PooledPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+# Изменённое число итераций применяется к паролю при следующем входе
+PASSWORD_HASH_ITERATIONS: int = 150_000
+PASSWORD_HASH_WORKERS: int = 2
+# Сколько хешей может считаться и ждать сразу; сверх этого — 503
+PASSWORD_HASH_QUEUE: int = 16
+PASSWORD_HASH_RETRY_AFTER: int = 5
+
+
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
 
@@ -156,24 +200,178 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/2.2/howto/static-files/
 
 STATIC_URL = '/static/'
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+
+# В продакшене collectstatic добавляет хеш содержимого к именам файлов и
+# сохраняет рядом сжатые копии .gz/.br, см. core.storage и core.middleware.
+if not DEBUG:
+    STATICFILES_STORAGE = (
+        'core.storage.CompressedManifestStaticFilesStorage'
+    )
+
+# Cache-Control для статики: файлы с хешем в имени не меняются никогда
+STATIC_IMMUTABLE_MAX_AGE: int = 365 * 24 * 60 * 60
+STATIC_MAX_AGE: int = 60 * 60
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 
 # LOGOUT_REDIRECT_URL = 'posts:index'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Письма копятся в очереди (core.mail) и уходят пачками из воркера
+# через EMAIL_DELIVERY_BACKEND
+EMAIL_BACKEND = 'core.mail.OutboxBackend'
+EMAIL_DELIVERY_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+# Через сколько секунд после первого письма запускать доставку
+OUTBOX_FLUSH_DELAY: int = 5
+OUTBOX_BATCH_SIZE: int = 100
+# Через сколько секунд пачка упавшего воркера снова уходит в отправку;
+# не больше TASK_VISIBILITY_TIMEOUT, чтобы её подобрала повторная задача
+OUTBOX_CLAIM_TIMEOUT: int = 300
 
 # Paginator
 
 RECORDS_PER_PAGE: int = 10
+# Максимальный размер страницы JSON API (?limit=)
+API_MAX_LIMIT: int = 100
+# Максимум постов и комментариев в одном запросе пакетного API
+API_BATCH_MAX_ITEMS: int = 500
+# Сколько номеров страниц показывать вокруг текущей и по краям навигации
+PAGINATOR_ON_EACH_SIDE: int = 2
+PAGINATOR_ON_ENDS: int = 1
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Post images
+
+POST_IMAGE_MAX_BYTES: int = 10 * 1024 * 1024
+POST_IMAGE_MAX_PIXELS: int = 25_000_000
+# Картинки больше этого размера по большей стороне уменьшаются при загрузке
+POST_IMAGE_MAX_SIDE: int = 1920
+
+# RSS/Atom
+
+FEED_ITEMS: int = 20
+# Ленты инвалидируются по версии (posts.cache), срок хранения — страховка
+FEED_CACHE_TIMEOUT: int = 24 * 60 * 60
+
+# Group pages (posts.cache.cached_group)
+
+# Сколько секунд группа живёт в памяти процесса, даже если версия
+# в кеше не менялась
+GROUP_CACHE_TIMEOUT: int = 5 * 60
+# Срок хранения отрисованного списка постов группы; список
+# инвалидируется по версии ленты группы
+GROUP_PAGE_CACHE_TIMEOUT: int = 24 * 60 * 60
+
+# Hot posts and trending groups (posts.hot)
+
+# Вклад комментария или поста в рейтинг убывает вдвое за это число секунд
+HOT_HALF_LIFE: int = 6 * 60 * 60
+HOT_COMMENT_WEIGHT: float = 1.0
+HOT_POST_WEIGHT: float = 2.0
+# Сколько постов и групп держать в рейтинге
+HOT_SIZE: int = 500
+# Сколько популярных групп показывать рядом с горячими постами
+HOT_GROUPS: int = 10
+# Сколько секунд показывать готовый список рейтинга из кеша
+HOT_TOP_CACHE_TIMEOUT: int = 30
+
+# Sitemap
+
+# Абсолютные адреса в карте сайта строятся от SITE_URL
+SITE_URL = 'https://egrivtsov.pythonanywhere.com'
+# Файлы карты сайта, их обновляет manage.py generate_sitemaps
+SITEMAP_ROOT = os.path.join(BASE_DIR, 'sitemaps')
+# Не больше 50 000 адресов в файле по протоколу sitemaps.org
+SITEMAP_LIMIT: int = 50_000
+
+# Rate limiting
+
+RATELIMIT_ENABLED = True
+# Лимиты POST-запросов на пользователя и на IP: 'N/s|m|h|d' — не больше
+# N запросов за секунду, минуту, час или сутки. Счётчики хранятся в CACHES
+# и общие для процессов только при общем кеше, см. core.ratelimit
+RATELIMITS = {
+    'post_create': {'user': '10/m', 'ip': '30/m'},
+    'post_edit': {'user': '30/m', 'ip': '60/m'},
+    'add_comment': {'user': '20/m', 'ip': '60/m'},
+    # Элементы пакетного API; лимит не меньше API_BATCH_MAX_ITEMS,
+    # иначе полный пакет не пройдёт никогда
+    'api_batch': {'user': '2000/h', 'ip': '5000/h'},
+}
+# Одновременных запросов на запись в процессе; остальные ждут свободного
+# места не дольше WRITE_QUEUE_TIMEOUT секунд и получают 503
+WRITE_CONCURRENCY: int = 4
+WRITE_QUEUE_TIMEOUT: float = 5.0
+
+# Compression
+
+# Ответы меньше этого размера в байтах не сжимаются
+COMPRESSION_MIN_SIZE: int = 512
+# Потоковый ответ сбрасывается клиенту после стольких байт исходных данных
+COMPRESSION_FLUSH_SIZE: int = 16 * 1024
+
+# Export
+
+EXPORT_CHUNK_SIZE: int = 2000
+
+# Request profiling (core.profiling)
+
+PROFILING_ENABLED = True
+# Кроме запросов сотрудников с заголовком X-Profile, профилируется доля
+# PROFILING_SAMPLE_RATE запросов к адресам, подходящим под PROFILING_PATHS
+PROFILING_PATHS = [r'^/posts/\d+/$', r'^/follow/$']
+PROFILING_SAMPLE_RATE: float = 0.0
+PROFILING_DEFAULT_MODE = 'cprofile'
+# Сколько последних профилей хранить
+PROFILING_BUFFER_SIZE: int = 100
+# Шаг сэмплирования стека для flamegraph, секунды
+PROFILING_SAMPLE_INTERVAL: float = 0.005
+
+# Startup budget (core.startup, manage.py startup_report)
+
+# Предельное время холодного старта цели, секунды; проверяется в CI
+# командой manage.py startup_report --check, а не тестами
+STARTUP_TIME_BUDGET = {'wsgi': 2.0, 'manage': 3.0}
+# Модули, которые не должны импортироваться при старте воркера:
+# они нужны только при обработке картинок
+STARTUP_DEFERRED_MODULES = ['PIL.Image', 'sorl.thumbnail.engines.pil_engine']
+
+# Task queue
+
+TASK_MAX_ATTEMPTS: int = 5
+# Задержка перед повтором: TASK_RETRY_BACKOFF ** номер попытки секунд
+TASK_RETRY_BACKOFF: int = 2
+TASK_POLL_INTERVAL: float = 1.0
+# Через сколько секунд задача в статусе running считается брошенной
+# и снова попадает в очередь; должно быть больше времени самой долгой задачи
+TASK_VISIBILITY_TIMEOUT: int = 600
+
+# LocMemCache у каждого процесса свой. В продакшене с несколькими
+# воркерами нужен общий кеш (memcached и т. п.): на нём держатся лимиты
+# запросов (core.ratelimit), версии лент и кеш пользователя (core.auth)
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
+CACHE_IS_SHARED = (
+    CACHES['default']['BACKEND']
+    != 'django.core.cache.backends.locmem.LocMemCache'
+)
+
+# Сессии читаются из кеша, база — только при промахе и записи сессии.
+# Только с общим кешем: с LocMemCache выход или flush() в одном процессе
+# не сбросил бы копию сессии в остальных. Страница без запросов к базе
+# для вошедшего пользователя (сессия и пользователь из кеша) поэтому
+# бывает только с общим кешем.
+# 'django.contrib.sessions.backends.signed_cookies' обходится и без кеша,
+# но хранит данные сессии в cookie у клиента.
+SESSION_ENGINE = (
+    'django.contrib.sessions.backends.cached_db'
+    if CACHE_IS_SHARED
+    else 'django.contrib.sessions.backends.db'
+)
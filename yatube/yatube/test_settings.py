@@ -0,0 +1,35 @@
+"""
+Настройки для тестов: ``manage.py test`` и pytest берут их по умолчанию.
+
+База тестов SQLite в памяти, пароли хешируются MD5 (тестам, которые
+проверяют сам PBKDF2, хешер задаётся явно), загрузки пишутся во временный
+каталог в tmpfs и удаляются при выходе. Здесь же настройки бюджета
+запросов (core.testing).
+"""
+import atexit
+import shutil
+import tempfile
+
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES
+
+DATABASES['default']['TEST'] = {'NAME': ':memory:'}
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Тесты идут в одном процессе: пользователь и сессии кешируются и
+# в LocMemCache
+AUTH_USER_CACHE_LOCAL = True
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+MEDIA_ROOT = tempfile.mkdtemp(
+    prefix='yatube-media-',
+    dir='/dev/shm' if os.path.isdir('/dev/shm') else None,  # noqa: F405
+)
+atexit.register(shutil.rmtree, MEDIA_ROOT, ignore_errors=True)
+
+# Бюджет SQL-запросов и времени ответа страниц, см. core.testing
+QUERY_BUDGET_FILE = os.path.join(BASE_DIR, 'query_budget.json')  # noqa: F405
+QUERY_BUDGET_UPDATE = bool(os.environ.get('QUERY_BUDGET_UPDATE'))  # noqa: F405
+# Бюджет времени ответа для новых записей, мс
+QUERY_BUDGET_MS: int = 1000